@@ -2,7 +2,7 @@
 ### appController.py 
 # implements controller component of MVC architecture of Franka Emika Games
 # implement the games algorithms of Tic-Tac-Toe, Tower of hanoi and checkers game
-# use a queue of camera frames from model to perform the detection the gameboards and the games pieces 
+# use a mailbox of camera frames from model to perform the detection the gameboards and the games pieces 
 # generates an array from frames and sends it to games algorithms.
 # result frames will be send to Model 
 import os
@@ -14,11 +14,13 @@ import numpy as np
 import cv2
 from config import *
 import random
-from copy import deepcopy 
 from pygame import mixer
-from keras.models import load_model # to load a trained model for keras
 import torch # to load trained yolov5 model
 import checkers # minimax and alpha-beta-pruning for checkers game 
+import checkersService # thread to compute the moves of the computer without blocking the camera frames
+import ticTacToeBoard # bit masks of the tic-tac-toe gameboard
+import ticTacToeTable # minimax values of all the tic-tac-toe gameboards
+import ticTacToeModel # runtimes of the trained model for tic-tac-toe pieces without tensorflow
 import _thread
 
 # create logger
@@ -57,6 +59,7 @@ class AppController(threading.Thread):
         logger.debug("AppController: appController init...")
         self.myResultFrameQueue_Model_Controller = myResultFrameQueue_Model_Controller
         self.myResultFrameQueue_Controller_Model = myResultFrameQueue_Controller_Model
+        self.frameSeq = 0 # sequence number of the last frame from appModel
         self.storage = None
         self.event = event
         self.observerModel= observerModel     # AppController acts as Observable, observer is appModel
@@ -69,7 +72,7 @@ class AppController(threading.Thread):
         self.voiceCmdSpeaker = "espeak -v english-us -a 190 -p 70 -s 120 -m '{}' --stdout | aplay & "
         self.device = 'cuda' if torch.cuda.is_available() else 'cpu'
         logger.debug("Using Device for detection of pieces: {}".format(self.device))
-        self.appName = None  # to notify the appModel, to send the camera frame only one Queue for the current started game
+        self.appName = None  # to notify the appModel, to send the camera frame only one Mailbox for the current started game
 
         ##### tower of hanoi
         self.dataTOH=[] # informations of the user inputs for the tower of hanoi from appView
@@ -81,6 +84,8 @@ class AppController(threading.Thread):
         self.stopFPSCheckers = False 
         self.scoreCheckers = [0,0] # user and panda robot scores
         self.levelCheckers = 1 # level of game to difficult
+        self.engineCheckers = CHECKERS_ENGINE # engine of the computer: 0 alpha beta search, 1 monte carlo tree search
+        self.difficultyCheckers = CHECKERS_DIFFICULTY # difficulty of the computer: 0 easy, 1 medium, 2 hard
         self.stopgameCheckers = False # to stop the checkers game
         self.modelCheckers = self.load_modelCheckers(MODEL_CHECKERS) # load trained yolov5 model for detection with bounding-box of checkers pieces
         self.classesCheckers = self.modelCheckers.names # load labels of checkers pieces (white or black)
@@ -91,6 +96,12 @@ class AppController(threading.Thread):
         self.getCenterofFieldsCheckers = None
         self.circleData = None # coordinates of the center of circular piece outside the playing field.
         self.matrix = None # array of the checkers game
+        self.checkers = None # minimax and alpha-beta-pruning algorithm of the current checkers game
+        self.checkersService = checkersService.CheckersService() # computes the moves of the computer in its own thread
+        self.checkersService.start()
+        self.checkersMove = None # future of the move of the computer that is computed, None if the player is to move
+        self.checkersExpected = None # index of the player pieces after the move of the player, to detect a change of the gameboard during the computation
+        self.checkersTampered = 0 # number of frames in which the gameboard has been changed during the computation
 
         ##### Tic-Tac-Toe game
         self.stopFPSTicTT = False
@@ -106,10 +117,13 @@ class AppController(threading.Thread):
         self.stopgameticTT = False # to stop the checkers game 
         self.center_coordPixel = None # to save the pixel coordinate of center of a tic-tac-toe field
         self.cornersdataTicTT = None # calibration matrix to zoom on tic-tac-toe gameboard
-        self.modelTicTT = load_model(MODEL_TIC_TAC_TOE) # load trained keras model for classification of tic-tac-toe pieces
+        self.modelTicTT = ticTacToeModel.load_model(MODEL_TIC_TAC_TOE_RUNTIME) # load trained model for classification of tic-tac-toe pieces with the runtime of the config
         self.autoStartTicTT = False # set to true if the current tic-tac-toe game is finish (win/lost/tie game) to start a new game automatically
         self.counterIndexTicTT = [] # to copy the current arrays of the tic-tac-toe game field and verify if the the new array differt from this copy. If this case then there is a new piece from the computer in the game board.
         self.stopNotifyObserverModel_TicTT_HomeView = False # set true to stop notifying the model 
+        self.cellCacheTicTT = [None] * 9 # (resized image, shape) of the last classification of every tic-tac-toe field
+        self.gridTicTT = None # smoothed center field (x, y, width, height) of the tic-tac-toe gameboard, cached between the frames
+        self.linesTicTT = ticTacToeBoard.line_masks(3, 3) # masks of the rows, columns and diagonals of the tic-tac-toe gameboard
         
     def doAudio(self, textOutput = None, waitBevor=False):
         """
@@ -309,6 +323,9 @@ class AppController(threading.Thread):
         a saved state of the game. But if the matrix is not empty, 
         then it means that the user wants to continue a saved state of the game.
         """
+        self.cancelCheckersMove() # the move of the computer of the previous game is not needed anymore
+        if self.checkers is not None: # stop the pondering of the previous game
+            self.checkers.stop_pondering()
         if self.matrix is None:
             logger.debug("AppController checkers game: a new checkers Game is starting ...")
             self.matrix = np.array(self.mat) # convert arrays of game field in numpy arrays
@@ -316,6 +333,8 @@ class AppController(threading.Thread):
         else:
             logger.debug("AppController checkers game: a checkers part is continuing ...")
             self.checkers = checkers.Checkers(self,self.matrix)
+        self.checkers.select_engine(self.engineCheckers) # engine selected in the view
+        self.checkers.set_difficulty(self.difficultyCheckers) # difficulty selected in the view
         self.gameName = "Checkers" # set the name of the game to checkers to send Frame only to Checkers view
         self.scoreCheckers = [0,0] # initialize score of payer with index 0 and Franka robot with index 1
         _thread.start_new_thread(self.doAudio, ("Welcome to Checkers Game",)) # play welcome message with audio during the starting of checkers game
@@ -371,6 +390,20 @@ class AppController(threading.Thread):
         self.stopgameCheckers= True
         self.gameName = None# set the current opened windows to None
         self.matrix = None
+        self.cancelCheckersMove()
+        if self.checkers is not None: # the computer must not search in the background after the game
+            self.checkers.stop_pondering()
+    
+    def cancelCheckersMove(self):
+        """
+        cancel the move of the computer that is computed by the checkers service
+
+        :return: None
+        """
+        if self.checkersMove is not None:
+            logger.debug("AppController checkers game: the move of the computer is cancelled")
+            self.checkersService.cancel()
+            self.checkersMove = None
     
     def notifyObserverViewCheckers(self, newScore= None, message = None):
         """
@@ -381,13 +414,17 @@ class AppController(threading.Thread):
         logger.debug("AppController checkers game: notify view with current scores and notifications of the game process")
         self.observerView.updateCheckersView(newScoreCheckers=newScore, message = message)
     
-    def updateCheckers(self, stopFPSCheckers= False, levelCheckers = 1, cornersdataCheckers = None, appName = None, getCenterofFieldsCheckers = None, use_getCenterofFields = 1):
+    def updateCheckers(self, stopFPSCheckers= False, levelCheckers = 1, engineCheckers = CHECKERS_ENGINE, difficultyCheckers = CHECKERS_DIFFICULTY, cornersdataCheckers = None, appName = None, getCenterofFieldsCheckers = None, use_getCenterofFields = 1):
         """
         will be used from view to notify the controller about the update informations from the checkers view
 
         :return: None
         """
         self.levelCheckers = levelCheckers
+        self.engineCheckers = engineCheckers # engine of the computer: 0 alpha beta search, 1 monte carlo tree search
+        self.difficultyCheckers = difficultyCheckers # difficulty of the computer: 0 easy, 1 medium, 2 hard
+        if self.checkers is not None: # not during a search of the checkers service
+            self.checkersService.configure(self.checkers, self.engineCheckers, self.difficultyCheckers)
         self.cornersdataCheckers = cornersdataCheckers
         self.appName = appName
         self.getCenterofFieldsCheckers = getCenterofFieldsCheckers
@@ -554,6 +591,10 @@ class AppController(threading.Thread):
 
         self.indexs2 = np.flatnonzero(np.char.startswith(self.curr_state, 'b'))# get index of the value, that beginnt with b (player piece) from the detected gameboard by the camera
         
+        if self.checkersMove is not None: # the computer is thinking, the frames are only used to watch the gameboard
+            self.checkCheckersMove()
+            return
+
 
         compare = np.array_equal(self.indexs1, self.indexs2) # compare these 2 arrays (if True then equal, if False then not equal)
 
@@ -587,27 +628,13 @@ class AppController(threading.Thread):
                     if (self.dictionaryCheckersPiecesFrom[maxCountedPiecesFrom] == 2) and (self.dictionaryCheckersPiecesTo[maxCountedPiecesTo] == 2):
                         self.notifyObserverViewCheckers(message="a Move was found !") # notify the view about the move of player
                         
-                        # verify if the user activate or disable the mandatory jumps in view 
-                        if self.levelCheckers == 1: # if mandatory jumps activate 
-                            fromMove1, fromMove2, toMove1, toMove2, viaPiece, matrix  = self.checkers.play(maxCountedPiecesFrom, maxCountedPiecesTo, mandatory_jumping=True) # send the start position and cible position of moved player piece to minimax and alpha beta pruning algorithm
-                        elif self.levelCheckers == 0:# if mandatory jumps disable  
-                            fromMove1, fromMove2, toMove1, toMove2, viaPiece, matrix  = self.checkers.play(maxCountedPiecesFrom, maxCountedPiecesTo, mandatory_jumping=False)
-
-
-                        self.matrix = matrix # copy the returned matrix from algorithm to the current matrix of the class
-                        self.matrix = np.array(self.matrix) # convert the matrix list to numpy array
-                    
-                        self.xy_coord_From = self.dictCheckers['{i}{j}'.format(i=fromMove1, j=fromMove2)] # save the pixel start position of the piece that has been moved by the computer into the variable self.xy_coord_From for appModel
-                        self.xy_coord_To = self.dictCheckers['{i}{j}'.format(i=toMove1, j=toMove2)] # save the pixel cible position of the piece that has been moved by the computer into the variable self.xy_coord_To for appModel
-
-                        if len(viaPiece) != []: # if a player piece has been jumped by the computer
-                            for i in viaPiece:
-                                self.viaPiece.append(self.dictCheckers['{j}'.format(j=i)]) # save the pixel coordinate of the position of the jumped piece into the array self.viaPiece for appModel
-
-                        self.notifyObserverModel_Checkers_Robot() # notify the appModel with the new pixel coordonates informations of positions  
+                        # send the start position and cible position of moved player piece to minimax and alpha beta pruning algorithm in the thread of the checkers service,
+                        # verify if the user activate (level 1) or disable (level 0) the mandatory jumps in view. The result is taken by checkCheckersMove() in the next frames.
+                        self.checkersMove = self.checkersService.submit(self.checkers, maxCountedPiecesFrom, maxCountedPiecesTo, self.levelCheckers == 1)
+                        self.checkersExpected = self.indexs2 # the player pieces must stay on these fields during the computation
+                        self.checkersTampered = 0
                         
                         # initialize to 0 all the previous variable
-                        self.viaPiece = [] 
                         self.dictionaryCheckersPiecesFrom[maxCountedPiecesFrom] = 0
                         self.dictionaryCheckersPiecesTo[maxCountedPiecesTo] = 0
                         self.dictionaryCheckersPiecesFrom = {}
@@ -636,6 +663,46 @@ class AppController(threading.Thread):
 
 
 
+    def checkCheckersMove(self):
+        """
+        called for every frame while the move of the computer is computed: take the result of the checkers service
+        if it is done and notify the view if the player pieces are moved during the computation
+
+        :return: None
+        """
+        if not self.checkersMove.done():
+            if np.array_equal(self.indexs2, self.checkersExpected):
+                self.checkersTampered = 0
+            else:
+                self.checkersTampered += 1
+                if self.checkersTampered == 2: # the same change in two frames (like the detection of a move)
+                    logger.debug("AppController checkers game: the gameboard has been changed during the computation of the computer")
+                    self.notifyObserverViewCheckers(message="Please don't move the pieces, the computer is thinking ...")
+            return
+
+        future = self.checkersMove
+        self.checkersMove = None
+        if future.cancelled():
+            return
+        try:
+            fromMove1, fromMove2, toMove1, toMove2, viaPiece, matrix = future.result()
+        except Exception:
+            logger.exception("AppController checkers game: no move of the computer")
+            return
+
+        self.matrix = matrix # copy the returned matrix from algorithm to the current matrix of the class
+        self.matrix = np.array(self.matrix) # convert the matrix list to numpy array
+    
+        self.xy_coord_From = self.dictCheckers['{i}{j}'.format(i=fromMove1, j=fromMove2)] # save the pixel start position of the piece that has been moved by the computer into the variable self.xy_coord_From for appModel
+        self.xy_coord_To = self.dictCheckers['{i}{j}'.format(i=toMove1, j=toMove2)] # save the pixel cible position of the piece that has been moved by the computer into the variable self.xy_coord_To for appModel
+
+        if len(viaPiece) != []: # if a player piece has been jumped by the computer
+            for i in viaPiece:
+                self.viaPiece.append(self.dictCheckers['{j}'.format(j=i)]) # save the pixel coordinate of the position of the jumped piece into the array self.viaPiece for appModel
+
+        self.notifyObserverModel_Checkers_Robot() # notify the appModel with the new pixel coordonates informations of positions  
+        self.viaPiece = [] 
+
     def getCentersFields(self, frame):
         """
         function to get the centers of fields of the checker gameboard, when the player has cliked on the button  "Get Centers now" in the view
@@ -729,7 +796,6 @@ class AppController(threading.Thread):
         # detect pieces on the gameboard so that the user can view 
         results = self.score_frame(frame)
         frame = self.plot_boxes(results, frame)
-        time.sleep(0.3)
         return frame 
 
     
@@ -755,7 +821,6 @@ class AppController(threading.Thread):
                 cv2.circle(frame, (int(self.dictCheckers[i][0]), int(self.dictCheckers[i][1])), 3, (0,0,255), -1)
             results = self.score_frame(frame)
             frame = self.plot_boxes(results, frame)
-        time.sleep(0.3)
         return frame
     ############################################ checkers game end ############################################
 
@@ -777,6 +842,7 @@ class AppController(threading.Thread):
         self.initGameTicTT() # initialize values to start a new tic-tac-toe game
         self.stopgameticTT = False # stop the tic tac toe game 
         self.circleData = None 
+        self.gridTicTT = None # detect the gameboard again
     
     def notifyObserverModel_TicTT_HomeView(self):
         """
@@ -830,6 +896,7 @@ class AppController(threading.Thread):
         # create the game board of tic-tac-toe
         self.board = [' ' for x in range(9)]
         self.counterIndexTicTT = []
+        self.cellCacheTicTT = [None] * 9 # classify all the fields again
         self.stopNotifyObserverModel_TicTT_HomeView = False
         self.notifyObserverModel_TicTT_HomeView()
 
@@ -892,6 +959,65 @@ class AppController(threading.Thread):
         except:
             logger.error("empty image by find_shape !")
 
+    def find_shapes(self, cells):
+        """
+        verify if shapes are X or O on the cropped images of all the fields with one call of the model:
+        the cropped images are resized and stacked into one batch (n, 32, 32, 1). The model is called
+        directly, without the overhead of predict() for every field.
+        The gameboard changes at most once per move: a field is only classified again if the mean absolute
+        difference between its resized image and the image of its last classification is greater than
+        TICTT_CELL_CHANGE_THRESHOLD, otherwise the cached shape of the field is used.
+        :param: cells: cropped images
+        
+        :return: shapes: mapper value of every cropped image (None if no shape or empty image)
+        """
+        mapper = {0: None, 1: 'X', 2: 'O'}
+        shapes = [None] * len(cells)
+        batch = [] # resized images of the changed fields
+        fields = [] # index of the cropped image of every resized image
+        for i, cell in enumerate(cells):
+            if cell is None or cell.size == 0: # field outside of the frame
+                self.cellCacheTicTT[i] = None
+                continue
+            try:
+                resized = cv2.resize(cell, (32, 32))
+            except:
+                logger.error("empty image by preprocessing !")
+                continue
+            cached = self.cellCacheTicTT[i]
+            if cached is not None and np.mean(cv2.absdiff(resized, cached[0])) <= TICTT_CELL_CHANGE_THRESHOLD:
+                shapes[i] = cached[1] # field has not changed since its last classification
+                continue
+            batch.append(resized)
+            fields.append(i)
+        if len(batch) == 0:
+            return shapes
+        images = batch
+        batch = np.stack(batch)[..., np.newaxis].astype(np.float32) / 255 # channel_last and batch size
+        try:
+            predictions = self.modelTicTT(batch, training=False)
+        except:
+            logger.error("empty image by find_shapes !")
+            return shapes
+        for i, image, idx in zip(fields, images, np.argmax(predictions, axis=1)):
+            shapes[i] = mapper[idx]
+            self.cellCacheTicTT[i] = (image, shapes[i]) # image and shape of the last classification of the field
+        return shapes
+
+    def playerShape(self, shape):
+        """
+        get the value of the player of a predicted shape
+        :param: shape: mapper value of find_shape()
+        
+        :return: False: if no value
+                 self.player: if value is `X`
+        """
+        if shape == 'X':
+            self.player = "X"
+            self.computer = "O"
+            return self.player
+        return False # the player plays with X
+
     def getShape(self, cropped):
         """
         get the predicted value on a cropped image and return it
@@ -902,17 +1028,10 @@ class AppController(threading.Thread):
         """
         if cropped is not None: 
             try:
-                shape = self.find_shape(cropped)
-                if shape == None:
-                    return False
-                elif shape == 'X':
-                    self.player = "X"
-                    self.computer = "O"
-                    return self.player
+                return self.playerShape(self.find_shape(cropped))
             except:
                 logger.error("empty image by getShape !")
-        else:
-            return False
+        return False
 
     def getPlayer(self, points, frame):
         """
@@ -931,9 +1050,9 @@ class AppController(threading.Thread):
         gameboardIndex = 0 # to get index of the cropped image
         gameboard = np.array(self.board) # convert array into numpy array
         indexs = np.where(gameboard == ' ')[0] # get index of empy wert in array
-        for field in points: 
-            cropped = self.getGameField(field, frame) # croppes the frame with pixel coordinates in array points
-            value = self.getShape(cropped) # get the detected symbol on the cropped image
+        shapes = self.find_shapes([self.getGameField(field, frame) for field in points]) # croppes the frame with pixel coordinates in array points and detect the symbols of all fields at once
+        for shape in shapes: 
+            value = self.playerShape(shape) # get the detected symbol on the cropped image
             old_played = np.where(indexs== gameboardIndex)[0] # get the index of the arrays where the 'gameboardIndex' is present.
             if value != False and self.initGame == False and len(old_played) == 1:
                 self.notifyObserverViewTicTT(message="A Move was found. Please wait 3 Seconds")
@@ -966,17 +1085,57 @@ class AppController(threading.Thread):
         sorted_cntr = sorted(contours, key=lambda cntr: cv2.contourArea(cntr))
         return cv2.boundingRect(sorted_cntr[-2])
 
+    def gridIsConsistent(self, thresh, middle_center):
+        """
+        cheap check of the cached grid: the 2 vertical and 2 horizontal lines of the tic-tac-toe gameboard are the
+        borders of the center field. The lines are searched in the thresholded frame (white pixels) along the
+        cached borders within TICTT_GRID_LINE_TOLERANCE pixels.
+        :param: thresh: threshed image
+        :param: middle_center: cached center field (x, y, width, height)
+
+        :return: True if at least TICTT_GRID_LINE_RATIO of the cached lines are found in the frame
+        """
+        center_x, center_y, width, height = (int(round(v)) for v in middle_center)
+        t = TICTT_GRID_LINE_TOLERANCE
+        rows, cols = thresh.shape[:2]
+        top, bottom = max(center_y - height, 0), min(center_y + 2 * height, rows) # the lines go across the gameboard
+        left, right = max(center_x - width, 0), min(center_x + 2 * width, cols)
+        found = 0 # pixels of the lines with a white pixel near them
+        total = 0 # pixels of the lines
+        for x in (center_x, center_x + width): # vertical lines
+            band = thresh[top:bottom, max(x - t, 0):x + t + 1]
+            if band.size:
+                found += np.count_nonzero(band.max(axis=1))
+            total += bottom - top
+        for y in (center_y, center_y + height): # horizontal lines
+            band = thresh[max(y - t, 0):y + t + 1, left:right]
+            if band.size:
+                found += np.count_nonzero(band.max(axis=0))
+            total += right - left
+        return total > 0 and found >= TICTT_GRID_LINE_RATIO * total
+
     def get_board_template(self, thresh):
         """
-        returns 3 x 3 grid
+        returns 3 x 3 grid. The gameboard does not move between the frames, so the center field is cached:
+        the contours are only searched again if the cached grid lines are not found in the frame (gridIsConsistent()).
+        A new detection near the cached center field is smoothed over the frames (TICTT_GRID_SMOOTHING),
+        a detection farther than TICTT_GRID_MAX_SHIFT pixels replaces it (the gameboard has moved).
         :param: thresh: threshed image
 
         :return: Grid coordinates
         """
-        # Find grid's center cell
-        middle_center = self.contoured_bbox(thresh)
-        
-        center_x, center_y, width, height = middle_center
+        if self.gridTicTT is None or not self.gridIsConsistent(thresh, self.gridTicTT):
+            # Find grid's center cell
+            detected = self.contoured_bbox(thresh)
+            if detected is not False:
+                detected = np.array(detected, dtype=np.float64)
+                if self.gridTicTT is not None and np.max(np.abs(detected - self.gridTicTT)) <= TICTT_GRID_MAX_SHIFT:
+                    self.gridTicTT = self.gridTicTT + TICTT_GRID_SMOOTHING * (detected - self.gridTicTT)
+                else:
+                    self.gridTicTT = detected
+
+        center_x, center_y, width, height = (int(round(v)) for v in self.gridTicTT)
+        middle_center = (center_x, center_y, width, height)
 
         # Useful coordinates
         left = center_x - width
@@ -1241,13 +1400,14 @@ class AppController(threading.Thread):
         
     def isWinner(self, board, letter):
         """
-        Checks whether the players or the computer have won if the same character occurs in the column, row or diagonal.  
+        Checks whether the players or the computer have won if the same character occurs in the column, row or diagonal.
+        The fields of the character are converted into a bit mask and compared with the masks of all the lines (ticTacToeBoard.py).
         :param: board: Tic-Tac-Toe playing field
         :param: board: Characters
 
         :return: None
         """
-        return (board[0] == letter and  board[4] == letter and board[8] == letter) or (board[2] == letter and  board[4] == letter and board[6] == letter) or (board[6] == letter and  board[7] == letter and board[8] == letter) or (board[0] == letter and  board[1] == letter and board[2] == letter) or (board[3] == letter and  board[4] == letter and board[5] == letter) or (board[0] == letter and  board[3] == letter and board[6] == letter) or (board[1] == letter and  board[4] == letter and board[7] == letter) or (board[2] == letter and  board[5] == letter and board[8] == letter)
+        return ticTacToeBoard.is_winner(ticTacToeBoard.mask_of(board, letter), self.linesTicTT)
 
     def isBoardFull(self, board):
         """
@@ -1281,57 +1441,18 @@ class AppController(threading.Thread):
 
     def computerMove(self):
         """
-        generates a move from the computer. The following conditions apply:
-        - Checks whether the player has performed an action that can lead to the
-            can cause the computer to lose the game. If so, swipe there to
-            lock the player. If not, continue with step 2.
-
-        - Check whether one of the corner squares of the playing field with the index 0, 2,
-            6 or 8 is empty. If so, go there. If there is no empty bedrock
-            exists, continue with step 3.
-
-        - Check whether the difficulty level of the game is professional (1) and the center is empty (playing field with index 4). If so,
-            go there. If not, continue with step 4.
-        
-        -  Drag it to one of the side fields with index 1, 3, 5 or 7. Once
-            Step 4 is completed, there is no further action, as the remaining
-            fields are only page fields.
+        generates a move from the computer with the table of the minimax values of all the tic-tac-toe
+        gameboards (ticTacToeTable.py): the computer plays one of the optimal moves at random.
+        At the level beginner (0), the computer plays with the probability TICTT_BLUNDER_PROBABILITY[0]
+        a random move that is not optimal.
         
         :param: None
         
-        :return: move: move of computer (index of the gameboard array, wo the computer has played)
-        """
-        possibleMoves = [x for x, letter in enumerate(self.board) if letter == ' '] 
-        move = 9
-
-        for letter in ['O', 'X']:
-            for i in possibleMoves:
-                boardCopy = deepcopy(self.board)
-                boardCopy[i] = letter 
-                if self.isWinner (boardCopy, letter):
-                    move = i
-                    return move
-        
-        cornersOpen = []
-        for i in possibleMoves:
-            if i in [0, 2, 6, 8]:
-                cornersOpen.append(i)
-        if len(cornersOpen) > 0:
-            move = self.selectRandomPosition(cornersOpen)
-            return move
-        
-        if self.levelTicTT == 1:
-            if 4 in possibleMoves:
-                move = 4
-                return move
-
-        edgesOpen = []
-        for i in possibleMoves:
-            if i in [1, 3, 5, 7]:
-                edgesOpen.append(i)
-        if len(edgesOpen) > 0:
-            move = self.selectRandomPosition(edgesOpen)
-            return move
+        :return: move: move of computer (index of the gameboard array, wo the computer has played), 9 if the gameboard is full
+        """
+        move = ticTacToeTable.choose_move(self.board, TICTT_BLUNDER_PROBABILITY.get(self.levelTicTT, 0.0))
+        if move is None:
+            move = 9
         return move
 
     def selectRandomPosition(self, li):
@@ -1373,9 +1494,9 @@ class AppController(threading.Thread):
         """
         while not self.event.is_set():
             #logger.info("Thread no stopped !")
-            self.frame  = None # define a help variable to save the frame
-            if not self.myResultFrameQueue_Model_Controller.empty(): # verify if the queue from appModel to appController is not empty 
-                self.frame = self.myResultFrameQueue_Model_Controller.get() # get the frames from the queue 
+            # wait for the next frame from appModel (the timeout is only to check the event), every frame is processed only once
+            self.frameSeq, self.frame, frameTime = self.myResultFrameQueue_Model_Controller.wait(self.frameSeq, timeout=0.1)
+            if self.frame is not None:
                 if (self.gameName == "TicTT" and self.stopgameticTT == False): # if the user has started the game tic tac toe  
                     try:
                         self.frame = self.runticTT(self.frame)   # the game can be started. The function runticTT use the frame for tic tac toe view from the appModel 
@@ -1404,9 +1525,8 @@ class AppController(threading.Thread):
                     np.savetxt(CENTERSCHECKERSFIELDS, self.arr_centroids, fmt='%i')
                     self.notifyObserverViewCheckers(message="the centers of fields has been saved ...")
                 
-            if not self.myResultFrameQueue_Controller_Model.full(): # send the result frame into a queue to the appModel
-                self.myResultFrameQueue_Controller_Model.put(self.frame)
+                self.myResultFrameQueue_Controller_Model.put(self.frame, frameTime) # send the result frame into the mailbox to the appModel
             
-            time.sleep(0.1)      
+        self.checkersService.stop()
         logger.debug("AppController: thread stopped, exit ...")
         exit()
\ No newline at end of file
@@ -1,7 +1,6 @@
 #
 #### app for Franka Emika Games
 #
-import queue
 import warnings
 import appController
 import appModel
@@ -10,7 +9,7 @@ import threading
 import os                   # for checking matrix file
 import sys                  # used for exit()
 import signal               # to catch Ctrl-C Interrupt
-import queue                # 4 queues (between Controller and Model for Homeview and Tower of Hanoi, between Model and Controller, between Controller and Model and between Model and View for Tic-Tac-Toe and Checkers)
+import frameMailbox         # 4 mailboxes of the latest frame (between Model and View for Homeview and Tower of Hanoi, between Model and Controller, between Controller and Model and between Model and View for Tic-Tac-Toe and Checkers)
 import logging
 from config import *
 
@@ -38,7 +37,7 @@ logger.addHandler(ch)
 class AppFrankaEmikaGames(threading.Thread):
     def __init__(self):
         """
-        initialize the the necessary objects (e.g. Thread or Queue) for the Model, View, controller architecture:
+        initialize the the necessary objects (e.g. Thread or Mailbox) for the Model, View, controller architecture:
         View: for the GUI with the Tkinter library
         Model: thread for the Comunication with the Franka Emika Robot, Camera Access
         Controller: thread for the Game Engine and CNNS detection and prediction
@@ -50,10 +49,10 @@ class AppFrankaEmikaGames(threading.Thread):
         
         self.myAppModel = None
         self.myAppConroller = None
-        self.myResultFrameQueue = queue.Queue(MAXLEN) # Queue for the camera frame Transmission between Model and View. The Goal is to use it for the Homeview and the tower of Hanoi Game View 
-        self.myResultFrameQueue_Model_Controller = queue.Queue(MAXLEN) # Queue for the camera frame Transmission between Model and Controller. The Goal is to use this Frame for Game Engine in Controller (detection and prediction of the pieces for checkers and Tic-Tac-Toe)
-        self.myResultFrameQueue_Controller_Model = queue.Queue(MAXLEN) # Queue for the transmission of the result frame between Controller and Model to give the user an overview of the detected game pieces.
-        self.myResultFrameQueue_Games= queue.Queue(MAXLEN) # Queue for the transmission of the result frame between Model and View (this frame is for the Tic-Tac-Toe and Checkers View)
+        self.myResultFrameQueue = frameMailbox.FrameMailbox("Model -> View") # Mailbox for the camera frame Transmission between Model and View. The Goal is to use it for the Homeview and the tower of Hanoi Game View 
+        self.myResultFrameQueue_Model_Controller = frameMailbox.FrameMailbox("Model -> Controller") # Mailbox for the camera frame Transmission between Model and Controller. The Goal is to use this Frame for Game Engine in Controller (detection and prediction of the pieces for checkers and Tic-Tac-Toe)
+        self.myResultFrameQueue_Controller_Model = frameMailbox.FrameMailbox("Controller -> Model") # Mailbox for the transmission of the result frame between Controller and Model to give the user an overview of the detected game pieces.
+        self.myResultFrameQueue_Games= frameMailbox.FrameMailbox("Model -> Games View") # Mailbox for the transmission of the result frame between Model and View (this frame is for the Tic-Tac-Toe and Checkers View)
         
         self.lockForimshow = threading.Lock()   # lock object to protect imshow() 
         
@@ -92,7 +91,10 @@ class AppFrankaEmikaGames(threading.Thread):
         self.myAppController.start()
         self.myAppView.startMainloop()    # mainloop Thread for TKinter GUI
         self.event.set()                  # kill other threads
+        for mailbox in (self.myResultFrameQueue, self.myResultFrameQueue_Model_Controller, self.myResultFrameQueue_Controller_Model, self.myResultFrameQueue_Games):
+            logger.info("AppFrankaEmikaGames: " + mailbox.summary()) # number of frames skipped by every stage
 
-myAppFrankaEmikaGames = AppFrankaEmikaGames()
-myAppFrankaEmikaGames.main()
+if __name__ == "__main__": # the processes of the parallel checkers search (CHECKERS_PARALLEL_WORKERS) import this file again and must not start the app
+    myAppFrankaEmikaGames = AppFrankaEmikaGames()
+    myAppFrankaEmikaGames.main()
 
@@ -3,7 +3,7 @@
 # implements model component of MVC architecture of Franka Emika Games
 # implement the algorithm to convert pixel coordinates into panda-coordinates
 # connected with the camera and the panda-robot 
-# generate camera-frames and send it over queue to the controller to perform detection.
+# generate camera-frames and send it over mailbox to the controller to perform detection.
 # send robot coordinates over frankx to panda-robot
 
 import threading  # Parent Class
@@ -11,8 +11,8 @@ import logging
 import time
 import cv2                          # to perform opencv transformation and debugging
 import videoStreamer
+import frameWarp # perspective warp with cached remap tables
 from config import *
-import queue
 from argparse import ArgumentParser
 import math
 from re import L
@@ -56,10 +56,10 @@ class AppModel(threading.Thread):
         """
         self.event = event
         self.lockForimshow = lockForimshow # debug opencv
-        self.resultFrameProducer = resultFrameProducer # send frames over the queue to view (for homeview and tower of hanoi)
-        self.myResultFrameQueue_Model_Controller = myResultFrameQueue_Model_Controller  # send frames over the queue to controller (for tic tac toe and checker)
+        self.resultFrameProducer = resultFrameProducer # send frames over the mailbox to view (for homeview and tower of hanoi)
+        self.myResultFrameQueue_Model_Controller = myResultFrameQueue_Model_Controller  # send frames over the mailbox to controller (for tic tac toe and checker)
         self.myResultFrameQueue_Controller_Model = myResultFrameQueue_Controller_Model # get frames from controller
-        self.myResultFrameQueue_Model_View = myResultFrameQueue_Model_View # send frame over the queue to view (for tic tac toe and checker)
+        self.myResultFrameQueue_Model_View = myResultFrameQueue_Model_View # send frame over the mailbox to view (for tic tac toe and checker)
         
         # determine current and previous time to calcule the fps for the camera frames
         self.newFrameTime= 0
@@ -68,6 +68,13 @@ class AppModel(threading.Thread):
         # to get camera frames and adjust brightness of frames
         self.camStreamer= videoStreamer.VideoStreamer(self.event)
         self.camStreamer.start() 
+        self.frameId = 0 # frame id of the last frame of the VideoStreamer
+        self.frameTime = None # capture time of the current frame
+        self.resultSeq = 0 # sequence number of the last result frame of the controller
+        # the remap tables of the calibration matrices are computed once and used for every frame. The frame of the games is warped in two steps:
+        # the controller detects the pieces on the frame of the table (robot coordinates) and the result frame is zoomed on the gameboard
+        self.tableWarp = frameWarp.FrameWarp((WIDTH, HEIGHT)) # frame of the camera -> frame of the table (cornersTableData)
+        self.gameWarp = frameWarp.FrameWarp((WIDTH, HEIGHT)) # result frame of the controller -> zoom on the gameboard (cornersdataTicTT or cornersdataCheckers)
         self.stopFPSHomeView = False # stop fps during the calibration of camera view in homeview
         self.cornersTableData = None # opencv matrix of 4 points on the white table of panda-robot
         self.appName = None # to notify the appModel  to send the camera frame to the currrent openend view
@@ -363,7 +370,7 @@ class AppModel(threading.Thread):
         convert pixel into panda-koordinate and send its to panda-robot 
         :param: xy_coord_From: start position of checker piece
         :param: xy_coord_To: destination position of checker piece
-        :param: xy_coord_via: player piece, that has been jumby 
+        :param: xy_coord_via: player pieces, that have been jumby (all the pieces of a capture sequence)
 
         :return: None
         """
@@ -382,16 +389,22 @@ class AppModel(threading.Thread):
         self.robot.move(LinearMotion(Affine(robotToX, robotToY, 0.1)))
 
 
-        if len(xy_coord_via) != 0: # if a player has been jumbed by computer piece 
-            for i in xy_coord_via:
-                robotViaX, robotViaY = self.pixelToXY_Robot(i[0], i[1])
+        if len(xy_coord_via) != 0: # if player pieces have been jumbed by computer piece (all the pieces of a capture sequence in one trip)
+            dropX, dropY = 0.119622, -0.340037 # position to drop the player pieces
+            vias = [self.pixelToXY_Robot(i[0], i[1]) for i in xy_coord_via]
+            lastX, lastY = robotToX, robotToY
+            while vias:
+                via = min(vias, key=lambda via: (via[0] - lastX) ** 2 + (via[1] - lastY) ** 2) # nearest player piece first
+                vias.remove(via)
+                robotViaX, robotViaY = via
+                lastX, lastY = dropX, dropY # the next piece is taken after the drop
                 self.gripper.move(0.06)
                 self.robot.move(LinearMotion(Affine(robotViaX, robotViaY, 0.1)))
                 
                 self.robot.move(LinearMotion(Affine(robotViaX, robotViaY, self.Z_object_Checkers))) # go to the position of player piece
                 self.gripper.clamp() # grab player piece
                 self.robot.move(LinearMotion(Affine(robotViaX, robotViaY, 0.1)))
-                self.robot.move(LinearMotion(Affine(0.119622, -0.340037, 0.1))) # drop player piece
+                self.robot.move(LinearMotion(Affine(dropX, dropY, 0.1))) # drop player piece
                 self.gripper.open()
 
         
@@ -408,13 +421,15 @@ class AppModel(threading.Thread):
         """
         while not self.event.is_set():
             #logger.info("Thread no stopped !")
-            self.frame = self.camStreamer.read() # get frames from VideoStreamer
-            if (self.frame is None or self.frame.size == 0):
-                time.sleep(1.1)
+            frameId, frame, frameTime = self.camStreamer.waitFrame(self.frameId, timeout=1.1) # wait for the next frame of the VideoStreamer, every frame is used only once
+            if (frame is None or frame.size == 0):
                 continue 
             else :  # if frames available
+                self.frameId, self.frame, self.frameTime = frameId, frame, frameTime # capture time of the frame for the mailboxes
                 if (self.cornersTableData is not None):
-                    self.frame = cv2.warpPerspective(self.frame, self.cornersTableData,(WIDTH, HEIGHT)) # opencv transformation of the 4 points on the robot table             
+                    self.frame = self.tableWarp.warp(self.frame, self.cornersTableData) # opencv transformation of the 4 points on the robot table             
+                else:
+                    self.frame = self.frame.copy() # the buffer of the VideoStreamer is reused for a later frame
 
                 if (FLIPHORIZONTAL == True): # flip horizontal if activated
                     self.frame= cv2.flip(self.frame, 1)
@@ -424,11 +439,9 @@ class AppModel(threading.Thread):
 
                 if self.appName == "tictactoe": # if the user has opened the tic tac toe window (view) 
                     self.newFrameTime = time.time() # get current time
-                    if not self.myResultFrameQueue_Model_Controller.full():
-                        self.myResultFrameQueue_Model_Controller.put(self.frame_Game) # if queue empty, then send the frames to the controller for tic tac toe algorithm
+                    self.myResultFrameQueue_Model_Controller.put(self.frame_Game, self.frameTime) # send the frames to the controller for tic tac toe algorithm (replaces the frame that the controller has not read)
                     
-                    if not self.myResultFrameQueue_Controller_Model.empty():
-                        self.frame_Game_final = self.myResultFrameQueue_Controller_Model.get() # if queue not empty, then get the result frames from the controller 
+                    self.resultSeq, self.frame_Game_final, _ = self.myResultFrameQueue_Controller_Model.get(self.resultSeq) # get the new result frame from the controller (None if no new result)
 
                     if OPENCV_DEBUG_TIC_TAC_TOE == True: # for debugging tic tac toe camera view
                         self.lockForimshow.acquire()
@@ -443,27 +456,22 @@ class AppModel(threading.Thread):
                         pass
                     else:
                         if self.cornersdataTicTT is not None:
-                            self.frame_Game_final = cv2.warpPerspective(self.frame_Game_final, self.cornersdataTicTT,(WIDTH, HEIGHT)) # opencv transformation for zoom 
+                            self.frame_Game_final = self.gameWarp.warp(self.frame_Game_final, self.cornersdataTicTT) # opencv transformation for zoom 
                         
                     if (SHOWFPS == True and self.stopFPSTicTT == False):
                         outText = "FPS: {:.1f}".format(1/(self.newFrameTime - self.previousFrameTime))
                         cv2.putText(self.frame_Game_final, outText, (WIDTH-170, 25), cv2.FONT_HERSHEY_SIMPLEX, 1, (40, 40, 255), 2) # display fps in camera view
                     self.previousFrameTime = time.time()
                                         
-                    if not self.myResultFrameQueue_Model_View.full():
-                        if self.frame_Game_final is None:
-                            pass
-                        else:
-                            self.myResultFrameQueue_Model_View.put(self.frame_Game_final) # send the result frames to the appView
+                    if self.frame_Game_final is not None:
+                        self.myResultFrameQueue_Model_View.put(self.frame_Game_final, self.frameTime) # send the result frames to the appView
                 
                 elif self.appName == "checkers": # if the user has opened the checkers window (view) 
                     self.newFrameTime = time.time()
                     #self.frame_Game = cv2.flip(self.frame_Game, -1)
-                    if not self.myResultFrameQueue_Model_Controller.full():
-                        self.myResultFrameQueue_Model_Controller.put(self.frame_Game)
+                    self.myResultFrameQueue_Model_Controller.put(self.frame_Game, self.frameTime)
                     
-                    if not self.myResultFrameQueue_Controller_Model.empty():
-                        self.frame_Game_final = self.myResultFrameQueue_Controller_Model.get()
+                    self.resultSeq, self.frame_Game_final, _ = self.myResultFrameQueue_Controller_Model.get(self.resultSeq)
 
                     if OPENCV_DEBUG_CHECKERS == True:
                         self.lockForimshow.acquire()
@@ -478,17 +486,14 @@ class AppModel(threading.Thread):
                         pass
                     else:
                         if self.cornersdataCheckers is not None:
-                            self.frame_Game_final = cv2.warpPerspective(self.frame_Game_final, self.cornersdataCheckers,(WIDTH, HEIGHT)) 
+                            self.frame_Game_final = self.gameWarp.warp(self.frame_Game_final, self.cornersdataCheckers) 
 
                     if (SHOWFPS == True and self.stopFPSCheckers == False):
                         outText = "FPS: {:.1f}".format(1/(self.newFrameTime - self.previousFrameTime))
                         cv2.putText(self.frame_Game_final, outText, (WIDTH-170, 25), cv2.FONT_HERSHEY_SIMPLEX, 1, (40, 40, 255), 2)
                     self.previousFrameTime = time.time()
-                    if not self.myResultFrameQueue_Model_View.full():
-                        if self.frame_Game_final is None:
-                            pass
-                        else:         
-                            self.myResultFrameQueue_Model_View.put(self.frame_Game_final)
+                    if self.frame_Game_final is not None:
+                        self.myResultFrameQueue_Model_View.put(self.frame_Game_final, self.frameTime)
 
                 elif self.appName == "menu_or_toh": # if the user has opened the homeview or tower of hanoi window (view) 
                     self.newFrameTime = time.time()
@@ -507,8 +512,6 @@ class AppModel(threading.Thread):
                         cv2.putText(self.frame, outText, (WIDTH-170, 25), cv2.FONT_HERSHEY_SIMPLEX, 1, (40, 40, 255), 2)
                     self.previousFrameTime = time.time()
 
-                    if not self.resultFrameProducer.full():
-                        self.resultFrameProducer.put(self.frame) # send frame to appView for tower of hanoi and homeview
-                time.sleep(0.1)
+                    self.resultFrameProducer.put(self.frame, self.frameTime) # send frame to appView for tower of hanoi and homeview
         logger.debug("AppModel: thread stopped, exit ...")
         exit()
\ No newline at end of file
@@ -55,8 +55,10 @@ class AppView(threading.Thread):
         :return: create the Home View Component with a TKinter GUI
         """
         logger.debug("AppView: Home View init...")
-        self.resultFrameConsumer = resultFrameConsumer # reads frames from Consumer-Queue for Homeview and tower of hanoi View
-        self.resultFrameConsumer_Game = resultFrameConsumer_Game # reads frames from Consumer-Queue for tic Tac Toe and Checkers
+        self.resultFrameConsumer = resultFrameConsumer # reads frames from Consumer-Mailbox for Homeview and tower of hanoi View
+        self.resultFrameConsumer_Game = resultFrameConsumer_Game # reads frames from Consumer-Mailbox for tic Tac Toe and Checkers
+        self.frameSeq = 0 # sequence number of the last frame of resultFrameConsumer
+        self.frameSeqGames = 0 # sequence number of the last frame of resultFrameConsumer_Game
         self.getCORNERSTABLE = getCORNERSTABLE # no matrix available, then start a new calibration, to get the 4 points on robot table 
         self.getCORNERSTicTT = getCORNERSTicTT # no matrix available, then start a new calibration, to get 4 points, to zoom the tic tac toe gameboard
         self.getCORNERSCHECKERS = getCORNERSCHECKERS # # no matrix available, then start a new calibration, to get 4 points, to zoom the checkers gameboard
@@ -330,8 +332,9 @@ class AppView(threading.Thread):
         if (self.getCORNERSTABLE and len(self.cornersTable)== 0 ): # to start new calibration
             self.findConersTable()
 
-        if not self.resultFrameConsumer.empty():
-            self.frame = self.resultFrameConsumer.get()
+        self.frameSeq, frame, _ = self.resultFrameConsumer.get(self.frameSeq) # new frame of the mailbox (None if the frame has already been drawn)
+        if frame is not None:
+            self.frame = frame
             if (not self.frame.size == 0):
                 #logger.debug("AppView: camera frame available for Canvas in Home View")
                 self.drawCornersAndLine()  # indicate (x,y)-Coordinates for Calibration
@@ -632,8 +635,9 @@ class AppView(threading.Thread):
         
         if (self.getCORNERSTicTT and len(self.cornersTicTT)== 0 ):# to start new calibration
             self.findConersTicTT()
-        if not self.resultFrameConsumer_Game.empty():
-            self.frameTicTT = self.resultFrameConsumer_Game.get()
+        self.frameSeqGames, frame, _ = self.resultFrameConsumer_Game.get(self.frameSeqGames)
+        if frame is not None:
+            self.frameTicTT = frame
             if (not self.frameTicTT.size == 0):
                 #logger.debug("AppView: camera frame available for Canvas in Tic Tac Toe View")
                 self.drawCornersAndGridTicTT()  # indicate (x,y)-Coords for Calibration
@@ -756,6 +760,46 @@ class AppView(threading.Thread):
         
         logger.debug("AppView: checkers Game level {}".format(self.levelCheckers.get()))
 
+        # construct a frame to hold Radio buttons for the engine of the computer in checkers game
+        tkBtnFrame_engine = Frame(self.windowCheckers, relief=RIDGE, borderwidth=1)
+        tkBtnFrame_engine.pack(fill=BOTH, expand=True)
+
+        self.engineCheckers = IntVar()
+        self.engineCheckers.set(CHECKERS_ENGINE)
+
+        labelEngine = Label(tkBtnFrame_engine, text='Computer:', font=('verdana', 16, 'bold'))
+        labelEngine.pack(padx=20, ipady=10, expand=True, fill='both', side='left')
+
+        # radiobutton to play with the alpha beta search
+        radioBtnAlphaBeta = Radiobutton(tkBtnFrame_engine, variable=self.engineCheckers, value=0,
+                                          indicatoron = 0, borderwidth=3, font=('verdana', 12, 'bold'), text="alpha beta search", width=10 , command=self.notifyObserverCheckers)
+        radioBtnAlphaBeta.pack(ipadx=10, ipady=10, expand=True, fill='both', side='left')
+
+        # radiobutton to play with the monte carlo tree search
+        radioBtnMCTS = Radiobutton(tkBtnFrame_engine, variable=self.engineCheckers, value=1,
+                                          indicatoron = 0, borderwidth=3, font=('verdana', 12, 'bold'), text="monte carlo tree search", width=10 , command=self.notifyObserverCheckers)
+        radioBtnMCTS.pack(ipadx=10, ipady=10, expand=True, fill='both', side='left')
+
+        logger.debug("AppView: checkers Game engine {}".format(self.engineCheckers.get()))
+
+        # construct a frame to hold Radio buttons for the difficulty of the computer in checkers game
+        tkBtnFrame_difficulty = Frame(self.windowCheckers, relief=RIDGE, borderwidth=1)
+        tkBtnFrame_difficulty.pack(fill=BOTH, expand=True)
+
+        self.difficultyCheckers = IntVar()
+        self.difficultyCheckers.set(CHECKERS_DIFFICULTY)
+
+        labelDifficulty = Label(tkBtnFrame_difficulty, text='Difficulty:', font=('verdana', 16, 'bold'))
+        labelDifficulty.pack(padx=20, ipady=10, expand=True, fill='both', side='left')
+
+        # one radiobutton for every difficulty profile (search budget of the computer)
+        for difficulty, profile in CHECKERS_DIFFICULTY_PROFILES.items():
+            radioBtnDifficulty = Radiobutton(tkBtnFrame_difficulty, variable=self.difficultyCheckers, value=difficulty,
+                                              indicatoron = 0, borderwidth=3, font=('verdana', 12, 'bold'), text=profile["name"], width=10 , command=self.notifyObserverCheckers)
+            radioBtnDifficulty.pack(ipadx=10, ipady=10, expand=True, fill='both', side='left')
+
+        logger.debug("AppView: checkers Game difficulty {}".format(self.difficultyCheckers.get()))
+
         
         # configure the button to get the centers of fields from Checkers gameboard
         tkBtnFrame_get_center = Frame(self.windowCheckers, relief=RIDGE, borderwidth=1)
@@ -884,6 +928,8 @@ class AppView(threading.Thread):
         to notify the observer (appController) with values:
         - stopFPSCheckers: to hide FPS during calibration
         - levelCheckers: level of checkers Games (0 beginner or 1 for professional)
+        - engineCheckers: engine of the computer (0 alpha beta search or 1 monte carlo tree search)
+        - difficultyCheckers: difficulty of the computer (0 easy, 1 medium or 2 hard, see CHECKERS_DIFFICULTY_PROFILES)
         - cornersdataCheckers: matrix for checkers View
         - appName: to notify that checkers view is launch. The Goal is to notify the appModel for it to send the camera frame to the currrent view running
         - getCenterofFieldsCheckers: to get the centers of fields of checkers Gameboard
@@ -892,7 +938,7 @@ class AppView(threading.Thread):
         :return: None 
         """
         logger.debug("AppView checkers view: notifyObserverCheckers")
-        self.observer.updateCheckers(stopFPSCheckers = self.getCORNERSCHECKERS, levelCheckers = self.levelCheckers.get(), cornersdataCheckers = self.allPointsCheckers, appName = self.appName, getCenterofFieldsCheckers = self.getCenterofFieldsCheckers, use_getCenterofFields = self.useButton_get_center.get())
+        self.observer.updateCheckers(stopFPSCheckers = self.getCORNERSCHECKERS, levelCheckers = self.levelCheckers.get(), engineCheckers = self.engineCheckers.get(), difficultyCheckers = self.difficultyCheckers.get(), cornersdataCheckers = self.allPointsCheckers, appName = self.appName, getCenterofFieldsCheckers = self.getCenterofFieldsCheckers, use_getCenterofFields = self.useButton_get_center.get())
     
     
     def continueGameCheckers(self):
@@ -1071,8 +1117,9 @@ class AppView(threading.Thread):
 
         if (self.getCORNERSCHECKERS and len(self.cornersCheckers)== 0 ):# to start new calibration
             self.findConersCheckers()
-        if not self.resultFrameConsumer_Game.empty():
-            self.frameCheckers = self.resultFrameConsumer_Game.get()
+        self.frameSeqGames, frame, _ = self.resultFrameConsumer_Game.get(self.frameSeqGames)
+        if frame is not None:
+            self.frameCheckers = frame
             if (not self.frameCheckers.size == 0):
                 #logger.debug("AppView: camera frame available for Canvas in checkers View")
                 self.drawCornersAndGridCheckers()  # indicate (x,y)-Coords for Calibration
@@ -5,13 +5,15 @@ and has been modified for the creation of our checkers application.
 This code contains the alpha beta pruning and minimax algorithms.
 """
 
-from copy import deepcopy
 import time
 import math
-import numpy as np
 from config import *
 import _thread # to create a new thread 
 import logging
+import checkersBitboard # compact bitboard representation and move generation of the gameboard
+import checkersEngine # alpha beta search with transposition table
+import checkersBook # opening book and endgame database
+import checkersMCTS # monte carlo tree search
 
 # create logger
 logger = logging.getLogger('checkers.py') 
@@ -33,6 +35,14 @@ ch.setFormatter(formatter)
 # add ch to logger
 logger.addHandler(ch)
 
+# search statistics of every move of the computer as JSON lines in the same log file (see checkersEngine.SearchStats)
+stats_logger = logging.getLogger('checkers.py.stats')
+stats_logger.setLevel(logging.DEBUG)
+stats_logger.propagate = False
+stats_handler = logging.StreamHandler(ch.stream) # same stream as the log file, the lines are not mixed
+stats_handler.setFormatter(logging.Formatter('%(message)s'))
+stats_logger.addHandler(stats_handler)
+
 class Node:
     
     def __init__(self, board, move=None):
@@ -57,32 +67,16 @@ class Node:
 
         :return: children_states: array of current state of Node with the current gameboard after the possible moves and jumps or moves of computer or of the player for the minimax and alpha beta algorithm
         """
-        current_state = deepcopy(self.board) # copy of array
-        available_moves = [] # array to save available move of player or computer 
+        current_state = checkersBitboard.from_matrix(self.board) # bitboard of the current gameboard (no copy of the array is needed)
         children_states = [] # array to save the next status of Node class (children of current Node class) 
-        big_letter = "" 
-        queen_row = 0 
-        if maximizing_player is True: # if maximizing player, then find availables moves or possibles jumps for the computer 
-            available_moves = Checkers.find_available_moves(current_state, mandatory_jumping) # verify if mandatory jump is True, then get available jumps or moves
-            big_letter = "C" # when the computer (c) become King (C)
-            queen_row = 7 # first index of the two-dimensional array of current game board, if the computer come to this position, he become king
-        else: # if minimizing player, then find availables moves or possibles jumps for the player 
-            available_moves = Checkers.find_player_available_moves(current_state, mandatory_jumping) # verify if mandatory jump is True, then get available jumps or moves
-            big_letter = "B" # when the player (b) become King (B)
-            queen_row = 0 # first index of the two-dimensional array of current game board, if the computer come to this position, he become king
-        
+
         """
         use availables moves or jumps and the result array of gameboard after the modification into the Node,
         save the result Nodes into array children_states as child of the current state of Node and return this array
         """
-        for i in range(len(available_moves)): 
-            old_i = available_moves[i][0]
-            old_j = available_moves[i][1]
-            new_i = available_moves[i][2]
-            new_j = available_moves[i][3]
-            state = deepcopy(current_state)
-            Checkers.make_a_move(state, old_i, old_j, new_i, new_j, big_letter, queen_row)
-            children_states.append(Node(state, [old_i, old_j, new_i, new_j]))
+        for move in checkersBitboard.generate_moves(current_state, maximizing_player, mandatory_jumping):
+            state = checkersBitboard.make_move(current_state, move, maximizing_player)
+            children_states.append(Node(checkersBitboard.to_matrix(state), checkersBitboard.move_to_list(move)))
         return children_states
 
     def get_board(self):
@@ -117,6 +111,25 @@ class Checkers:
 
         self.message = None # initialize the message to notify the appController and the appController can send this to appView
         self.final_score = [0, 0] # initialize the score of the player and the score of computer
+        self.alpha_beta = checkersEngine.SearchEngine() # search engine with transposition table, reused for all the turns of the game
+        self.mcts = None # monte carlo tree search, created when it is selected
+        self.engine = self.alpha_beta # selected engine of the computer (see select_engine())
+        self.think_ms = CHECKERS_THINK_MS # time budget of a move of the computer, 0 to search with the fixed depth self.search_depth
+        self.search_depth = CHECKERS_SEARCH_DEPTH # fixed search depth if self.think_ms is 0
+        self.max_nodes = 0 # node budget of the alpha beta search, 0 for no limit (see set_difficulty())
+        self.max_playouts = CHECKERS_MCTS_ITERATIONS # playout budget of the monte carlo tree search, 0 for no limit
+        self.noise = 0 # random noise of the values of the moves of the computer, 0 for the best move
+        self.profile = CHECKERS_DIFFICULTY_PROFILES[CHECKERS_DIFFICULTY] # difficulty of the computer (see set_difficulty())
+        self.use_pondering = CHECKERS_PONDER # search during the turn of the player
+        self.use_book = True # use the opening book and the endgame database
+        self.search_stats = None # statistics of the last move of the computer (checkersEngine.SearchStats)
+        self.computer_captured = [] # positions "xy" of the player pieces jumped by the last move of the computer
+        self.ponderer = checkersEngine.Ponderer(self.alpha_beta) if CHECKERS_PONDER else None # search during the turn of the player
+        self.opening_book = checkersBook.OpeningBook() # moves of the computer at the start of the game, empty if the file does not exist
+        self.endgame_database = checkersBook.EndgameDatabase() # perfect moves of the computer with few pieces, empty if the file does not exist
+        self.select_engine(CHECKERS_ENGINE)
+        self.set_difficulty(CHECKERS_DIFFICULTY)
+        logger.debug("Checkers: opening book with {} gameboards, endgame database with {} gameboards (up to {} pieces)".format(len(self.opening_book), len(self.endgame_database), self.endgame_database.max_pieces))
 
 
     def get_player_input(self, fromInd, toInd):
@@ -155,8 +168,9 @@ class Checkers:
 
         move = [int(old_i), int(old_j), int(new_i), int(new_j)] # do a array to save the x,y start position of player piece and x,y cible position of this piece 
         
-        # # find the player move in the available moves or available jumps
-        if move not in available_moves: # if the player move is not in the available jumps or moves
+        # # find the player move in the available moves or available jumps (the first capture sequence with these start and cible positions)
+        via = next((available[4] for available in available_moves if available[:4] == move), None)
+        if via is None: # if the player move is not in the available jumps or moves
             self.message = "Illegal user move! please try again !"
             self.observerController.notifyObserverViewCheckers(message = self.message)
             _thread.start_new_thread(self.observerController.doAudio, (self.message,))
@@ -173,7 +187,7 @@ class Checkers:
             _thread.start_new_thread(self.observerController.doAudio, (PlAYER_PLAY,))
    
             
-            Checkers.make_a_move(self.matrix, int(old_i), int(old_j), int(new_i), int(new_j), "B", 0) # update the current gameboard after a jump or after a move of the player and verify if the player become king 
+            Checkers.make_a_move(self.matrix, int(old_i), int(old_j), int(new_i), int(new_j), "B", 0, via) # update the current gameboard after a jump or after a move of the player and verify if the player become king 
             for m in range(8):
                 for n in range(8):
                     if self.matrix[m][n][0] == "c" or self.matrix[m][n][0] == "C": # write the position changes of the computer pieces into the array of gameboard
@@ -193,45 +207,10 @@ class Checkers:
         :return: available_jumps: computer can do a jump or a move 
                  available_jumps: computer must do one of the available jump (mandatory)
                  available_moves: computer can do one of the available move
+                 every move is [old_i, old_j, new_i, new_j, via] with via the list of [i, j] of the jumped pieces
         """
-        available_moves = []
-        available_jumps = []
-        for m in range(8):
-            for n in range(8):
-                if board[m][n][0] == "c": # verify if the value of the array beginnt with 'c' (computer)
-                    if Checkers.check_moves(board, m, n, m + 1, n + 1): # verify if the current move is authorized (cible position is bottom right from current position)
-                        available_moves.append([m, n, m + 1, n + 1]) # if the current move is authorized then save this move into the available moves
-                    if Checkers.check_moves(board, m, n, m + 1, n - 1): # verify if the current move is authorized (cible position is bottom left from current position)
-                        available_moves.append([m, n, m + 1, n - 1])
-                    if Checkers.check_jumps(board, m, n, m + 1, n - 1, m + 2, n - 2): # jump the computer piece over the player piece (cible position is bottom left from current position)
-                        available_jumps.append([m, n, m + 2, n - 2])
-                    if Checkers.check_jumps(board, m, n, m + 1, n + 1, m + 2, n + 2): # jump the computer piece over the player piece (cible position is bottom right from current position)
-                        available_jumps.append([m, n, m + 2, n + 2])
-                elif board[m][n][0] == "C": # verify if the value of the array beginnt with 'C' (computer has becommed king)
-                    if Checkers.check_moves(board, m, n, m + 1, n + 1):# verify if the current move is authorized (cible position is bottom right from current position)
-                        available_moves.append([m, n, m + 1, n + 1]) # if the current move is authorized then save this move into the available moves
-                    if Checkers.check_moves(board, m, n, m + 1, n - 1):# verify if the current move is authorized (cible position is bottom left from current position)
-                        available_moves.append([m, n, m + 1, n - 1])
-                    if Checkers.check_moves(board, m, n, m - 1, n - 1): # verify if the current move is authorized (cible position is top left from current position)
-                        available_moves.append([m, n, m - 1, n - 1])
-                    if Checkers.check_moves(board, m, n, m - 1, n + 1): # verify if the current move is authorized (cible position is top right from current position)
-                        available_moves.append([m, n, m - 1, n + 1])
-                    if Checkers.check_jumps(board, m, n, m + 1, n - 1, m + 2, n - 2): # jump the computer piece over the player piece (cible position is bottom left from current position)
-                        available_jumps.append([m, n, m + 2, n - 2])
-                    if Checkers.check_jumps(board, m, n, m - 1, n - 1, m - 2, n - 2): # jump the computer piece over the player piece (cible position is top left from current position)
-                        available_jumps.append([m, n, m - 2, n - 2])
-                    if Checkers.check_jumps(board, m, n, m - 1, n + 1, m - 2, n + 2): # jump the computer piece over the player piece (cible position is top right from current position)
-                        available_jumps.append([m, n, m - 2, n + 2])
-                    if Checkers.check_jumps(board, m, n, m + 1, n + 1, m + 2, n + 2): # jump the computer piece over the player piece (cible position is bottom right from current position)
-                        available_jumps.append([m, n, m + 2, n + 2])
-        if mandatory_jumping is False: # if mandatory jumping is not activated
-            available_jumps.extend(available_moves) # add elements of  available_moves to available_jumps. the computer can do a jump or a move
-            return available_jumps
-        elif mandatory_jumping is True: # if mandatory jumping is activated
-            if len(available_jumps) == 0: # if not jump over player available, then use the computer must play his move 
-                return available_moves
-            else: # if jump over player available, the player must jump over the player 
-                return available_jumps
+        available_moves = checkersBitboard.generate_moves(checkersBitboard.from_matrix(board), True, mandatory_jumping) # shift-based generation of the moves and jumps (complete capture sequences) on the bitboard
+        return [checkersBitboard.move_to_list(move) + [checkersBitboard.captured_to_list(move)] for move in available_moves] # convert into the format [old_i, old_j, new_i, new_j, [[via_i, via_j], ...]]
 
     @staticmethod
     def check_jumps(board, old_i, old_j, via_i, via_j, new_i, new_j):
@@ -354,45 +333,10 @@ class Checkers:
         :return: available_jumps: player can do a jump or a move 
                  available_jumps: player must do one of the available jump (mandatory)
                  available_moves: player can do one of the available move
+                 every move is [old_i, old_j, new_i, new_j, via] with via the list of [i, j] of the jumped pieces
         """
-        available_moves = []
-        available_jumps = []
-        for m in range(8):
-            for n in range(8):
-                if board[m][n][0] == "b": # verify if the value of the array beginnt with 'b' (player)
-                    if Checkers.check_player_moves(board, m, n, m - 1, n - 1): # verify if the current move is authorized (cible position is Top left from current position)
-                        available_moves.append([m, n, m - 1, n - 1]) # if the current move is authorized then save this move into the available moves
-                    if Checkers.check_player_moves(board, m, n, m - 1, n + 1): # verify if the current move is authorized (cible position is Top right from current position)
-                        available_moves.append([m, n, m - 1, n + 1])
-                    if Checkers.check_player_jumps(board, m, n, m - 1, n - 1, m - 2, n - 2): # jump the player piece over the computer piece (cible position is Top left from current position)
-                        available_jumps.append([m, n, m - 2, n - 2])
-                    if Checkers.check_player_jumps(board, m, n, m - 1, n + 1, m - 2, n + 2):# jump the player piece over the computer piece (cible position is Top right from current position) 
-                        available_jumps.append([m, n, m - 2, n + 2]) 
-                elif board[m][n][0] == "B": # # verify if the value of the array beginnt with 'B' (player has becommed king)
-                    if Checkers.check_player_moves(board, m, n, m - 1, n - 1): # verify if the current move is authorized (cible position is Top left from current position)
-                        available_moves.append([m, n, m - 1, n - 1])  # if the current move is authorized then save this move into the available moves
-                    if Checkers.check_player_moves(board, m, n, m - 1, n + 1): # verify if the current move is authorized (cible position is Top right from current position)
-                        available_moves.append([m, n, m - 1, n + 1])
-                    if Checkers.check_player_jumps(board, m, n, m - 1, n - 1, m - 2, n - 2): # jump the player piece over the computer piece (cible position is Top left from current position)
-                        available_jumps.append([m, n, m - 2, n - 2])
-                    if Checkers.check_player_jumps(board, m, n, m - 1, n + 1, m - 2, n + 2): # jump the player piece over the computer piece (cible position is Top right from current position)
-                        available_jumps.append([m, n, m - 2, n + 2])
-                    if Checkers.check_player_moves(board, m, n, m + 1, n - 1): # verify if the current move is authorized (cible position is bottom left from current position)
-                        available_moves.append([m, n, m + 1, n - 1])
-                    if Checkers.check_player_jumps(board, m, n, m + 1, n - 1, m + 2, n - 2): # jump the player piece over the computer piece (cible position is bottom left from current position)
-                        available_jumps.append([m, n, m + 2, n - 2])
-                    if Checkers.check_player_moves(board, m, n, m + 1, n + 1): # verify if the current move is authorized (cible position is bottom right from current position)
-                        available_moves.append([m, n, m + 1, n + 1])
-                    if Checkers.check_player_jumps(board, m, n, m + 1, n + 1, m + 2, n + 2): # jump the player piece over the computer piece (cible position is bottom right from current position)
-                        available_jumps.append([m, n, m + 2, n + 2])
-        if mandatory_jumping is False: # if mandatory jumping is not activated
-            available_jumps.extend(available_moves) # add elements of  available_moves to available_jumps. the player can do a jump or a move
-            return available_jumps 
-        elif mandatory_jumping is True: # if mandatory jumping is activated
-            if len(available_jumps) == 0: # if not jump over computer available, then use the player must play his move 
-                return available_moves 
-            else: # if jump over computer available, the player must jump over the computer 
-                return available_jumps
+        available_moves = checkersBitboard.generate_moves(checkersBitboard.from_matrix(board), False, mandatory_jumping) # shift-based generation of the moves and jumps (complete capture sequences) on the bitboard
+        return [checkersBitboard.move_to_list(move) + [checkersBitboard.captured_to_list(move)] for move in available_moves] # convert into the format [old_i, old_j, new_i, new_j, [[via_i, via_j], ...]]
 
     @staticmethod
     def check_player_moves(board, old_i, old_j, new_i, new_j):
@@ -451,18 +395,21 @@ class Checkers:
             return False
         return True
 
-    def evaluate_states(self):
+    def evaluate_states(self, cancel=None):
         """
         minimax and alpha beta pruning algorithm to generate the move or jump of computer with the current array gameboard
-        :param: None
+        :param: cancel: cancel token (threading.Event) of the request, stops the search when it is set (see CheckersService)
 
         :return: str(move[0]), str(move[1]), str(move[2]), str(move[3]): x(move[0]),y(move[1])- start position of the computer move 
                                                                        : x(move[2]),y(move[3])- cible position of the computer move 
         """
         t1 = time.time() # get the current time to calculate the time reaction of algorithm
-        current_state = Node(deepcopy(self.matrix)) # copy the current gameboard and use Node to get the availables moves and jumps of the computer in the current gameboard 
+        current_state = checkersBitboard.from_matrix(self.matrix) # convert the current gameboard into a bitboard for the search
+        pondered = None
+        if self.ponderer is not None and self.use_pondering: # stop the pondering and get the answer if the move of the player has been pondered with this difficulty
+            pondered = self.ponderer.take(current_state, self.mandatory_jumping, self.profile)
 
-        first_computer_moves = current_state.get_children(True, self.mandatory_jumping) # # get Node instance of the current availables moves or jumps of maximizing player
+        first_computer_moves = checkersBitboard.generate_moves(current_state, True, self.mandatory_jumping) # get the current availables moves or jumps of maximizing player
         if len(first_computer_moves) == 0: # if not availables moves or jumps of maximizing player, then count the game pieces of both player
             if self.player_pieces > self.computer_pieces: # if the player has more piece than the computer, then the player won the game
                 self.message = "Computer has no available moves left, and you have more pieces left. :) :) :) YOU WIN! (: (: (:"
@@ -476,12 +423,28 @@ class Checkers:
                 self.observerController.notifyObserverViewCheckers(message = self.message)
                 _thread.start_new_thread(self.observerController.doAudio, (TIEGAME,))
         else: # if availables moves or jumps of maximizing player
-            dict = {}
-            for i in range(len(first_computer_moves)):
-                child = first_computer_moves[i] # get child of Node class with availables jumps or moves
-                value = Checkers.minimax(child.get_board(), 4, -math.inf, math.inf, False, self.mandatory_jumping) # use alpha beta pruning algorithm and minimax with all array gameboard of the Node kind instance with a depth of 4 through these array gameboards
-                dict[value] = child 
-            if len(dict.keys()) == 0: # not moves or jumps availables
+            book_move = self.opening_book.lookup(current_state, self.mandatory_jumping) if self.use_book else None
+            endgame = self.endgame_database.lookup(current_state, self.mandatory_jumping) if book_move is None and self.use_book else None
+            source = None # the move is not searched
+            if book_move is not None: # start of the game, answer without search
+                best_move, value = book_move, None
+                source = "book"
+                logger.debug("Checkers: move of the opening book")
+            elif endgame is not None: # few pieces, perfect move without search
+                best_move, value = endgame
+                source = "endgame"
+                logger.debug("Checkers: move of the endgame database (value {})".format(value))
+            elif pondered is not None and self.engine is self.alpha_beta: # the move of the player has been pondered, answer without search
+                best_move, value, depth = pondered
+                source = "pondered"
+                logger.debug("Checkers: pondered answer (depth {}), pondering hits {} misses {}".format(depth, self.ponderer.hits, self.ponderer.misses))
+            else:
+                max_nodes = self.max_playouts if self.engine is self.mcts else self.max_nodes
+                best_move, value = self.engine.think(current_state, self.mandatory_jumping, think_ms=self.think_ms, fixed_depth=self.search_depth, max_nodes=max_nodes, noise=self.noise, cancel=cancel) # search of the selected engine until the budget of the difficulty is used up
+                logger.debug("Checkers: " + self.engine.summary())
+                if self.engine is self.alpha_beta and self.engine.workers > 1: # report the speedup of the parallel search (time of all processes / wall-clock time)
+                    logger.debug("Checkers: parallel search with {} processes, speedup {:.2f}".format(self.engine.workers, self.engine.work_seconds / max(time.time() - t1, 1e-6)))
+            if best_move is None: # not moves or jumps availables
                 self.message = "Computer has cornered itself. :) :) :) YOU WIN! (: (: (:"
                 self.final_score[0] += 1
                 self.observerController.notifyObserverViewCheckers(newScore=self.final_score, message = self.message)
@@ -489,22 +452,76 @@ class Checkers:
                 _thread.start_new_thread(self.observerController.doAudio, (WIN_PLAYER,))
             
             else:
-                new_board = dict[max(dict)].get_board()
-                move = dict[max(dict)].move # get the best move from the dictionary
+                new_board = checkersBitboard.to_matrix(checkersBitboard.make_move(current_state, best_move, True)) # convert the bitboard after the best move back to the array gameboard
+                move = checkersBitboard.move_to_list(best_move) # get the best move as [old_i, old_j, new_i, new_j]
+                self.computer_captured = [str(i) + str(j) for i, j in checkersBitboard.captured_to_list(best_move)] # all the player pieces of the capture sequence
                 self.matrix = new_board # update the current array gameboard with the new computer move
                 t2 = time.time()
                 diff = t2 - t1
+                if source is None:
+                    self.search_stats = self.engine.stats(move, value, diff)
+                else:
+                    self.search_stats = checkersEngine.SearchStats(source, move, value, diff)
+                    if source == "pondered":
+                        self.search_stats.depth = self.search_stats.max_depth = depth
+                stats_logger.info(self.search_stats.to_json())
                 self.message = "Computer has moved (" + str(move[0]) + "," + str(move[1]) + ") to (" + str(move[2]) + "," + str(
                     move[3]) + ")." + " It took him " + str(round(diff, 5)) + " seconds."
                 _thread.start_new_thread(self.observerController.doAudio, (FRANKA_PLAY,))
                 self.observerController.notifyObserverViewCheckers(message = self.message)
                 return str(move[0]), str(move[1]), str(move[2]), str(move[3])
 
+    def select_engine(self, engine):
+        """
+        select the engine of the computer for the next moves
+        :param: engine: 0 for the alpha beta search, 1 for the monte carlo tree search
+
+        :return: None
+        """
+        if engine == 1:
+            if self.mcts is None:
+                self.mcts = checkersMCTS.MCTSEngine()
+            if self.engine is not self.mcts:
+                logger.debug("Checkers: monte carlo tree search selected")
+                self.stop_pondering() # the pondering is done with the alpha beta search
+                self.engine = self.mcts
+        elif self.engine is not self.alpha_beta:
+            logger.debug("Checkers: alpha beta search selected")
+            self.engine = self.alpha_beta
+
+    def set_difficulty(self, difficulty):
+        """
+        set the search budget of the computer for the next moves (see CHECKERS_DIFFICULTY_PROFILES)
+        :param: difficulty: 0 for easy, 1 for medium, 2 for hard
+
+        :return: None
+        """
+        profile = CHECKERS_DIFFICULTY_PROFILES.get(difficulty, CHECKERS_DIFFICULTY_PROFILES[CHECKERS_DIFFICULTY])
+        self.think_ms = profile["think_ms"]
+        self.max_nodes = profile["max_nodes"]
+        self.max_playouts = profile["max_playouts"]
+        self.noise = profile["noise"]
+        self.use_book = profile["book"]
+        self.use_pondering = profile["ponder"]
+        if profile is not self.profile: # the pondered answers have been searched with the budget of the previous difficulty
+            self.stop_pondering()
+        self.profile = profile
+        logger.debug("Checkers: difficulty {} ({} ms, {} nodes, {} playouts, noise {})".format(profile["name"], self.think_ms, self.max_nodes, self.max_playouts, self.noise))
+
+    def stop_pondering(self):
+        """
+        stop the pondering of the computer and discard the pondered answers, e.g. at the end of the game
+
+        :return: None
+        """
+        if self.ponderer is not None:
+            self.ponderer.stop()
+
     @staticmethod
     def minimax(board, depth, alpha, beta, maximizing_player, mandatory_jumping):
         """
         alpha beta pruning algorith for checker game to get the maximum evaluation of computer (best move for computer) and the minimum evaluation of player
-        :param: board: current array of checker gameboard
+        :param: board: current bitboard (or array) of checker gameboard. The moves are done and taken back on the same bitboard
         :param: depth: depth of tree (number of time that the recursive function between maximizer and minimizer player must be run or the reverse)
         :param: alpha: The best choice we have found so far at any point along the path of Maximizer. The initial value of alpha is -∞
         :param: beta:  The best choice we have found so far at any point along the path of Minimizer. The initial value of beta is +∞.
@@ -514,9 +531,10 @@ class Checkers:
         :return: max_eval: maximum evaluation  for computer (maximizing Player)
                  min_eval: minimum evaluation  for player (minimizing Player)
         """
+        if not isinstance(board, checkersBitboard.Bitboard): # the search runs on the bitboard
+            board = checkersBitboard.from_matrix(board)
         if depth == 0: # if depth is null, then get the evaluation value of end of node of tree 
-            return Checkers.calculate_heuristics(board) # heuristic evaluation of all the position in the checker gameboard
-        current_state = Node(deepcopy(board)) 
+            return checkersBitboard.evaluate(board) # heuristic evaluation of all the pieces in the checker gameboard (same value as calculate_heuristics)
 
         """
             The maximum player determines the possible moves 
@@ -544,8 +562,10 @@ class Checkers:
         """
         if maximizing_player is True: # maximizer player 
             max_eval = -math.inf
-            for child in current_state.get_children(True, mandatory_jumping):
-                ev = Checkers.minimax(child.get_board(), depth - 1, alpha, beta, False, mandatory_jumping)
+            for move in checkersBitboard.generate_moves(board, True, mandatory_jumping):
+                undo = checkersBitboard.apply_move(board, move, True) # do the move on the bitboard
+                ev = Checkers.minimax(board, depth - 1, alpha, beta, False, mandatory_jumping)
+                checkersBitboard.undo_move(board, undo, True) # take the move back
                 max_eval = max(max_eval, ev)
                 alpha = max(alpha, ev) 
                 if beta <= alpha: # pruning
@@ -553,8 +573,10 @@ class Checkers:
             return max_eval # maximum evaluation  for computer (maximizing Player)
         else: # minimizing player  
             min_eval = math.inf
-            for child in current_state.get_children(False, mandatory_jumping):
-                ev = Checkers.minimax(child.get_board(), depth - 1, alpha, beta, True, mandatory_jumping)
+            for move in checkersBitboard.generate_moves(board, False, mandatory_jumping):
+                undo = checkersBitboard.apply_move(board, move, False) # do the move on the bitboard
+                ev = Checkers.minimax(board, depth - 1, alpha, beta, True, mandatory_jumping)
+                checkersBitboard.undo_move(board, undo, False) # take the move back
                 min_eval = min(min_eval, ev)
                 beta = min(beta, ev) 
                 if beta <= alpha: # pruning
@@ -562,7 +584,7 @@ class Checkers:
             return min_eval # minimum evaluation  for player (minimizing Player)
 
     @staticmethod
-    def make_a_move(board, old_i, old_j, new_i, new_j, big_letter, queen_row):
+    def make_a_move(board, old_i, old_j, new_i, new_j, big_letter, queen_row, via=None):
         """
         when the player does  a jump over a computer piece or the computer 
         do a jump over a player piece, this piece must be removed and remplace
@@ -574,47 +596,52 @@ class Checkers:
         :param: new_j: second index of the array gameboard with 2 dimension (y-coordinate of the cible position of the player piece)
         :param: big_letter: king Letter of Player (B) or king letter of computer (C)
         :param: queen_row: King index in array gameboard, if the player or the computer come to these indexs, then they become king (index 0 for player or index 7 for computer)
+        :param: via: list of [i, j] of the jumped pieces of a capture sequence, None to find the jumped piece of a single jump
         
         :return: None
         """
         letter = board[old_i][old_j][0] # get the current letter (b for player, B for king player, c for computer or C for king computer)
-        i_difference = old_i - new_i 
-        j_difference = old_j - new_j
-        if i_difference == -2 and j_difference == 2: # if the cible position of the jump is bottom left 
-            board[old_i + 1][old_j - 1] = "---" # the jumpy place will be empty (jumpy piece will be removed)
+        if via is not None: # all the jumped pieces of the capture sequence are removed
+            for via_i, via_j in via:
+                board[via_i][via_j] = "---"
+        else:
+            i_difference = old_i - new_i 
+            j_difference = old_j - new_j
+            if i_difference == -2 and j_difference == 2: # if the cible position of the jump is bottom left 
+                board[old_i + 1][old_j - 1] = "---" # the jumpy place will be empty (jumpy piece will be removed)
 
-        elif i_difference == 2 and j_difference == 2: # if the cible position of the jump is top left 
-            board[old_i - 1][old_j - 1] = "---"
+            elif i_difference == 2 and j_difference == 2: # if the cible position of the jump is top left 
+                board[old_i - 1][old_j - 1] = "---"
 
-        elif i_difference == 2 and j_difference == -2: # if the cible position of the jump is top right 
-            board[old_i - 1][old_j + 1] = "---"
+            elif i_difference == 2 and j_difference == -2: # if the cible position of the jump is top right 
+                board[old_i - 1][old_j + 1] = "---"
 
-        elif i_difference == -2 and j_difference == -2: # if the cible position of the jump is bottom right 
-            board[old_i + 1][old_j + 1] = "---"
+            elif i_difference == -2 and j_difference == -2: # if the cible position of the jump is bottom right 
+                board[old_i + 1][old_j + 1] = "---"
 
         if new_i == queen_row: # if the cible position of the player or computer is the index (0 or 7), then the player or computer become king
             letter = big_letter
         board[old_i][old_j] = "---" # if current player do a jump, the start position of the piece will be empty 
         board[new_i][new_j] = letter + str(new_i) + str(new_j) # if the current player does a jump, the cible position of the piece will receive the moved piece 
 
-    def play(self, fromInd, toInd, mandatory_jumping): 
+    def play(self, fromInd, toInd, mandatory_jumping, cancel=None): 
         """
         play() function is used to get the player move from appController and set it in the checker algorithm and get the computer moves (if available get the piece, that be jumped)
         :param: fromInd: start position of player piece
         :param: toInd: cible position of player piece
         :pram: mandatory_jumping: option to use mandatory jump or not for both player 
+        :param: cancel: cancel token (threading.Event) of the request, stops the search of the computer when it is set
 
 
         :return: move1: x-coordinate of the start position of the computer piece, that be moved
                  move2: y-coordinate of the start position of the computer piece, that be moved
                  move3: x-coordinate of the cible position of the computer piece.
                  move4: y-coordinate of the cible position of the computer piece.
-                 viaPiece: if available, the position of the player piece, that has been jumped
+                 viaPiece: if available, the positions of the player pieces, that have been jumped (all the pieces of a capture sequence)
                  self.matrix: array list of the curent gameboard
         """
         viaPiece = [] # array of the list of the position of the piece, that has been jumped
         self.mandatory_jumping = mandatory_jumping 
-        matrixFrom = self.matrix # copy the array of curent state of gameboard from controller to matrixFrom 
         if self.player_turn is True: # verify if player turn
             self.message = "Player's turn."
             self.observerController.notifyObserverViewCheckers(message = self.message) # notify the appController, that the player's turn
@@ -626,18 +653,8 @@ class Checkers:
                 self.message = "Computer's turn. (Thinking...)"
                 _thread.start_new_thread(self.observerController.doAudio, ("Computer's turn!",)) 
                 self.observerController.notifyObserverViewCheckers(message = self.message)# notify the appController, that the computer's turn
-                move1, move2, move3, move4 = self.evaluate_states() # get computer move 
-                matrixTo = self.matrix # copy the current matrix after the computer has done a move
-
-                indexs1 = np.flatnonzero(np.char.startswith(matrixFrom, 'b')) # get array of all index position of player piece of Previous Array
-                indexs2 = np.flatnonzero(np.char.startswith(matrixTo, 'b')) # get  array of all index position of player piece after that the computer has done a move
-
-                # compare both indexs to get the player piece that has been jumped 
-                if (len(indexs1) != len(indexs2)): # if both index are not egal
-                    arraydiffer = np.setdiff1d(matrixFrom, matrixTo) # get the  difference of two arrays and return the unique values in matrixFrom that are not in matrixTo.
-                    indexs = np.flatnonzero(np.char.startswith(arraydiffer, 'b')) # get array of index of a value that begint with "b" (jumped player piece)
-                    for i in indexs:
-                        viaPiece.append(str(arraydiffer[i])[1:]) # get x,y index coordinate position of the jumped player piece and save it into array viaPiece
+                move1, move2, move3, move4 = self.evaluate_states(cancel) # get computer move 
+                viaPiece = list(self.computer_captured) # x,y index coordinate positions of the player pieces jumped by the capture sequence of the computer
 
                 self.player_turn = not self.player_turn # player turn
 
@@ -669,5 +686,7 @@ class Checkers:
                 new_j = new[1]
                 logger.debug("Checkers: Player play from b{}{} to b{}{}".format(old_i, old_j, new_i, new_j))
                 logger.debug("Checkers: computer play from b{}{} to b{}{}".format (move1, move2, move3, move4))
+                if self.ponderer is not None and self.use_pondering and self.engine is self.alpha_beta: # search the answers to the likely moves of the player while the robot moves and the player thinks
+                    self.ponderer.start(checkersBitboard.from_matrix(self.matrix), self.mandatory_jumping, self.profile)
                 return move1, move2, move3, move4, viaPiece, self.matrix
             
\ No newline at end of file
@@ -0,0 +1,642 @@
+"""
+compact 32-square bitboard representation of the checkers gameboard.
+
+Only the 32 dark fields of the gameboard can hold a piece. They are numbered
+row by row (the same order as the rows of the string array used by checkers.py):
+
+    row 0:   .  0  .  1  .  2  .  3
+    row 1:   4  .  5  .  6  .  7  .
+    row 2:   .  8  .  9  . 10  . 11
+    ...
+    row 7:  28  . 29  . 30  . 31  .
+
+Every side is stored as two uint32 masks (men and kings). The moves and jumps
+of all pieces of one side are generated at once with shifts of these masks.
+A jump is a complete capture sequence: it is continued while the piece can jump again,
+and all the captured pieces are in the captured mask of the move.
+The computer ("c"/"C") moves down (row + 1), the player ("b"/"B") moves up (row - 1).
+The heuristic value of the gameboard is stored in the bitboard and updated by every move.
+"""
+
+from config import *
+
+FULL_MASK = 0xFFFFFFFF # 32 dark fields
+EVEN_ROWS = 0x0F0F0F0F # fields of the rows 0, 2, 4 and 6
+ODD_ROWS = 0xF0F0F0F0 # fields of the rows 1, 3, 5 and 7
+EVEN_ROWS_NOT_RIGHT = 0x07070707 # fields of the even rows without the right border (column 7)
+ODD_ROWS_NOT_LEFT = 0xE0E0E0E0 # fields of the odd rows without the left border (column 0)
+
+ROW_0 = 0x0000000F # the player becomes king on this row
+ROW_7 = 0xF0000000 # the computer becomes king on this row
+
+# directions of a move on the gameboard
+DOWN_RIGHT = 0 # (i + 1, j + 1)
+DOWN_LEFT = 1 # (i + 1, j - 1)
+UP_LEFT = 2 # (i - 1, j - 1)
+UP_RIGHT = 3 # (i - 1, j + 1)
+
+EMPTY = "---" # empty field in the string array
+
+
+def step(mask, direction):
+    """
+    shift all the fields of a mask one field in the given direction.
+    Fields that would leave the gameboard are dropped.
+    :param: mask: bitboard mask
+    :param: direction: DOWN_RIGHT, DOWN_LEFT, UP_LEFT or UP_RIGHT
+
+    :return: shifted mask
+    """
+    if direction == DOWN_RIGHT:
+        return (((mask & EVEN_ROWS_NOT_RIGHT) << 5) | ((mask & ODD_ROWS) << 4)) & FULL_MASK
+    if direction == DOWN_LEFT:
+        return (((mask & EVEN_ROWS) << 4) | ((mask & ODD_ROWS_NOT_LEFT) << 3)) & FULL_MASK
+    if direction == UP_LEFT:
+        return ((mask & EVEN_ROWS) >> 4) | ((mask & ODD_ROWS_NOT_LEFT) >> 5)
+    return ((mask & EVEN_ROWS_NOT_RIGHT) >> 3) | ((mask & ODD_ROWS) >> 4)
+
+
+OPPOSITE = (UP_LEFT, UP_RIGHT, DOWN_RIGHT, DOWN_LEFT) # opposite direction of DOWN_RIGHT, DOWN_LEFT, UP_LEFT and UP_RIGHT
+
+"""
+order in which checkers.py has always listed the moves and jumps of one piece
+(see the old find_available_moves and find_player_available_moves).
+The move lists are kept in this order, because evaluate_states() keeps the last
+of the moves with the same evaluation.
+"""
+COMPUTER_MOVE_ORDER = (DOWN_RIGHT, DOWN_LEFT, UP_LEFT, UP_RIGHT)
+COMPUTER_JUMP_ORDER = (DOWN_LEFT, UP_LEFT, UP_RIGHT, DOWN_RIGHT)
+PLAYER_MOVE_ORDER = (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT)
+PLAYER_JUMP_ORDER = (UP_LEFT, UP_RIGHT, DOWN_LEFT, DOWN_RIGHT)
+
+
+def square_to_index(square):
+    """
+    convert a field number (0..31) to the index of the string array
+    :param: square: field number
+
+    :return: i, j: row and column of the field
+    """
+    i = square >> 2
+    j = ((square & 3) << 1) + (1 - (i & 1))
+    return i, j
+
+
+def index_to_square(i, j):
+    """
+    convert the index of the string array to a field number
+    :param: i: row of the field
+    :param: j: column of the field
+
+    :return: field number (0..31) or -1 if (i, j) is not a dark field of the gameboard
+    """
+    if i < 0 or i > 7 or j < 0 or j > 7 or (i + j) % 2 == 0:
+        return -1
+    return (i << 2) | (j >> 1)
+
+
+def iterate_bits(mask):
+    """
+    get the field numbers of all the set bits of a mask (from field 0 to field 31)
+    :param: mask: bitboard mask
+
+    :return: generator of field numbers
+    """
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+class Bitboard:
+    """
+    gameboard of the checkers game as four uint32 masks.
+    :param: computer_men: fields with a computer piece ("c")
+    :param: computer_kings: fields with a computer king ("C")
+    :param: player_men: fields with a player piece ("b")
+    :param: player_kings: fields with a player king ("B")
+    :param: score: heuristic value of the gameboard (see evaluate_full()), computed if None
+    """
+    __slots__ = ("computer_men", "computer_kings", "player_men", "player_kings", "score")
+
+    def __init__(self, computer_men=0, computer_kings=0, player_men=0, player_kings=0, score=None):
+        self.computer_men = computer_men
+        self.computer_kings = computer_kings
+        self.player_men = player_men
+        self.player_kings = player_kings
+        self.score = evaluate_full(self) if score is None else score # updated by apply_move() and undo_move()
+
+    def computer(self):
+        """
+        :return: mask of all computer pieces
+        """
+        return self.computer_men | self.computer_kings
+
+    def player(self):
+        """
+        :return: mask of all player pieces
+        """
+        return self.player_men | self.player_kings
+
+    def empty(self):
+        """
+        :return: mask of all empty fields
+        """
+        return ~(self.computer_men | self.computer_kings | self.player_men | self.player_kings) & FULL_MASK
+
+    def key(self):
+        """
+        :return: tuple of the four masks, e.g. to compare or to store a position
+        """
+        return (self.computer_men, self.computer_kings, self.player_men, self.player_kings)
+
+    def copy(self):
+        """
+        :return: a copy of the bitboard
+        """
+        return Bitboard(self.computer_men, self.computer_kings, self.player_men, self.player_kings, self.score)
+
+    def __eq__(self, other):
+        return isinstance(other, Bitboard) and self.key() == other.key()
+
+    def __hash__(self):
+        return hash(self.key())
+
+    def __repr__(self):
+        return "Bitboard(0x{:08x}, 0x{:08x}, 0x{:08x}, 0x{:08x})".format(*self.key())
+
+
+def from_matrix(matrix):
+    """
+    convert the string array of checkers.py ("cxy", "Cxy", "bxy", "Bxy" or "---") to a bitboard
+    :param: matrix: 8x8 list or numpy array of strings
+
+    :return: Bitboard
+    """
+    computer_men = computer_kings = player_men = player_kings = 0
+    for i in range(8):
+        row = matrix[i]
+        for j in range(1 - (i & 1), 8, 2): # only the dark fields can hold a piece
+            letter = row[j][0]
+            if letter == "-":
+                continue
+            bit = 1 << ((i << 2) | (j >> 1))
+            if letter == "c":
+                computer_men |= bit
+            elif letter == "C":
+                computer_kings |= bit
+            elif letter == "b":
+                player_men |= bit
+            elif letter == "B":
+                player_kings |= bit
+    return Bitboard(computer_men, computer_kings, player_men, player_kings)
+
+
+def to_matrix(board):
+    """
+    convert a bitboard to the string array of checkers.py. The pieces are written as letter + row + column (e.g. "c23")
+    :param: board: Bitboard
+
+    :return: 8x8 list of strings
+    """
+    matrix = [[EMPTY] * 8 for _ in range(8)]
+    for letter, mask in (("c", board.computer_men), ("C", board.computer_kings), ("b", board.player_men), ("B", board.player_kings)):
+        for square in iterate_bits(mask):
+            i, j = square_to_index(square)
+            matrix[i][j] = letter + str(i) + str(j)
+    return matrix
+
+
+def move_to_list(move):
+    """
+    convert a move of the bitboard to the move format of checkers.py
+    :param: move: tuple (from_square, to_square, captured_mask)
+
+    :return: [old_i, old_j, new_i, new_j]
+    """
+    old_i, old_j = square_to_index(move[0])
+    new_i, new_j = square_to_index(move[1])
+    return [old_i, old_j, new_i, new_j]
+
+
+def list_to_move(board, move, computer):
+    """
+    convert a move of checkers.py ([old_i, old_j, new_i, new_j]) to a move of the bitboard
+    :param: board: Bitboard before the move
+    :param: move: [old_i, old_j, new_i, new_j]
+    :param: computer: True if the computer does the move, False for the player
+
+    :return: tuple (from_square, to_square, captured_mask) or None if the move is not available
+    """
+    for available in generate_moves(board, computer, False):
+        if move_to_list(available) == list(move):
+            return available
+    return None
+
+
+def _build_jump_tables():
+    """
+    precompute for each field and direction the jumped field and the landing field of a jump
+
+    :return: list of 32 tuples of 4 (jumped field, landing field), (-1, -1) if the jump leaves the gameboard
+    """
+    tables = []
+    for square in range(32):
+        jumps = []
+        for direction in range(4):
+            over = step(1 << square, direction)
+            landing = step(over, direction)
+            jumps.append((over.bit_length() - 1, landing.bit_length() - 1) if landing else (-1, -1))
+        tables.append(tuple(jumps))
+    return tables
+
+
+JUMP_TABLES = _build_jump_tables()
+
+
+def _collect(moves, landing, direction, rank, captured):
+    """
+    append the moves which end on the fields of landing. The start field is found with the opposite direction.
+    """
+    back = OPPOSITE[direction]
+    for to_square in iterate_bits(landing):
+        to_bit = 1 << to_square
+        if captured:
+            via = step(to_bit, back)
+            from_bit = step(via, back)
+        else:
+            via = 0
+            from_bit = step(to_bit, back)
+        moves.append((from_bit.bit_length() - 1, rank, to_square, via))
+
+
+def generate_moves(board, computer, mandatory_jumping):
+    """
+    find the available moves and jumps of the computer (c or C) or of the player (b or B).
+    :param: board: Bitboard
+    :param: computer: True for the computer (maximizing player), False for the player (minimizing player)
+    :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+    :return: list of moves (from_square, to_square, captured_mask): first the jumps (complete capture sequences),
+             then the moves (like checkers.py), only the jumps if mandatory_jumping is True and a jump is available
+    """
+    empty = board.empty()
+    if computer:
+        men = board.computer_men
+        kings = board.computer_kings
+        opponent = board.player_men | board.player_kings
+        forward = (DOWN_RIGHT, DOWN_LEFT)
+        move_order = COMPUTER_MOVE_ORDER
+        jump_order = COMPUTER_JUMP_ORDER
+    else:
+        men = board.player_men
+        kings = board.player_kings
+        opponent = board.computer_men | board.computer_kings
+        forward = (UP_LEFT, UP_RIGHT)
+        move_order = PLAYER_MOVE_ORDER
+        jump_order = PLAYER_JUMP_ORDER
+
+    jumps = []
+    for rank in range(4):
+        direction = jump_order[rank]
+        pieces = men | kings if direction in forward else kings
+        if pieces:
+            landing = step(step(pieces, direction) & opponent, direction) & empty
+            if landing:
+                _collect(jumps, landing, direction, rank, True)
+    jumps.sort()
+    jumps = [(jump[0], jump[2], jump[3]) for jump in jumps]
+    if jumps:
+        jumps = _continue_jumps(board, jumps, computer, kings, opponent, forward, jump_order)
+    if mandatory_jumping and jumps:
+        return jumps
+
+    moves = []
+    for rank in range(4):
+        direction = move_order[rank]
+        pieces = men | kings if direction in forward else kings
+        if pieces:
+            landing = step(pieces, direction) & empty
+            if landing:
+                _collect(moves, landing, direction, rank, False)
+    moves.sort()
+    moves = [(move[0], move[2], move[3]) for move in moves]
+    if mandatory_jumping:
+        return moves
+    jumps.extend(moves)
+    return jumps
+
+
+def _continue_jumps(board, jumps, computer, kings, opponent, forward, jump_order):
+    """
+    continue the single jumps to complete capture sequences with a stack (no copy of the bitboard).
+    A jump that cannot be continued is kept as it is, so the order of the moves does not change
+    without multi-jumps. The captured pieces stay on the gameboard until the end of the move
+    (they cannot be jumped twice) and a man that becomes king ends the move.
+    :param: board: Bitboard
+    :param: jumps: single jumps (from_square, to_square, captured_mask)
+    :param: computer: True for the computer, False for the player
+    :param: kings: mask of the kings of the side
+    :param: opponent: mask of the pieces of the other side
+    :param: forward: directions of the men
+    :param: jump_order: order of the directions
+
+    :return: list of capture sequences (from_square, to_square, captured_mask)
+    """
+    king_row = ROW_7 if computer else ROW_0
+    man_directions = [direction for direction in jump_order if direction in forward]
+    occupied = ~board.empty() & FULL_MASK
+    sequences = []
+    for jump in jumps:
+        from_square, to_square, captured = jump
+        king = kings >> from_square & 1
+        if not king and (1 << to_square) & king_row: # promotion ends the move
+            sequences.append(jump)
+            continue
+        directions = jump_order if king else man_directions
+        free = ~(occupied ^ (1 << from_square)) # the moving piece has left its start field
+        for direction in directions: # most jumps cannot be continued, test it before the stack is used
+            over, landing = JUMP_TABLES[to_square][direction]
+            if landing >= 0 and opponent >> over & 1 and not captured >> over & 1 and free >> landing & 1:
+                break
+        else:
+            sequences.append(jump)
+            continue
+        stack = [(to_square, captured)]
+        while stack:
+            square, captured = stack.pop()
+            continued = False
+            for direction in reversed(directions): # the stack takes the first direction first
+                over, landing = JUMP_TABLES[square][direction]
+                if landing < 0 or not (opponent >> over & 1) or captured >> over & 1 or not (free >> landing & 1):
+                    continue
+                continued = True
+                if not king and (1 << landing) & king_row:
+                    sequences.append((from_square, landing, captured | 1 << over))
+                else:
+                    stack.append((landing, captured | 1 << over))
+            if not continued:
+                sequence = (from_square, square, captured)
+                if not king or sequence not in sequences: # a king can capture the same pieces on two ways
+                    sequences.append(sequence)
+    return sequences
+
+
+def captured_to_list(move):
+    """
+    get the fields of the pieces captured by a move
+    :param: move: tuple (from_square, to_square, captured_mask)
+
+    :return: list of [i, j] of the captured pieces
+    """
+    return [list(square_to_index(square)) for square in iterate_bits(move[2])]
+
+
+def apply_move(board, move, computer):
+    """
+    do a move or a jump in place on the bitboard. The jumped pieces are removed and
+    a piece that comes to the last row becomes king.
+    :param: board: Bitboard (modified)
+    :param: move: tuple (from_square, to_square, captured_mask)
+    :param: computer: True if the computer does the move, False for the player
+
+    :return: undo record (move, captured_men, captured_kings, promotion, score) for undo_move()
+    """
+    from_bit = 1 << move[0]
+    to_bit = 1 << move[1]
+    captured = move[2]
+    promotion = False
+    score = board.score
+    # only the threats of the computer pieces near the changed fields are computed again
+    affected = INFLUENCE[move[0]] | INFLUENCE[move[1]]
+    changed = captured
+    while changed:
+        low = changed & -changed
+        changed ^= low
+        affected |= INFLUENCE[low.bit_length() - 1]
+    pieces = (board.computer_men | board.computer_kings) & affected
+    if pieces:
+        score -= _threats(board, pieces)
+    if computer:
+        if board.computer_kings & from_bit:
+            board.computer_kings ^= from_bit ^ to_bit # a king can come back to its start field
+            score += KING_VALUES[move[1]] - KING_VALUES[move[0]]
+        elif to_bit & ROW_7:
+            board.computer_men ^= from_bit
+            board.computer_kings |= to_bit
+            promotion = True
+            score += KING_VALUES[move[1]] - MAN_VALUES[move[0]]
+        else:
+            board.computer_men ^= from_bit | to_bit
+            score += MAN_VALUES[move[1]] - MAN_VALUES[move[0]]
+        captured_men = board.player_men & captured
+        captured_kings = board.player_kings & captured
+        if captured:
+            board.player_men ^= captured_men
+            board.player_kings ^= captured_kings
+            score += bin(captured).count("1") * 1000
+    else:
+        if board.player_kings & from_bit:
+            board.player_kings ^= from_bit ^ to_bit
+        elif to_bit & ROW_0:
+            board.player_men ^= from_bit
+            board.player_kings |= to_bit
+            promotion = True
+        else:
+            board.player_men ^= from_bit | to_bit
+        captured_men = board.computer_men & captured
+        captured_kings = board.computer_kings & captured
+        if captured:
+            board.computer_men ^= captured_men
+            board.computer_kings ^= captured_kings
+            for square in iterate_bits(captured_men):
+                score -= MAN_VALUES[square]
+            for square in iterate_bits(captured_kings):
+                score -= KING_VALUES[square]
+    pieces = (board.computer_men | board.computer_kings) & affected
+    if pieces:
+        score += _threats(board, pieces)
+    board.score, score = score, board.score # the undo record keeps the score before the move
+    if CHECKERS_EVAL_CHECK:
+        assert board.score == evaluate_full(board), (board, move, board.score, evaluate_full(board))
+    return (move, captured_men, captured_kings, promotion, score)
+
+
+def undo_move(board, undo, computer):
+    """
+    take back a move that has been done with apply_move()
+    :param: board: Bitboard (modified)
+    :param: undo: undo record returned by apply_move()
+    :param: computer: True if the computer did the move, False for the player
+
+    :return: None
+    """
+    move, captured_men, captured_kings, promotion, score = undo
+    board.score = score
+    from_bit = 1 << move[0]
+    to_bit = 1 << move[1]
+    if computer:
+        if promotion:
+            board.computer_kings ^= to_bit
+            board.computer_men |= from_bit
+        elif board.computer_kings & to_bit:
+            board.computer_kings ^= from_bit ^ to_bit
+        else:
+            board.computer_men ^= from_bit | to_bit
+        board.player_men |= captured_men
+        board.player_kings |= captured_kings
+    else:
+        if promotion:
+            board.player_kings ^= to_bit
+            board.player_men |= from_bit
+        elif board.player_kings & to_bit:
+            board.player_kings ^= from_bit ^ to_bit
+        else:
+            board.player_men ^= from_bit | to_bit
+        board.computer_men |= captured_men
+        board.computer_kings |= captured_kings
+
+
+def make_move(board, move, computer):
+    """
+    do a move or a jump on a copy of the bitboard (see apply_move())
+    :param: board: Bitboard (not modified)
+    :param: move: tuple (from_square, to_square, captured_mask)
+    :param: computer: True if the computer does the move, False for the player
+
+    :return: new Bitboard
+    """
+    child = board.copy()
+    apply_move(child, move, computer)
+    return child
+
+
+def _build_evaluation_tables():
+    """
+    precompute for each field the neighbour fields used by evaluate().
+    The neighbour (i + 2, j - 2) is looked up like the string array does it in python:
+    the column -1 is the column 7 of the same row.
+
+    :return: list of 32 tuples (edge, inner, down_left, up_right, down_right, up_left, far_down_left, far_down_right),
+             list of 32 masks of the inner fields whose threats depend on the field (see _threats())
+    """
+    tables = []
+    for square in range(32):
+        i, j = square_to_index(square)
+        edge = i == 0 or j == 0 or i == 7 or j == 7
+        inner = not (i + 1 > 7 or j - 1 < 0 or i - 1 < 0 or j + 1 > 7)
+        down_left = up_right = down_right = up_left = far_down_left = far_down_right = 0
+        if inner:
+            down_left = 1 << index_to_square(i + 1, j - 1)
+            up_right = 1 << index_to_square(i - 1, j + 1)
+            down_right = 1 << index_to_square(i + 1, j + 1)
+            up_left = 1 << index_to_square(i - 1, j - 1)
+            if not (i + 2 > 7 or i - 2 < 0):
+                far_down_left = 1 << index_to_square(i + 2, (j - 2) % 8)
+                if not j + 2 > 7:
+                    far_down_right = 1 << index_to_square(i + 2, j + 2)
+        tables.append((edge, inner, down_left, up_right, down_right, up_left, far_down_left, far_down_right))
+    influence = [0] * 32
+    for square in range(32):
+        if tables[square][1]:
+            influence[square] |= 1 << square
+            for neighbour in tables[square][2:]:
+                if neighbour:
+                    influence[neighbour.bit_length() - 1] |= 1 << square
+    return tables, influence
+
+
+EVALUATION_TABLES, INFLUENCE = _build_evaluation_tables()
+# value of a computer man or king without the threats: material (1000), kind and edge bonus
+MAN_VALUES = [1005 + (7 if table[0] else 0) for table in EVALUATION_TABLES]
+KING_VALUES = [1010 + (7 if table[0] else 0) for table in EVALUATION_TABLES]
+
+
+def _threats(board, pieces):
+    """
+    sum of the threat values of the given computer pieces (not on the edge of the gameboard):
+    -3 for each piece that can be jumped, +6 for each player piece that the piece can jump
+    :param: board: Bitboard
+    :param: pieces: mask of computer pieces to visit
+
+    :return: sum of the threat values
+    """
+    player_men = board.player_men
+    player_kings = board.player_kings
+    player = player_men | player_kings
+    empty = ~(board.computer_men | board.computer_kings | player) & FULL_MASK
+    tables = EVALUATION_TABLES
+    result = 0
+    while pieces:
+        low = pieces & -pieces
+        pieces ^= low
+        edge, inner, down_left, up_right, down_right, up_left, far_down_left, far_down_right = tables[low.bit_length() - 1]
+        if down_left & player and up_right & empty:
+            result -= 3
+        if down_right & player_men and up_left & empty: # only a man is compared here, like in calculate_heuristics()
+            result -= 3
+        if up_left & player_kings and down_right & empty:
+            result -= 3
+        if up_right & player_kings and down_left & empty:
+            result -= 3
+        if far_down_left:
+            if down_left & player and far_down_left & empty:
+                result += 6
+            if far_down_right and down_right & player and far_down_right & empty:
+                result += 6
+    return result
+
+
+def evaluate_full(board):
+    """
+    heuristic value of the gameboard for the computer with a scan of all the pieces. The value is the same as
+    the value of Checkers.calculate_heuristics() on the string array.
+    :param: board: Bitboard
+
+    :return: heuristic value
+    """
+    player = board.player_men | board.player_kings
+    player_kings = board.player_kings
+    player_men = board.player_men
+    empty = board.empty()
+    tables = EVALUATION_TABLES
+    result = 0
+    mine = 0
+    for mask, value in ((board.computer_men, 5), (board.computer_kings, 10)):
+        while mask:
+            low = mask & -mask
+            mask ^= low
+            edge, inner, down_left, up_right, down_right, up_left, far_down_left, far_down_right = tables[low.bit_length() - 1]
+            mine += 1
+            result += value
+            if edge:
+                result += 7
+            if not inner:
+                continue
+            if down_left & player and up_right & empty:
+                result -= 3
+            if down_right & player_men and up_left & empty: # only a man is compared here, like in calculate_heuristics()
+                result -= 3
+            if up_left & player_kings and down_right & empty:
+                result -= 3
+            if up_right & player_kings and down_left & empty:
+                result -= 3
+            if far_down_left:
+                if down_left & player and far_down_left & empty:
+                    result += 6
+                if far_down_right and down_right & player and far_down_right & empty:
+                    result += 6
+    return result + (mine - bin(player).count("1")) * 1000
+
+
+def evaluate(board):
+    """
+    heuristic value of the gameboard for the computer, kept up to date by apply_move() and undo_move().
+    With CHECKERS_EVAL_CHECK, it is compared with the full scan evaluate_full().
+    :param: board: Bitboard
+
+    :return: heuristic value
+    """
+    if CHECKERS_EVAL_CHECK:
+        assert board.score == evaluate_full(board), (board, board.score, evaluate_full(board))
+    return board.score
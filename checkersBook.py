@@ -0,0 +1,350 @@
+"""
+opening book and endgame database of the checkers game.
+
+Every game starts from the same gameboard, so the first moves of the computer are searched
+once offline with a deep search and stored in the opening book. The gameboards with few pieces
+are solved offline by a retrograde analysis (the side without moves loses) and stored in the
+endgame database. Both are stored in compact binary files under data/ (zlib compressed sorted records):
+
+    python checkersBook.py --book       # generate CHECKERS_OPENING_BOOK
+    python checkersBook.py --endgame    # generate CHECKERS_ENDGAME_DB
+"""
+
+import os
+import math
+import time
+import zlib
+import struct
+import itertools
+from argparse import ArgumentParser
+import checkersBitboard
+import checkersEngine
+from config import *
+
+MAGIC_BOOK = b"CKB1" # header of the opening book file
+MAGIC_ENDGAME = b"CKE1" # header of the endgame database file
+HEADER = struct.Struct("<4sB") # magic, parameter of the file (book: number of moves of the player, endgame: maximum number of pieces)
+# record of the opening book: 4 masks of the bitboard, mandatory_jumping, from_square, to_square
+BOOK_RECORD = struct.Struct("<IIIIBBB")
+# record of the endgame database: 4 masks of the bitboard, mandatory_jumping, from_square, to_square, value
+ENDGAME_RECORD = struct.Struct("<IIIIBBBh")
+
+WIN = 1000 # value of a won gameboard for the side to move, minus the number of plies until the end of the game
+
+_loaded = {} # files that have already been read, shared by all the games
+
+
+class RecordFile:
+    """
+    records of a book or database file, sorted by the gameboard (4 masks and mandatory_jumping).
+    The records stay packed in memory and are found by binary search.
+    :param: path: path of the file
+    :param: magic: expected header of the file
+    :param: record: struct.Struct of a record
+    """
+    def __init__(self, path, magic, record):
+        self.record = record
+        self.data = b""
+        self.parameter = 0
+        if os.path.exists(path):
+            with open(path, "rb") as file:
+                found, self.parameter = HEADER.unpack(file.read(HEADER.size))
+                if found != magic:
+                    raise ValueError("{} is not a checkers book or database file".format(path))
+                self.data = zlib.decompress(file.read())
+        self.count = len(self.data) // record.size
+
+    def find(self, key):
+        """
+        :param: key: tuple (computer_men, computer_kings, player_men, player_kings, mandatory_jumping)
+
+        :return: the unpacked record of the gameboard or None
+        """
+        low = 0
+        high = self.count
+        while low < high:
+            middle = (low + high) // 2
+            row = self.record.unpack_from(self.data, middle * self.record.size)
+            if row[:5] < key:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self.count:
+            row = self.record.unpack_from(self.data, low * self.record.size)
+            if row[:5] == key:
+                return row
+        return None
+
+
+def _load(path, magic, record):
+    """
+    read a book or database file once for all the games
+    :param: path: path of the file
+    :param: magic: expected header of the file
+    :param: record: struct.Struct of a record
+
+    :return: RecordFile
+    """
+    if path not in _loaded:
+        _loaded[path] = RecordFile(path, magic, record)
+    return _loaded[path]
+
+
+def _write(path, magic, parameter, record, rows):
+    """
+    write a book or database file
+    :param: path: path of the file
+    :param: magic: header of the file
+    :param: parameter: parameter of the file in the header
+    :param: record: struct.Struct of a record
+    :param: rows: tuples to pack with record, the first 5 values are the gameboard
+
+    :return: number of written records
+    """
+    rows = sorted(rows)
+    data = b"".join(record.pack(*row) for row in rows)
+    with open(path, "wb") as file:
+        file.write(HEADER.pack(magic, parameter))
+        file.write(zlib.compress(data, 9))
+    return len(rows)
+
+
+def _find_move(board, from_square, to_square, mandatory_jumping):
+    """
+    find the move of the computer with the given start and cible field
+    :param: board: Bitboard, the computer is to move
+    :param: from_square: start field of the move
+    :param: to_square: cible field of the move
+    :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+    :return: move (from_square, to_square, captured_mask) or None if the move is not available
+    """
+    found = None
+    for move in checkersBitboard.generate_moves(board, True, mandatory_jumping):
+        if move[0] == from_square and move[1] == to_square and (found is None or bin(move[2]).count("1") > bin(found[2]).count("1")):
+            found = move # capture sequences with the same fields: the one with the most captures
+    return found
+
+
+class OpeningBook:
+    """
+    moves of the computer for the gameboards at the start of the game
+    :param: path: path of the opening book file
+    """
+    def __init__(self, path=CHECKERS_OPENING_BOOK):
+        self.records = _load(path, MAGIC_BOOK, BOOK_RECORD)
+
+    def __len__(self):
+        return self.records.count
+
+    def lookup(self, board, mandatory_jumping):
+        """
+        :param: board: current Bitboard, the computer is to move
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+        :return: move of the book or None if the gameboard is not in the book
+        """
+        row = self.records.find(board.key() + (int(mandatory_jumping),))
+        if row is None:
+            return None
+        return _find_move(board, row[5], row[6], mandatory_jumping)
+
+
+class EndgameDatabase:
+    """
+    perfect moves of the computer for the gameboards with few pieces
+    :param: path: path of the endgame database file
+    """
+    def __init__(self, path=CHECKERS_ENDGAME_DB):
+        self.records = _load(path, MAGIC_ENDGAME, ENDGAME_RECORD)
+        self.max_pieces = self.records.parameter
+
+    def __len__(self):
+        return self.records.count
+
+    def lookup(self, board, mandatory_jumping):
+        """
+        :param: board: current Bitboard, the computer is to move
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+        :return: (move, value) with value = WIN - plies if the computer wins, -(WIN - plies) if the computer loses,
+                 or None if the gameboard is not in the database (too many pieces or a draw)
+        """
+        if bin(board.computer() | board.player()).count("1") > self.max_pieces:
+            return None
+        row = self.records.find(board.key() + (int(mandatory_jumping),))
+        if row is None:
+            return None
+        move = _find_move(board, row[5], row[6], mandatory_jumping)
+        return None if move is None else (move, row[7])
+
+
+def build_opening_book(plies=3, depth=10, path=CHECKERS_OPENING_BOOK):
+    """
+    search the gameboards of the computer after all the moves of the player at the start of the game,
+    the computer answers with the move of the book (plies moves of the player). Both options of mandatory_jumping are searched.
+    :param: plies: number of moves of the player from the start of the game
+    :param: depth: search depth of every gameboard of the book
+    :param: path: path of the opening book file
+
+    :return: number of gameboards in the book
+    """
+    start = checkersBitboard.Bitboard(
+        computer_men=0x00000FFF, # rows 0, 1 and 2 like AppController.position_computer()
+        player_men=0xFFF00000) # rows 5, 6 and 7 like AppController.position_player()
+    engine = checkersEngine.SearchEngine()
+    rows = {}
+    for mandatory_jumping in (True, False):
+        boards = [start]
+        for ply in range(plies):
+            answers = []
+            for board in boards:
+                for player_move in checkersBitboard.generate_moves(board, False, mandatory_jumping):
+                    child = checkersBitboard.make_move(board, player_move, False)
+                    key = (child.key(), mandatory_jumping)
+                    if key in rows:
+                        continue
+                    best_move, value = engine.think(child, mandatory_jumping, think_ms=0, fixed_depth=depth)
+                    if best_move is None:
+                        continue
+                    rows[key] = (best_move[0], best_move[1])
+                    answers.append(checkersBitboard.make_move(child, best_move, True))
+            print("mandatory_jumping {} ply {}: {} gameboards".format(mandatory_jumping, ply + 1, len(rows)))
+            boards = answers
+    return _write(path, MAGIC_BOOK, plies, BOOK_RECORD, [key[0] + (int(key[1]), move[0], move[1]) for key, move in rows.items()])
+
+
+def _negate(value):
+    """
+    value of a gameboard for the side that did the move to the gameboard (one ply more to the end of the game)
+    :param: value: value of the gameboard for the side to move
+
+    :return: value for the other side
+    """
+    if value > 0:
+        return -value + 1
+    if value < 0:
+        return -value - 1
+    return 0
+
+
+def _gameboards(pieces):
+    """
+    all the gameboards with the given number of pieces and at least one piece of each side
+    (a man is never on the row where it becomes king)
+    :param: pieces: number of pieces
+
+    :return: generator of Bitboard
+    """
+    kinds = ("computer_men", "computer_kings", "player_men", "player_kings")
+    for squares in itertools.combinations(range(32), pieces):
+        for types in itertools.product(range(4), repeat=pieces):
+            if all(kind < 2 for kind in types) or all(kind >= 2 for kind in types):
+                continue
+            masks = [0, 0, 0, 0]
+            for square, kind in zip(squares, types):
+                masks[kind] |= 1 << square
+            if masks[0] & checkersBitboard.ROW_7 or masks[2] & checkersBitboard.ROW_0:
+                continue
+            yield checkersBitboard.Bitboard(*masks)
+
+
+def build_endgame_database(max_pieces=3, path=CHECKERS_ENDGAME_DB):
+    """
+    solve all the gameboards with up to max_pieces pieces by retrograde analysis: the side without moves loses.
+    The gameboards are solved with increasing number of pieces, so that the gameboards after a jump are already known.
+    Inside one number of pieces, the values are iterated until no gameboard changes, the other gameboards are draws.
+    Only the won and lost gameboards of the computer are stored, with the best move.
+    :param: max_pieces: maximum number of pieces on the gameboard (4 pieces need a long time)
+    :param: path: path of the endgame database file
+
+    :return: number of gameboards in the database
+    """
+    rows = []
+    for mandatory_jumping in (True, False):
+        values = {} # (bitboard key, computer is to move) -> value for the side to move, all the solved gameboards
+        for pieces in range(2, max_pieces + 1):
+            started = time.time()
+            nodes = []
+            index = {}
+            for board in _gameboards(pieces):
+                for computer in (True, False):
+                    index[(board.key(), computer)] = len(nodes)
+                    nodes.append((board, computer))
+            known = [None] * len(nodes) # best value from the gameboards with fewer pieces
+            children = [None] * len(nodes) # indexes of the children with the same number of pieces
+            value = [None] * len(nodes)
+            for i, (board, computer) in enumerate(nodes):
+                moves = checkersBitboard.generate_moves(board, computer, mandatory_jumping)
+                if not moves: # no moves: lost
+                    value[i] = -WIN
+                    continue
+                best = None
+                same = []
+                for move in moves:
+                    child = checkersBitboard.make_move(board, move, computer)
+                    if move[2]: # a jump: fewer pieces
+                        if not (child.player() if computer else child.computer()): # the last piece of the other side is jumped
+                            child_value = -WIN
+                        else:
+                            child_value = values.get((child.key(), not computer), 0)
+                        best = _negate(child_value) if best is None else max(best, _negate(child_value))
+                    else:
+                        same.append(index[(child.key(), not computer)])
+                known[i] = best
+                children[i] = same
+            changed = True
+            while changed: # iterate until no gameboard is solved anymore
+                changed = False
+                for i in range(len(nodes)):
+                    if value[i] is not None:
+                        continue
+                    best = known[i]
+                    complete = True
+                    for j in children[i]:
+                        if value[j] is None:
+                            complete = False
+                        else:
+                            child_value = _negate(value[j])
+                            best = child_value if best is None else max(best, child_value)
+                    if best is not None and (best > 0 or complete): # won, or all the moves are known
+                        value[i] = best
+                        changed = True
+            for i, (board, computer) in enumerate(nodes):
+                if value[i]: # draws are not stored
+                    values[(board.key(), computer)] = value[i]
+            print("mandatory_jumping {} {} pieces: {} gameboards, {} solved in {:.1f} s".format(
+                mandatory_jumping, pieces, len(nodes), sum(1 for v in value if v), time.time() - started))
+
+        for (key, computer), board_value in values.items():
+            if not computer:
+                continue
+            board = checkersBitboard.Bitboard(*key)
+            best_move = None
+            best = -math.inf
+            for move in checkersBitboard.generate_moves(board, True, mandatory_jumping):
+                child = checkersBitboard.make_move(board, move, True)
+                if not child.player():
+                    child_value = _negate(-WIN)
+                else:
+                    child_value = _negate(values.get((child.key(), False), 0))
+                if child_value > best:
+                    best = child_value
+                    best_move = move
+            if best_move is not None:
+                rows.append(key + (int(mandatory_jumping), best_move[0], best_move[1], board_value))
+    return _write(path, MAGIC_ENDGAME, max_pieces, ENDGAME_RECORD, rows)
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="generate the opening book and the endgame database of the checkers game")
+    parser.add_argument("--book", action="store_true", help="generate the opening book " + CHECKERS_OPENING_BOOK)
+    parser.add_argument("--plies", type=int, default=3, help="number of moves of the player in the opening book")
+    parser.add_argument("--depth", type=int, default=10, help="search depth of the opening book")
+    parser.add_argument("--endgame", action="store_true", help="generate the endgame database " + CHECKERS_ENDGAME_DB)
+    parser.add_argument("--pieces", type=int, default=3, help="maximum number of pieces in the endgame database")
+    args = parser.parse_args()
+    if args.book:
+        print("opening book: {} gameboards".format(build_opening_book(args.plies, args.depth)))
+    if args.endgame:
+        print("endgame database: {} gameboards".format(build_endgame_database(args.pieces)))
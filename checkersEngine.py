@@ -0,0 +1,893 @@
+"""
+search engine of the checkers game on the bitboard of checkersBitboard.py.
+
+The engine memoizes the results of the alpha beta search in a transposition table,
+so that the positions that are reached through different move orders are only searched once.
+The positions are identified by a zobrist hash.
+Optionally, the moves of the computer are searched in parallel by a pool of processes (CHECKERS_PARALLEL_WORKERS).
+During the turn of the player, the Ponderer searches the answers to the likely moves of the player in a background thread.
+"""
+
+import math
+import json
+import random
+import time
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import checkersBitboard
+from config import *
+
+EXACT = 0 # the score is the exact minimax value
+LOWER = 1 # the score is a lower bound (the search failed high, beta cutoff)
+UPPER = 2 # the score is an upper bound (the search failed low)
+
+
+def _build_zobrist_keys():
+    """
+    generate the random 64 bit keys of the zobrist hash. A fixed seed is used,
+    so that the hash of a position is the same in every run of the app.
+
+    :return: keys: 4 arrays of 32 keys (computer men, computer kings, player men, player kings),
+             computer_key: key of the computer to move,
+             mandatory_key: key of the mandatory jumping rule
+    """
+    generator = random.Random(20221022)
+    keys = [[generator.getrandbits(64) for square in range(32)] for piece in range(4)]
+    return keys, generator.getrandbits(64), generator.getrandbits(64)
+
+
+ZOBRIST_KEYS, ZOBRIST_COMPUTER, ZOBRIST_MANDATORY = _build_zobrist_keys()
+COMPUTER_MEN, COMPUTER_KINGS, PLAYER_MEN, PLAYER_KINGS = 0, 1, 2, 3 # index of the pieces in ZOBRIST_KEYS
+
+
+def zobrist_hash(board, computer, mandatory_jumping):
+    """
+    compute the zobrist hash of a position
+    :param: board: Bitboard
+    :param: computer: True if the computer is to move, False for the player
+    :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+    :return: 64 bit hash of the position
+    """
+    key = 0
+    for piece, mask in enumerate(board.key()):
+        keys = ZOBRIST_KEYS[piece]
+        for square in checkersBitboard.iterate_bits(mask):
+            key ^= keys[square]
+    if computer:
+        key ^= ZOBRIST_COMPUTER
+    if mandatory_jumping:
+        key ^= ZOBRIST_MANDATORY
+    return key
+
+
+def hash_after_move(key, board, move, computer):
+    """
+    update the zobrist hash of a position with a move (without computing the whole hash again)
+    :param: key: zobrist hash before the move
+    :param: board: Bitboard before the move
+    :param: move: tuple (from_square, to_square, captured_mask)
+    :param: computer: True if the computer does the move, False for the player
+
+    :return: zobrist hash after the move
+    """
+    from_square, to_square, captured = move
+    if computer:
+        if board.computer_kings >> from_square & 1:
+            key ^= ZOBRIST_KEYS[COMPUTER_KINGS][from_square] ^ ZOBRIST_KEYS[COMPUTER_KINGS][to_square]
+        elif (1 << to_square) & checkersBitboard.ROW_7:
+            key ^= ZOBRIST_KEYS[COMPUTER_MEN][from_square] ^ ZOBRIST_KEYS[COMPUTER_KINGS][to_square]
+        else:
+            key ^= ZOBRIST_KEYS[COMPUTER_MEN][from_square] ^ ZOBRIST_KEYS[COMPUTER_MEN][to_square]
+        for square in checkersBitboard.iterate_bits(captured):
+            key ^= ZOBRIST_KEYS[PLAYER_KINGS if board.player_kings >> square & 1 else PLAYER_MEN][square]
+    else:
+        if board.player_kings >> from_square & 1:
+            key ^= ZOBRIST_KEYS[PLAYER_KINGS][from_square] ^ ZOBRIST_KEYS[PLAYER_KINGS][to_square]
+        elif (1 << to_square) & checkersBitboard.ROW_0:
+            key ^= ZOBRIST_KEYS[PLAYER_MEN][from_square] ^ ZOBRIST_KEYS[PLAYER_KINGS][to_square]
+        else:
+            key ^= ZOBRIST_KEYS[PLAYER_MEN][from_square] ^ ZOBRIST_KEYS[PLAYER_MEN][to_square]
+        for square in checkersBitboard.iterate_bits(captured):
+            key ^= ZOBRIST_KEYS[COMPUTER_KINGS if board.computer_kings >> square & 1 else COMPUTER_MEN][square]
+    return key ^ ZOBRIST_COMPUTER # the other side is to move
+
+
+class SearchTimeout(Exception):
+    """
+    raised inside the search when the time budget of the computer move is used up
+    """
+    pass
+
+
+class TranspositionTable:
+    """
+    bounded two-tier transposition table. Every bucket has two entries:
+    - a depth-preferred entry, which is only replaced by a deeper search or by a search of a newer turn
+    - an always-replace entry, which keeps the last stored position
+    An entry is a tuple (key, depth, score, bound, best_move, generation).
+    :param: size: number of buckets, rounded up to a power of two
+    """
+    def __init__(self, size=CHECKERS_TT_SIZE):
+        buckets = 1
+        while buckets < size:
+            buckets <<= 1
+        self.mask = buckets - 1
+        self.deep = [None] * buckets # depth-preferred entries
+        self.recent = [None] * buckets # always-replace entries
+        self.generation = 0 # incremented at each new turn, to replace the entries of the old turns first
+        self.hits = 0 # number of probes that found the position
+        self.misses = 0 # number of probes that did not find the position
+        self.stores = 0 # number of stored entries
+
+    def new_search(self):
+        """
+        called before every search of the computer, the entries of the previous searches stay available
+        but may be replaced by the new search.
+
+        :return: None
+        """
+        self.generation += 1
+        self.hits = 0 # the counters are reported for every search (see SearchStats)
+        self.misses = 0
+
+    def clear(self):
+        """
+        remove all entries and reset the counters
+
+        :return: None
+        """
+        self.deep = [None] * (self.mask + 1)
+        self.recent = [None] * (self.mask + 1)
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def probe(self, key):
+        """
+        find a position in the table
+        :param: key: zobrist hash of the position
+
+        :return: entry (key, depth, score, bound, best_move, generation) or None
+        """
+        index = key & self.mask
+        entry = self.deep[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        entry = self.recent[index]
+        if entry is not None and entry[0] == key:
+            self.hits += 1
+            return entry
+        self.misses += 1
+        return None
+
+    def store(self, key, depth, score, bound, best_move):
+        """
+        save the result of a search in the table
+        :param: key: zobrist hash of the position
+        :param: depth: remaining depth of the search
+        :param: score: result of the search
+        :param: bound: EXACT, LOWER or UPPER
+        :param: best_move: best move found in the position (or None)
+
+        :return: None
+        """
+        index = key & self.mask
+        entry = (key, depth, score, bound, best_move, self.generation)
+        self.stores += 1
+        deep = self.deep[index]
+        if deep is None or depth >= deep[1] or deep[5] != self.generation:
+            self.deep[index] = entry
+        else:
+            self.recent[index] = entry
+
+    def hit_rate(self):
+        """
+        :return: part of the probes that found the position (0.0 to 1.0)
+        """
+        probes = self.hits + self.misses
+        if probes == 0:
+            return 0.0
+        return self.hits / probes
+
+
+_process_pool = None # persistent pool of processes for the parallel search, shared by all games
+_worker_engine = None # search engine of a process of the pool
+
+
+def get_process_pool(workers):
+    """
+    get the persistent pool of processes for the parallel search. The pool is created at the first call.
+    The processes are started with "spawn", because the app runs several threads (fork is not safe).
+    :param: workers: number of processes
+
+    :return: ProcessPoolExecutor
+    """
+    global _process_pool
+    if _process_pool is None:
+        _process_pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    return _process_pool
+
+
+def search_root_move(position, move, depth, mandatory_jumping, remaining, generation, node_limit=None):
+    """
+    search one move of the computer in a process of the pool. Every process keeps its own
+    search engine, so that its transposition table is reused by the next tasks.
+    :param: position: the four masks of the bitboard (see Bitboard.key()), small to send to the process
+    :param: move: move of the computer to search
+    :param: depth: depth of the iteration in plies from the position
+    :param: mandatory_jumping: option to use mandatory jump or not for both player
+    :param: remaining: seconds left for the search, None for no limit
+    :param: generation: generation of the transposition table of the current turn
+    :param: node_limit: nodes left for the search of this move, None for no limit
+
+    :return: value, counters, seconds: evaluation of the move (None if the time or the nodes are used up),
+             counters of the search (see SearchEngine.counters()) and cpu time needed by the process
+    """
+    global _worker_engine
+    started = time.perf_counter()
+    cpu_started = time.process_time() # the cpu time is the work of the process, independent of the number of cores
+    if _worker_engine is None:
+        _worker_engine = SearchEngine(workers=0)
+    engine = _worker_engine
+    if remaining is not None and remaining <= 0 or node_limit is not None and node_limit <= 0:
+        return None, None, 0.0
+    engine.reset_counters()
+    engine.deadline = None if remaining is None else started + remaining
+    engine.node_limit = math.inf if node_limit is None else node_limit
+    engine.transposition_table.generation = generation
+    board = checkersBitboard.Bitboard(*position)
+    key = hash_after_move(zobrist_hash(board, True, mandatory_jumping), board, move, True)
+    checkersBitboard.apply_move(board, move, True)
+    try:
+        value = engine.minimax(board, key, depth - 1, -math.inf, math.inf, False, mandatory_jumping)
+    except SearchTimeout:
+        value = None
+    engine.deadline = None
+    engine.node_limit = math.inf
+    return value, engine.counters(), time.process_time() - cpu_started
+
+
+class SearchStats:
+    """
+    statistics of one move of the computer, written as a JSON line to logs/checkers.log (see Checkers.evaluate_states())
+    to find out why some moves need much more time than others.
+    :param: source: origin of the move: "alpha_beta", "mcts", "book", "endgame" or "pondered"
+    :param: move: chosen move [old_i, old_j, new_i, new_j] or None
+    :param: value: evaluation of the move or None
+    :param: seconds: wall-clock time of the move
+    """
+    def __init__(self, source, move=None, value=None, seconds=0.0):
+        self.source = source
+        self.move = move
+        self.value = None if value is None or abs(value) == math.inf else value # JSON has no infinity
+        self.won = None if value is None or abs(value) != math.inf else value > 0 # end of the game found by the search
+        self.seconds = round(seconds, 6)
+        self.depth = 0 # depth of the last completed iteration (alpha beta) or of the tree (mcts)
+        self.max_depth = 0 # depth of the deepest started iteration
+        self.nodes = 0 # visited nodes (alpha beta) or playouts (mcts)
+        self.leaves = 0 # evaluated gameboards at the depth 0
+        self.iteration_nodes = [] # visited nodes of every completed iteration
+        self.branching_factor = None # effective branching factor of the last completed iteration
+        self.cutoffs = 0 # beta cutoffs
+        self.first_move_cutoff_rate = None # part of the beta cutoffs caused by the first searched move
+        self.cutoffs_per_ply = [] # beta cutoffs at the ply 1, 2, 3, ...
+        self.tt_hits = None # probes of the transposition table that found the position
+        self.tt_misses = None
+        self.movegen_seconds = None # time in the move generation (only with CHECKERS_SEARCH_TIMING)
+        self.evaluation_seconds = None # time in apply_move / undo_move with the incremental evaluation (only with CHECKERS_SEARCH_TIMING)
+        self.cpu_seconds = None # cpu time of all the processes of the search
+
+    def nodes_per_second(self):
+        """
+        :return: visited nodes per second of the move
+        """
+        return round(self.nodes / self.seconds) if self.seconds > 0 else None
+
+    def to_dict(self):
+        """
+        :return: dict of the statistics
+        """
+        stats = dict(vars(self))
+        stats["nodes_per_second"] = self.nodes_per_second()
+        return stats
+
+    def to_json(self):
+        """
+        :return: statistics as one line of JSON
+        """
+        return json.dumps(self.to_dict(), separators=(",", ":"))
+
+
+class SearchEngine:
+    """
+    alpha beta search with a transposition table on the bitboard.
+    The same engine is used for all the turns of a game, so that the results
+    of the previous turns can be reused.
+    :param: table_size: number of buckets of the transposition table
+    :param: workers: number of processes for the parallel search of the moves of the computer (0 or 1: no parallel search)
+    :param: ordering: True to order the moves in the search (see order_moves()), False to search them in the generated order
+    :param: timing: True to measure the time in the move generation and in the evaluation (slower search)
+    """
+    def __init__(self, table_size=CHECKERS_TT_SIZE, workers=CHECKERS_PARALLEL_WORKERS, ordering=CHECKERS_MOVE_ORDERING, timing=CHECKERS_SEARCH_TIMING):
+        self.transposition_table = TranspositionTable(table_size)
+        self.ordering = ordering
+        self.killers = [[None, None] for _ in range(CHECKERS_MAX_DEPTH + 2)] # 2 quiet moves per ply which caused a cutoff
+        self.history = {True: [0] * 1024, False: [0] * 1024} # history heuristic of the computer and the player, index from_square * 32 + to_square
+        self.timing = timing
+        if timing: # the functions of the bitboard are called through the engine, so that the search is not slowed down without timing
+            self.generate_moves, self.apply_move, self.undo_move = self.timed_generate_moves, self.timed_apply_move, self.timed_undo_move
+        else:
+            self.generate_moves, self.apply_move, self.undo_move = checkersBitboard.generate_moves, checkersBitboard.apply_move, checkersBitboard.undo_move
+        self.workers = workers
+        if self.workers > 1:
+            get_process_pool(self.workers) # start the processes before the first move of the computer
+        self.reset_counters()
+        self.work_seconds = 0.0 # cpu time needed by all the processes during the last search
+        self.depth = 0 # depth of the last completed iteration of the last search
+        self.max_depth = 0 # depth of the deepest started iteration of the last search
+        self.iteration_nodes = [] # visited nodes of every completed iteration of the last search
+        self.deadline = None # time (time.perf_counter()) at which the running iteration must stop, None for no limit
+        self.cancel = None # cancel token (threading.Event) of the running search, set by another thread to stop it
+        self.node_limit = math.inf # number of nodes at which the running iteration must stop
+        self.random = random.Random() # noise of the choice of the move (difficulty)
+
+    def new_search(self):
+        """
+        prepare the engine for a new search of the computer
+
+        :return: None
+        """
+        self.reset_counters()
+        self.work_seconds = 0.0
+        self.depth = 0
+        self.max_depth = 0
+        self.iteration_nodes = []
+        self.deadline = None
+        self.transposition_table.new_search()
+        for killers in self.killers: # the killer moves of the previous turn are at the wrong ply
+            killers[0] = killers[1] = None
+        for side in self.history.values(): # keep the history of the previous turn, but with less weight
+            for index in range(1024):
+                side[index] >>= 1
+
+    def reset_counters(self):
+        """
+        set the counters of the search to 0 (see counters())
+
+        :return: None
+        """
+        self.nodes = 0 # number of visited nodes of the last search
+        self.leaves = 0 # number of evaluated gameboards at the depth 0
+        self.cutoffs = 0 # number of beta cutoffs of the last search
+        self.first_move_cutoffs = 0 # number of beta cutoffs by the first searched move of the last search
+        self.ply_cutoffs = [0] * (CHECKERS_MAX_DEPTH + 2) # number of beta cutoffs at every ply
+        self.movegen_seconds = 0.0 # time in generate_moves() (with timing)
+        self.evaluation_seconds = 0.0 # time in apply_move() and undo_move() (with timing)
+
+    def counters(self):
+        """
+        :return: dict with the counters of the search since reset_counters(), small to send from a process of the pool
+        """
+        table = self.transposition_table
+        return {"nodes": self.nodes, "leaves": self.leaves, "cutoffs": self.cutoffs, "first_move_cutoffs": self.first_move_cutoffs,
+                "ply_cutoffs": self.ply_cutoffs, "tt_hits": table.hits, "tt_misses": table.misses,
+                "movegen_seconds": self.movegen_seconds, "evaluation_seconds": self.evaluation_seconds}
+
+    def add_counters(self, counters):
+        """
+        add the counters of the search of a process of the pool to the counters of the engine
+        :param: counters: dict of counters() of the other engine
+
+        :return: None
+        """
+        table = self.transposition_table
+        self.nodes += counters["nodes"]
+        self.leaves += counters["leaves"]
+        self.cutoffs += counters["cutoffs"]
+        self.first_move_cutoffs += counters["first_move_cutoffs"]
+        for ply, cutoffs in enumerate(counters["ply_cutoffs"]):
+            self.ply_cutoffs[ply] += cutoffs
+        table.hits += counters["tt_hits"]
+        table.misses += counters["tt_misses"]
+        self.movegen_seconds += counters["movegen_seconds"]
+        self.evaluation_seconds += counters["evaluation_seconds"]
+
+    def timed_generate_moves(self, board, computer, mandatory_jumping):
+        """
+        checkersBitboard.generate_moves() with the measure of the time (see SearchStats)
+        """
+        started = time.perf_counter()
+        moves = checkersBitboard.generate_moves(board, computer, mandatory_jumping)
+        self.movegen_seconds += time.perf_counter() - started
+        return moves
+
+    def timed_apply_move(self, board, move, computer):
+        """
+        checkersBitboard.apply_move() with the measure of the time, the evaluation is updated by the move
+        """
+        started = time.perf_counter()
+        undo = checkersBitboard.apply_move(board, move, computer)
+        self.evaluation_seconds += time.perf_counter() - started
+        return undo
+
+    def timed_undo_move(self, board, undo, computer):
+        """
+        checkersBitboard.undo_move() with the measure of the time
+        """
+        started = time.perf_counter()
+        checkersBitboard.undo_move(board, undo, computer)
+        self.evaluation_seconds += time.perf_counter() - started
+
+    def think(self, board, mandatory_jumping, think_ms=CHECKERS_THINK_MS, max_depth=CHECKERS_MAX_DEPTH, fixed_depth=CHECKERS_SEARCH_DEPTH, max_nodes=0, noise=0, cancel=None):
+        """
+        search the best move of the computer.
+        The search can be stopped by another thread with its own cancel token, so that a stop of the pondering
+        and a cancelled request of the checkers service do not interfere.
+        With a time or node budget, the gameboard is searched with the depth 1, 2, 3, ... (iterative deepening)
+        until the budget is used up. The best move of the last completed iteration is returned and
+        each iteration searches the moves in the order of the scores of the previous iteration.
+        Without budget, the gameboard is searched once with a fixed depth.
+        :param: board: current bitboard
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+        :param: think_ms: time budget in milliseconds, 0 or None for no time limit
+        :param: max_depth: maximum depth of the iterative deepening
+        :param: fixed_depth: depth of the search without budget
+        :param: max_nodes: node budget, 0 for no limit
+        :param: noise: random noise added to the values of the moves before the choice (1000 = value of a piece), 0 for the best move
+        :param: cancel: threading.Event that stops the search when it is set, None if the search cannot be stopped
+
+        :return: best_move, value: best move (from_square, to_square, captured_mask) and its evaluation,
+                 (None, None) if the computer has no move. Raises SearchTimeout if the search is stopped
+                 (cancel is set) before the first iteration is completed.
+        """
+        self.cancel = cancel
+        try:
+            return self.iterative_deepening(board, mandatory_jumping, think_ms, max_depth, fixed_depth, max_nodes, noise)
+        finally:
+            self.cancel = None
+
+    def iterative_deepening(self, board, mandatory_jumping, think_ms, max_depth, fixed_depth, max_nodes, noise):
+        """
+        search of think() with the cancel token self.cancel (same parameters and result)
+        """
+        self.new_search()
+        board = board.copy() # the search walks on one mutable bitboard (apply_move / undo_move)
+        root_moves = checkersBitboard.generate_moves(board, True, mandatory_jumping)
+        if len(root_moves) == 0:
+            return None, None
+        key = zobrist_hash(board, True, mandatory_jumping)
+
+        if not think_ms and not max_nodes: # fixed depth
+            self.max_depth = fixed_depth
+            scores = self.search_root(board, key, fixed_depth, root_moves, mandatory_jumping)
+            self.depth = fixed_depth
+            self.iteration_nodes.append(self.nodes)
+            return self.noisy_best_of(scores, noise) if noise else self.best_of(scores)
+
+        deadline = time.perf_counter() + think_ms / 1000 if think_ms else None
+        node_limit = max_nodes or math.inf
+        best = None
+        completed = None
+        for depth in range(1, max_depth + 1):
+            self.deadline = deadline if best is not None else None # the first iteration is always completed
+            self.node_limit = node_limit if best is not None else math.inf
+            self.max_depth = depth
+            nodes = self.nodes
+            try:
+                scores = self.search_root(board, key, depth, root_moves, mandatory_jumping)
+            except SearchTimeout: # the iteration is not completed, use the result of the previous iteration
+                break
+            best = self.best_of(scores)
+            completed = scores
+            self.depth = depth
+            self.iteration_nodes.append(self.nodes - nodes)
+            if len(root_moves) == 1 or abs(best[1]) == math.inf: # only one move or the end of the game is known
+                break
+            root_moves = [move for move, value in sorted(scores, key=lambda score: score[1], reverse=True)] # best moves of this iteration first
+            if deadline is not None and time.perf_counter() >= deadline or self.nodes >= node_limit:
+                break
+        self.deadline = None
+        self.node_limit = math.inf
+        if best is None: # stopped by another thread during the first iteration
+            raise SearchTimeout()
+        return self.noisy_best_of(completed, noise) if noise else best
+
+    def search_root(self, board, key, depth, root_moves, mandatory_jumping):
+        """
+        one iteration of the search: evaluate every move of the computer with the full alpha beta window
+        :param: board: current bitboard
+        :param: key: zobrist hash of the current bitboard
+        :param: depth: depth of the iteration in plies from the current bitboard
+        :param: root_moves: moves of the computer in the order to search
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+        :return: list of (move, value) in the searched order
+        """
+        if self.workers > 1 and len(root_moves) > 1:
+            return self.search_root_parallel(board, depth, root_moves, mandatory_jumping)
+        started = time.process_time()
+        scores = []
+        for move in root_moves:
+            child_key = hash_after_move(key, board, move, True)
+            undo = self.apply_move(board, move, True)
+            value = self.minimax(board, child_key, depth - 1, -math.inf, math.inf, False, mandatory_jumping)
+            self.undo_move(board, undo, True)
+            scores.append((move, value))
+        self.work_seconds += time.process_time() - started
+        return scores
+
+    def search_root_parallel(self, board, depth, root_moves, mandatory_jumping):
+        """
+        one iteration of the search like search_root(), but every move of the computer is searched
+        in a process of the pool. The nodes left of the node budget are shared equally by the moves,
+        a process that uses up its share stops like at the end of the time budget.
+        :param: board: current bitboard
+        :param: depth: depth of the iteration in plies from the current bitboard
+        :param: root_moves: moves of the computer
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+        :return: list of (move, value) in the order of root_moves
+        """
+        pool = get_process_pool(self.workers)
+        remaining = None if self.deadline is None else self.deadline - time.perf_counter()
+        node_limit = None if self.node_limit == math.inf else int(self.node_limit - self.nodes) // len(root_moves) # nodes of every move
+        position = board.key()
+        generation = self.transposition_table.generation
+        futures = [pool.submit(search_root_move, position, move, depth, mandatory_jumping, remaining, generation, node_limit) for move in root_moves]
+        scores = []
+        completed = True
+        for move, future in zip(root_moves, futures):
+            if self.cancel is not None and self.cancel.is_set(): # the processes do not see the stop, so the tasks that have not started are cancelled
+                for pending in futures:
+                    pending.cancel()
+                raise SearchTimeout()
+            value, counters, seconds = future.result()
+            if counters is not None:
+                self.add_counters(counters)
+            self.work_seconds += seconds
+            if value is None:
+                completed = False
+            scores.append((move, value))
+        if not completed: # at least one process has used up the time or node budget
+            raise SearchTimeout()
+        return scores
+
+    @staticmethod
+    def best_of(scores):
+        """
+        get the move with the highest value. If some moves have the same value,
+        the last one is taken (like the dictionary of evaluate_states() always did).
+        :param: scores: list of (move, value)
+
+        :return: (move, value)
+        """
+        best = scores[0]
+        for score in scores:
+            if score[1] >= best[1]:
+                best = score
+        return best
+
+    def noisy_best_of(self, scores, noise):
+        """
+        get the move with the highest value after a uniform random noise has been added to every value
+        (weaker play for the easy difficulty, the won and lost moves are still known)
+        :param: scores: list of (move, value)
+        :param: noise: maximum noise
+
+        :return: (move, value) with the value without noise
+        """
+        return max(scores, key=lambda score: score[1] + self.random.uniform(-noise, noise))
+
+    def summary(self):
+        """
+        :return: text with the statistics of the last search for the log
+        """
+        table = self.transposition_table
+        return "depth {} reached, {} nodes searched, transposition table hits {} misses {} ({:.1%}), {} beta cutoffs, {:.1%} by the first move".format(
+            self.depth, self.nodes, table.hits, table.misses, table.hit_rate(), self.cutoffs, self.first_move_cutoff_rate())
+
+    def stats(self, move=None, value=None, seconds=0.0):
+        """
+        statistics of the last search
+        :param: move: chosen move [old_i, old_j, new_i, new_j]
+        :param: value: evaluation of the move
+        :param: seconds: wall-clock time of the move
+
+        :return: SearchStats
+        """
+        table = self.transposition_table
+        stats = SearchStats("alpha_beta", move, value, seconds)
+        stats.depth = self.depth
+        stats.max_depth = self.max_depth
+        stats.nodes = self.nodes
+        stats.leaves = self.leaves
+        stats.iteration_nodes = list(self.iteration_nodes)
+        if self.depth and self.iteration_nodes: # nodes = b ** depth
+            stats.branching_factor = round(self.iteration_nodes[-1] ** (1 / self.depth), 3)
+        stats.cutoffs = self.cutoffs
+        stats.first_move_cutoff_rate = round(self.first_move_cutoff_rate(), 4)
+        last = max([ply for ply, cutoffs in enumerate(self.ply_cutoffs) if cutoffs] or [0])
+        stats.cutoffs_per_ply = self.ply_cutoffs[1:last + 1]
+        stats.tt_hits = table.hits
+        stats.tt_misses = table.misses
+        if self.timing:
+            stats.movegen_seconds = round(self.movegen_seconds, 6)
+            stats.evaluation_seconds = round(self.evaluation_seconds, 6)
+        stats.cpu_seconds = round(self.work_seconds, 6)
+        return stats
+
+    def first_move_cutoff_rate(self):
+        """
+        part of the beta cutoffs of the last search which are caused by the first searched move (quality of the move ordering)
+
+        :return: rate between 0 and 1
+        """
+        return self.first_move_cutoffs / self.cutoffs if self.cutoffs else 0.0
+
+    def order_moves(self, moves, ply, table_move, computer):
+        """
+        sort the moves for the alpha beta pruning, the best moves first: the captures, the best move of the
+        transposition table, the killer moves of the ply and then the other moves by the history heuristic.
+        Moves with the same priority keep the generated order.
+        :param: moves: list of moves (from_square, to_square, captured_mask), sorted in place
+        :param: ply: distance to the current bitboard of the computer
+        :param: table_move: best move of the transposition table for the position, or None
+        :param: computer: True for the moves of the computer, False for the moves of the player
+
+        :return: the sorted list moves
+        """
+        if len(moves) < 2:
+            return moves
+        killers = self.killers[ply] if ply < len(self.killers) else (None, None)
+        history = self.history[computer]
+
+        def priority(move):
+            if move[2]: # captures
+                return (1 << 42) + (1 << 41 if move == table_move else 0)
+            if move == table_move:
+                return 1 << 41
+            if move == killers[0]:
+                return 1 << 40
+            if move == killers[1]:
+                return (1 << 40) - 1
+            return history[move[0] * 32 + move[1]]
+        moves.sort(key=priority, reverse=True) # stable: ties keep the generated order
+        return moves
+
+    def update_cutoff(self, move, depth, ply, computer, index):
+        """
+        remember a move which caused a beta cutoff: killer move of the ply and history heuristic (quiet moves only)
+        :param: move: move which caused the cutoff
+        :param: depth: remaining depth of the search
+        :param: ply: distance to the current bitboard of the computer
+        :param: computer: True for a move of the computer, False for a move of the player
+        :param: index: position of the move in the searched list
+
+        :return: None
+        """
+        self.cutoffs += 1
+        if ply < len(self.ply_cutoffs):
+            self.ply_cutoffs[ply] += 1
+        if index == 0:
+            self.first_move_cutoffs += 1
+        if move[2]: # the captures are always searched first
+            return
+        if ply < len(self.killers):
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        self.history[computer][move[0] * 32 + move[1]] += depth * depth
+
+    def minimax(self, board, key, depth, alpha, beta, maximizing_player, mandatory_jumping, ply=1):
+        """
+        alpha beta pruning algorithm with transposition table
+        :param: board: current bitboard, the moves are done and taken back on this bitboard
+        :param: key: zobrist hash of the current bitboard (see zobrist_hash())
+        :param: depth: remaining depth of the search
+        :param: alpha: best value of the maximizing player along the path
+        :param: beta: best value of the minimizing player along the path
+        :param: maximizing_player: True for the computer, False for the player
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+        :param: ply: distance to the current bitboard of the computer (for the killer moves)
+
+        :return: evaluation of the position (same meaning as Checkers.minimax())
+        """
+        self.nodes += 1
+        if self.nodes & 1023 == 0 and (self.cancel is not None and self.cancel.is_set() or self.nodes >= self.node_limit or self.deadline is not None and time.perf_counter() >= self.deadline):
+            raise SearchTimeout()
+        if depth == 0:
+            self.leaves += 1
+            return board.score # heuristic value, updated by every move (see checkersBitboard.evaluate())
+
+        table = self.transposition_table
+        entry = table.probe(key)
+        if entry is not None and entry[1] >= depth:
+            score = entry[2]
+            if entry[3] == EXACT:
+                return score
+            if entry[3] == LOWER:
+                alpha = max(alpha, score)
+            else:
+                beta = min(beta, score)
+            if beta <= alpha:
+                return score
+
+        alpha_start = alpha
+        beta_start = beta
+        best_move = None
+        moves = self.generate_moves(board, maximizing_player, mandatory_jumping)
+        if self.ordering:
+            self.order_moves(moves, ply, entry[4] if entry is not None else None, maximizing_player)
+        if maximizing_player is True:
+            best = -math.inf
+            for index, move in enumerate(moves):
+                child_key = hash_after_move(key, board, move, True)
+                undo = self.apply_move(board, move, True)
+                ev = self.minimax(board, child_key, depth - 1, alpha, beta, False, mandatory_jumping, ply + 1)
+                self.undo_move(board, undo, True)
+                if ev > best or best_move is None:
+                    best = ev
+                    best_move = move
+                alpha = max(alpha, ev)
+                if beta <= alpha: # pruning
+                    self.update_cutoff(move, depth, ply, True, index)
+                    break
+        else:
+            best = math.inf
+            for index, move in enumerate(moves):
+                child_key = hash_after_move(key, board, move, False)
+                undo = self.apply_move(board, move, False)
+                ev = self.minimax(board, child_key, depth - 1, alpha, beta, True, mandatory_jumping, ply + 1)
+                self.undo_move(board, undo, False)
+                if ev < best or best_move is None:
+                    best = ev
+                    best_move = move
+                beta = min(beta, ev)
+                if beta <= alpha: # pruning
+                    self.update_cutoff(move, depth, ply, False, index)
+                    break
+
+        if best <= alpha_start:
+            bound = UPPER
+        elif best >= beta_start:
+            bound = LOWER
+        else:
+            bound = EXACT
+        table.store(key, depth, best, bound, best_move)
+        return best
+
+
+class Ponderer:
+    """
+    search the answer of the computer to the most likely moves of the player in a background thread,
+    while the player is thinking (pondering). The results are stored with the bitboard after the move of
+    the player and the difficulty of the search as key, so that the computer can answer at once if the player
+    has done a pondered move and the difficulty has not changed.
+    The pondering uses the engine of the game, so that the real search also finds the pondered positions
+    in the transposition table. The pondering must be stopped before the engine is used by another thread.
+    The pondering is stopped by its own cancel token, start(), stop() and take() can be called by several threads.
+    :param: engine: SearchEngine of the game
+    :param: moves: number of the most likely moves of the player to ponder
+    :param: depth: depth of the search to find the most likely moves of the player
+    """
+    def __init__(self, engine, moves=CHECKERS_PONDER_MOVES, depth=CHECKERS_PONDER_DEPTH):
+        self.engine = engine
+        self.moves = moves
+        self.depth = depth
+        self.results = {} # (bitboard key, mandatory_jumping, name of the difficulty) -> (best move, value, depth) of the computer
+        self.thread = None
+        self.cancel = None # cancel token (threading.Event) of the running pondering
+        self.lock = threading.Lock() # start(), stop() and take() are called by the service and the controller threads
+        self.hits = 0 # number of moves of the player that have been pondered
+        self.misses = 0 # number of moves of the player that have not been pondered
+
+    def start(self, board, mandatory_jumping, profile):
+        """
+        start the pondering for the turn of the player. A running pondering is stopped before.
+        :param: board: current bitboard, the player is to move
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+        :param: profile: difficulty of the search (see CHECKERS_DIFFICULTY_PROFILES)
+
+        :return: None
+        """
+        with self.lock:
+            self._halt()
+            self.results = {}
+            self.cancel = threading.Event()
+            self.thread = threading.Thread(target=self.run, args=(board.copy(), mandatory_jumping, profile, self.cancel), daemon=True)
+            self.thread.start()
+
+    def stop(self):
+        """
+        stop the pondering and discard the pondered answers, e.g. if the difficulty has changed
+
+        :return: None
+        """
+        with self.lock:
+            self._halt()
+            self.results = {}
+
+    def _halt(self):
+        """
+        stop the pondering and wait for the end of the background thread (at most 1024 nodes of the search),
+        the pondered answers are kept (the lock is held)
+
+        :return: None
+        """
+        if self.thread is not None:
+            self.cancel.set()
+            self.thread.join()
+            self.thread = None
+            self.cancel = None
+
+    def take(self, board, mandatory_jumping, profile):
+        """
+        stop the pondering and get the pondered answer of the computer to the move of the player
+        :param: board: current bitboard after the move of the player
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+        :param: profile: current difficulty of the search (see CHECKERS_DIFFICULTY_PROFILES)
+
+        :return: (best move, value, depth) or None if the position has not been pondered with this difficulty
+        """
+        with self.lock:
+            self._halt()
+            result = self.results.pop((board.key(), mandatory_jumping, profile["name"]), None)
+            if result is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            self.results = {}
+            return result
+
+    def likely_moves(self, board, mandatory_jumping):
+        """
+        sort the moves of the player with a search of the depth self.depth, the best moves for the player first
+        :param: board: current bitboard, the player is to move
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+        :return: list of the self.moves most likely moves of the player
+        """
+        moves = checkersBitboard.generate_moves(board, False, mandatory_jumping)
+        if len(moves) <= self.moves:
+            return moves
+        engine = self.engine
+        engine.new_search()
+        key = zobrist_hash(board, False, mandatory_jumping)
+        scores = []
+        for move in moves:
+            child_key = hash_after_move(key, board, move, False)
+            undo = checkersBitboard.apply_move(board, move, False)
+            scores.append((engine.minimax(board, child_key, self.depth - 1, -math.inf, math.inf, True, mandatory_jumping), len(scores), move))
+            checkersBitboard.undo_move(board, undo, False)
+        scores.sort() # the player minimizes the value, the generated order for equal values
+        return [move for value, index, move in scores[:self.moves]]
+
+    def run(self, board, mandatory_jumping, profile, cancel):
+        """
+        pondering in the background thread: search the answer of the computer to each likely move of the player
+        with the same budget as a real move, until all the moves are pondered or the pondering is stopped
+        :param: board: current bitboard, the player is to move
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+        :param: profile: difficulty of the search (see CHECKERS_DIFFICULTY_PROFILES)
+        :param: cancel: cancel token of the pondering (threading.Event)
+
+        :return: None
+        """
+        try:
+            self.engine.cancel = cancel # likely_moves() searches without think()
+            try:
+                moves = self.likely_moves(board, mandatory_jumping)
+            finally:
+                self.engine.cancel = None
+            for move in moves:
+                child = checkersBitboard.make_move(board, move, False)
+                best_move, value = self.engine.think(child, mandatory_jumping, think_ms=profile["think_ms"], max_nodes=profile["max_nodes"], noise=profile["noise"], cancel=cancel)
+                if cancel.is_set(): # the search has been stopped before the end of the time budget
+                    return
+                self.results[(child.key(), mandatory_jumping, profile["name"])] = (best_move, value, self.engine.depth)
+        except SearchTimeout: # stopped in the first iteration
+            pass
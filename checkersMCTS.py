@@ -0,0 +1,258 @@
+"""
+monte carlo tree search (MCTS) engine of the checkers game on the bitboard of checkersBitboard.py.
+
+The tree is grown by UCT selection, every new node is rated by a playout: the captures are played first,
+the other moves at random, and after CHECKERS_MCTS_PLAYOUT_PLIES the heuristic value of the gameboard is
+converted to a win probability. The search can be stopped at any time (time or playout budget), the most
+visited move of the computer is played. It has the same interface as checkersEngine.SearchEngine.
+With CHECKERS_PARALLEL_WORKERS, every process grows its own tree and the visits of the moves are added.
+"""
+
+import math
+import random
+import time
+import checkersBitboard
+import checkersEngine
+from config import *
+
+
+class MCTSNode:
+    """
+    node of the search tree
+    :param: move: move that leads to the node (None for the root)
+    :param: parent: parent node (None for the root)
+    :param: computer: True if the computer is to move in the node
+    :param: moves: available moves in the node
+    """
+    __slots__ = ("move", "parent", "computer", "untried", "children", "visits", "wins")
+
+    def __init__(self, move, parent, computer, moves):
+        self.move = move
+        self.parent = parent
+        self.computer = computer
+        self.untried = moves # moves without child node
+        self.children = []
+        self.visits = 0
+        self.wins = 0.0 # sum of the results for the side that did the move to the node
+
+    def select(self, exploration):
+        """
+        :param: exploration: exploration constant of UCT
+
+        :return: child with the highest upper confidence bound (UCT)
+        """
+        log_visits = math.log(self.visits)
+        best = None
+        best_bound = -math.inf
+        for child in self.children:
+            bound = child.wins / child.visits + exploration * math.sqrt(log_visits / child.visits)
+            if bound > best_bound:
+                best_bound = bound
+                best = child
+        return best
+
+
+def mcts_root_worker(position, mandatory_jumping, think_ms, iterations, seed):
+    """
+    grow a tree in a process of the pool (root parallelization)
+    :param: position: the four masks of the bitboard (see Bitboard.key())
+    :param: mandatory_jumping: option to use mandatory jump or not for both player
+    :param: think_ms: time budget in milliseconds, 0 for no time limit
+    :param: iterations: playout budget, 0 for no limit
+    :param: seed: seed of the random playouts of the process
+
+    :return: list of (move, visits, wins) of the root, number of playouts, depth of the tree
+    """
+    engine = MCTSEngine(workers=0, seed=seed)
+    root = engine.grow(checkersBitboard.Bitboard(*position), mandatory_jumping, think_ms, iterations)
+    return [(child.move, child.visits, child.wins) for child in root.children], engine.nodes, engine.depth
+
+
+class MCTSEngine:
+    """
+    monte carlo tree search with UCT selection, anytime under a time or playout budget
+    :param: exploration: exploration constant of UCT
+    :param: playout_plies: maximum number of plies of a playout before the gameboard is rated by its heuristic value
+    :param: iterations: playout budget of a search without time budget
+    :param: workers: number of processes for the root parallelization (0 or 1: no parallel search)
+    :param: seed: seed of the random playouts, None for a random seed
+    """
+    def __init__(self, exploration=CHECKERS_MCTS_EXPLORATION, playout_plies=CHECKERS_MCTS_PLAYOUT_PLIES,
+                 iterations=CHECKERS_MCTS_ITERATIONS, workers=CHECKERS_PARALLEL_WORKERS, seed=None):
+        self.exploration = exploration
+        self.playout_plies = playout_plies
+        self.iterations = iterations
+        self.workers = workers
+        self.random = random.Random(seed)
+        self.nodes = 0 # number of playouts of the last search
+        self.depth = 0 # maximum depth of the tree of the last search
+        self.visits = 0 # visits of the best move of the last search
+        self.deadline = None
+        self.cancel = None # cancel token (threading.Event) of the running search, set by another thread to stop it
+        self.noise = 0 # random noise of the heuristic value at the end of the playouts (difficulty)
+
+    def new_search(self):
+        """
+        prepare the engine for a new search of the computer
+
+        :return: None
+        """
+        self.nodes = 0
+        self.depth = 0
+        self.visits = 0
+
+    def think(self, board, mandatory_jumping, think_ms=CHECKERS_THINK_MS, max_depth=CHECKERS_MAX_DEPTH, fixed_depth=CHECKERS_SEARCH_DEPTH, max_nodes=0, noise=0, cancel=None):
+        """
+        search the best move of the computer (same interface as SearchEngine.think()).
+        The search runs until the time budget or the playout budget self.iterations is used up.
+        :param: board: current bitboard
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+        :param: think_ms: time budget in milliseconds, 0 or None to use only the playout budget
+        :param: max_depth: not used (the tree grows where the playouts are promising)
+        :param: fixed_depth: not used
+        :param: max_nodes: playout budget, 0 to use self.iterations
+        :param: noise: random noise added to the heuristic value at the end of the playouts (1000 = value of a piece)
+        :param: cancel: threading.Event that stops the search when it is set, None if the search cannot be stopped
+
+        :return: (best_move, value) with the most visited move and its win rate, or (None, None) if no moves are available
+        """
+        self.cancel = cancel
+        try:
+            return self.search(board, mandatory_jumping, think_ms, max_nodes, noise)
+        finally:
+            self.cancel = None
+
+    def search(self, board, mandatory_jumping, think_ms, max_nodes, noise):
+        """
+        search of think() with the cancel token self.cancel (same parameters and result)
+        """
+        self.new_search()
+        root_moves = checkersBitboard.generate_moves(board, True, mandatory_jumping)
+        if len(root_moves) == 0:
+            return None, None
+        if len(root_moves) == 1:
+            return root_moves[0], None
+        iterations = max_nodes or self.iterations
+        if not iterations and not think_ms: # a budget is always needed
+            iterations = 1000
+        self.noise = noise
+        if self.workers > 1:
+            statistics = self.grow_parallel(board, mandatory_jumping, think_ms, iterations)
+        else:
+            root = self.grow(board.copy(), mandatory_jumping, think_ms, iterations)
+            statistics = [(child.move, child.visits, child.wins) for child in root.children]
+        if not statistics: # stopped before the first playout
+            return root_moves[0], None
+        best_move, self.visits, wins = max(statistics, key=lambda child: child[1])
+        return best_move, wins / self.visits
+
+    def grow(self, board, mandatory_jumping, think_ms, iterations):
+        """
+        grow the tree from the bitboard until a budget is used up
+        :param: board: current bitboard (the computer is to move), not modified
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+        :param: think_ms: time budget in milliseconds, 0 for no time limit
+        :param: iterations: playout budget, 0 for no limit
+
+        :return: root node
+        """
+        root = MCTSNode(None, None, True, checkersBitboard.generate_moves(board, True, mandatory_jumping))
+        self.deadline = time.perf_counter() + think_ms / 1000 if think_ms else None
+        while self.cancel is None or not self.cancel.is_set():
+            if iterations and self.nodes >= iterations:
+                break
+            if self.deadline is not None and self.nodes & 15 == 0 and time.perf_counter() >= self.deadline:
+                break
+            node = root
+            current = board.copy()
+            depth = 0
+            # selection: descend while all the moves of the node have a child
+            while not node.untried and node.children:
+                node = node.select(self.exploration)
+                checkersBitboard.apply_move(current, node.move, not node.computer)
+                depth += 1
+            # expansion: one new child
+            if node.untried:
+                move = node.untried.pop(self.random.randrange(len(node.untried)))
+                checkersBitboard.apply_move(current, move, node.computer)
+                child = MCTSNode(move, node, not node.computer, checkersBitboard.generate_moves(current, not node.computer, mandatory_jumping))
+                node.children.append(child)
+                node = child
+                depth += 1
+            self.depth = max(self.depth, depth)
+            # playout: result for the computer between 0 (lost) and 1 (won)
+            result = self.playout(current, node.computer, node.untried, mandatory_jumping)
+            self.nodes += 1
+            # backpropagation
+            while node is not None:
+                node.visits += 1
+                if node.parent is not None:
+                    node.wins += result if node.parent.computer else 1 - result
+                node = node.parent
+        self.deadline = None
+        return root
+
+    def grow_parallel(self, board, mandatory_jumping, think_ms, iterations):
+        """
+        grow one tree in every process of the pool and add the visits of the moves of the computer
+        :param: board: current bitboard (the computer is to move)
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+        :param: think_ms: time budget in milliseconds, 0 for no time limit
+        :param: iterations: playout budget of all the processes, 0 for no limit
+
+        :return: list of (move, visits, wins) of the root
+        """
+        pool = checkersEngine.get_process_pool(self.workers)
+        share = -(-iterations // self.workers) if iterations else 0
+        futures = [pool.submit(mcts_root_worker, board.key(), mandatory_jumping, think_ms, share, self.random.getrandbits(32)) for _ in range(self.workers)]
+        totals = {}
+        for future in futures:
+            children, nodes, depth = future.result()
+            self.nodes += nodes
+            self.depth = max(self.depth, depth)
+            for move, visits, wins in children:
+                total = totals.get(move, (0, 0.0))
+                totals[move] = (total[0] + visits, total[1] + wins)
+        return [(move, visits, wins) for move, (visits, wins) in totals.items()]
+
+    def playout(self, board, computer, moves, mandatory_jumping):
+        """
+        play the game from the bitboard: the captures first, the other moves at random
+        :param: board: bitboard of the node (modified)
+        :param: computer: True if the computer is to move
+        :param: moves: available moves of the side to move (not modified)
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+        :return: result for the computer between 0 (lost) and 1 (won)
+        """
+        choice = self.random.choice
+        for ply in range(self.playout_plies):
+            if ply:
+                moves = checkersBitboard.generate_moves(board, computer, mandatory_jumping)
+            if not moves: # the side to move has lost
+                return 0.0 if computer else 1.0
+            move = moves[0] if moves[0][2] else choice(moves) # the jumps are generated first
+            checkersBitboard.apply_move(board, move, computer)
+            computer = not computer
+        score = board.score + self.random.uniform(-self.noise, self.noise) if self.noise else board.score
+        return 1 / (1 + math.exp(-score / 1000)) # 1000 is the value of one piece
+
+    def summary(self):
+        """
+        :return: text with the statistics of the last search for the log
+        """
+        return "{} playouts, tree depth {}, best move visited {} times".format(self.nodes, self.depth, self.visits)
+
+    def stats(self, move=None, value=None, seconds=0.0):
+        """
+        statistics of the last search (see checkersEngine.SearchStats), a playout is counted as a node and a leaf
+        :param: move: chosen move [old_i, old_j, new_i, new_j]
+        :param: value: win rate of the move
+        :param: seconds: wall-clock time of the move
+
+        :return: SearchStats
+        """
+        stats = checkersEngine.SearchStats("mcts", move, value, seconds)
+        stats.depth = stats.max_depth = self.depth
+        stats.nodes = stats.leaves = self.nodes
+        return stats
@@ -0,0 +1,133 @@
+"""
+service that computes the moves of the computer in the checkers game in its own thread.
+
+The controller thread consumes the camera frames, so it must not wait for the search of the computer.
+The controller submits the move of the player and gets a future (concurrent.futures.Future) at once,
+the requests are done one after the other by the thread of the service. While the move is computed,
+the controller keeps processing the frames and takes the result when the future is done.
+A request can be cancelled: a waiting request is not started, a running search is stopped.
+Every request has its own cancel token (threading.Event) checked by the search, so a cancel is never lost
+or applied to the next request. The engine and the difficulty of a game are not changed during its request:
+configure() applies them at once if the game has no running request, otherwise after the request.
+"""
+
+import queue
+import threading
+from concurrent.futures import Future, CancelledError
+import checkersEngine
+
+
+class CheckersService(threading.Thread):
+    """
+    thread with a queue of requests for Checkers.play()
+    """
+    def __init__(self):
+        threading.Thread.__init__(self, daemon=True) # the app must not wait for a running search at exit
+        self.requests = queue.Queue() # (future, checkers, fromInd, toInd, mandatory_jumping) or None to stop the thread
+        self.lock = threading.Lock()
+        self.current = None # future of the running request
+        self.checkers = None # game of the running request
+        self.cancelToken = None # cancel token (threading.Event) of the running request
+        self.settings = None # (engine, difficulty) of the game of the running request, applied after the request
+
+    def submit(self, checkers, fromInd, toInd, mandatory_jumping):
+        """
+        add the move of the player to the queue, the answer of the computer is computed by the thread of the service
+        :param: checkers: checkers.Checkers of the game
+        :param: fromInd: start position of player piece ("x,y")
+        :param: toInd: cible position of player piece ("x,y")
+        :param: mandatory_jumping: option to use mandatory jump or not for both player
+
+        :return: future with the result of Checkers.play()
+        """
+        future = Future()
+        self.requests.put((future, checkers, fromInd, toInd, mandatory_jumping))
+        return future
+
+    def configure(self, checkers, engine, difficulty):
+        """
+        select the engine and the difficulty of the computer of a game (see Checkers.select_engine() and
+        Checkers.set_difficulty()). The running search of the game keeps its engine and its budget.
+        :param: checkers: checkers.Checkers of the game
+        :param: engine: 0 for the alpha beta search, 1 for the monte carlo tree search
+        :param: difficulty: 0 for easy, 1 for medium, 2 for hard
+
+        :return: None
+        """
+        with self.lock:
+            if self.checkers is checkers: # the game has a running request
+                self.settings = (engine, difficulty)
+            else:
+                checkers.select_engine(engine)
+                checkers.set_difficulty(difficulty)
+
+    def cancel(self):
+        """
+        cancel all the requests: the waiting requests are not started and the running search is stopped.
+        The future of the running request ends with CancelledError.
+
+        :return: None
+        """
+        while True:
+            try:
+                request = self.requests.get_nowait()
+            except queue.Empty:
+                break
+            if request is None: # keep the stop of the thread
+                self.requests.put(None)
+                break
+            request[0].cancel()
+        with self.lock:
+            if self.current is not None:
+                self.cancelToken.set() # checked by the search every 1024 nodes
+
+    def stop(self):
+        """
+        cancel the requests and stop the thread of the service
+
+        :return: None
+        """
+        self.cancel()
+        self.requests.put(None)
+
+    def run(self):
+        """
+        do the requests of the queue until stop() is called
+
+        :return: None
+        """
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+            future, checkers, fromInd, toInd, mandatory_jumping = request
+            if not future.set_running_or_notify_cancel(): # cancelled while waiting
+                continue
+            cancelToken = threading.Event()
+            with self.lock:
+                self.current = future
+                self.checkers = checkers
+                self.cancelToken = cancelToken
+            try:
+                result = checkers.play(fromInd, toInd, mandatory_jumping, cancelToken)
+                error = None
+            except checkersEngine.SearchTimeout: # the search has been stopped by cancel()
+                result = None
+                error = CancelledError()
+            except Exception as exception:
+                result = None
+                error = exception
+            with self.lock:
+                if cancelToken.is_set():
+                    error = CancelledError()
+                if self.settings is not None: # engine or difficulty changed during the request
+                    checkers.select_engine(self.settings[0])
+                    checkers.set_difficulty(self.settings[1])
+                    self.settings = None
+                self.current = None
+                self.checkers = None
+                self.cancelToken = None
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(error)
@@ -11,6 +11,7 @@ BRIGHTNESSMIN = 0   # minimum camera brightness
 DEFAULTBRIGHTNESS = 128 # Default camera Brigthness, if the file data/brightness.txt is not available      
 BRIGHTNESSMAX = 255 # maximum camera brightness
 FPS = 30    # fps for Camera
+VIDEO_RING_SIZE = 8 # number of camera frames in the ring buffer of the VideoStreamer (the buffers are reused, a frame is valid until VIDEO_RING_SIZE - 1 newer frames have been read)
 FLIPHORIZONTAL = False # flip image if the camera has changed the orientation
 
 
@@ -47,7 +48,7 @@ PlAYER_PLAY = "Player is playing"
 FRANKA_PLAY = "Franka Emika Robot is playing!"
 
 
-MAXLEN = 1  # max length of queues 
+FRAME_MAILBOX_STALE_MS = 200  # a frame read from a mailbox later than this time (milliseconds) after its capture is counted as stale (frameMailbox.py)
 
 
 # Data for the conversion of pixels to centimeters (CM)
@@ -70,11 +71,56 @@ HOME_JOINT = [-1.620304166268884, 0.019030814074330386, 0.030113897909023402, -1
 
 # model filename 
 MODEL_TIC_TAC_TOE = "./data/tic-tac-toe_Model/model.h5" # to detect tic tac toe game pieces 
+MODEL_TIC_TAC_TOE_RUNTIME = "numpy" # runtime of the tic tac toe model: "numpy", "onnx", "tflite" or "keras" (imports tensorflow, also the fallback), see ticTacToeModel.py (check the parity with python ticTacToeModel.py --check)
+MODEL_TIC_TAC_TOE_NUMPY = "./data/tic-tac-toe_Model/model.npz" # weights for the numpy runtime (python ticTacToeModel.py --numpy)
+MODEL_TIC_TAC_TOE_ONNX = "./data/tic-tac-toe_Model/model.onnx" # model for onnxruntime (python ticTacToeModel.py --onnx)
+MODEL_TIC_TAC_TOE_TFLITE = "./data/tic-tac-toe_Model/model.tflite" # model for tflite-runtime (python ticTacToeModel.py --tflite)
 MODEL_CHECKERS = "./yolov5/runs/train/exp/weights/best.pt" # to detect checkers game pieces 
 
 
 DIRECTORY_MODEL_CHECKERS = "./yolov5" # home directory for checkers-Game model  
 
+# checkers engine
+CHECKERS_TT_SIZE = 1 << 18 # number of buckets of the transposition table of the checkers engine (2 entries per bucket)
+CHECKERS_THINK_MS = 1000 # time budget in milliseconds for a move of the computer (iterative deepening). Set to 0 to search always with CHECKERS_SEARCH_DEPTH
+CHECKERS_SEARCH_DEPTH = 5 # fixed search depth (in plies from the current gameboard) if CHECKERS_THINK_MS is 0
+CHECKERS_MAX_DEPTH = 30 # maximum depth of the iterative deepening
+CHECKERS_EVAL_CHECK = False # debug: compare the incremental evaluation of the checkers gameboard with a full scan after every move
+CHECKERS_MOVE_ORDERING = True # order the moves in the search (captures, move of the transposition table, killer moves, history heuristic)
+CHECKERS_SEARCH_TIMING = False # measure the time of the move generation and of the evaluation in the search statistics of logs/checkers.log (slower search)
+CHECKERS_OPENING_BOOK = "./data/checkers_opening_book.bin" # moves of the computer at the start of the game (generated with: python checkersBook.py --book)
+CHECKERS_ENDGAME_DB = "./data/checkers_endgame.bin" # perfect moves of the computer with few pieces (generated with: python checkersBook.py --endgame)
+CHECKERS_PONDER = True # search the answers of the computer to the likely moves of the player during the turn of the player
+CHECKERS_PONDER_MOVES = 3 # number of the most likely moves of the player to ponder
+CHECKERS_PONDER_DEPTH = 3 # search depth to find the most likely moves of the player
+CHECKERS_ENGINE = 0 # engine of the computer at the start: 0 alpha beta search, 1 monte carlo tree search (selectable in the view)
+CHECKERS_MCTS_EXPLORATION = 1.4 # exploration constant of the UCT selection of the monte carlo tree search
+CHECKERS_MCTS_PLAYOUT_PLIES = 40 # maximum length of a playout, then the gameboard is rated by its heuristic value
+CHECKERS_MCTS_ITERATIONS = 0 # playout budget of a move of the computer (0: only the time budget CHECKERS_THINK_MS)
+CHECKERS_PARALLEL_WORKERS = 0 # number of processes to search the moves of the computer in parallel, 0 to search in the controller thread only
+CHECKERS_DIFFICULTY = 2 # difficulty of the computer at the start: 0 easy, 1 medium, 2 hard (selectable in the view)
+# search budget of the difficulties: time budget in milliseconds (think_ms), node budget of the alpha beta search and
+# playout budget of the monte carlo tree search (max_nodes, max_playouts, 0 for no limit), random noise of the values of the
+# moves (noise, 1000 = value of a piece), pondering and opening book/endgame database on or off (ponder, book)
+CHECKERS_DIFFICULTY_PROFILES = {
+    0: {"name": "easy", "think_ms": 100, "max_nodes": 2000, "max_playouts": 100, "noise": 400, "ponder": False, "book": False},
+    1: {"name": "medium", "think_ms": 300, "max_nodes": 20000, "max_playouts": 1000, "noise": 100, "ponder": False, "book": True},
+    2: {"name": "hard", "think_ms": CHECKERS_THINK_MS, "max_nodes": 0, "max_playouts": CHECKERS_MCTS_ITERATIONS, "noise": 0, "ponder": CHECKERS_PONDER, "book": True},
+}
+
+# tic-tac-toe: the moves of the computer are taken from a table with the minimax values of all the gameboards (ticTacToeTable.py).
+# probability that the computer plays a random move that is not optimal (blunder), for the level of the view (0 beginner, 1 professional)
+TICTT_BLUNDER_PROBABILITY = {0: 0.4, 1: 0.0}
+# mean absolute difference (0 - 255) between the 32x32 images of a field of two frames above which the field is classified again
+TICTT_CELL_CHANGE_THRESHOLD = 6
+# cache of the tic-tac-toe grid: the cached grid is kept while TICTT_GRID_LINE_RATIO of its lines are found within TICTT_GRID_LINE_TOLERANCE
+# pixels in the thresholded frame. A new detection is smoothed with the weight TICTT_GRID_SMOOTHING, or replaces the cached grid if it is
+# farther than TICTT_GRID_MAX_SHIFT pixels (the gameboard has moved)
+TICTT_GRID_LINE_TOLERANCE = 3
+TICTT_GRID_LINE_RATIO = 0.8
+TICTT_GRID_SMOOTHING = 0.3
+TICTT_GRID_MAX_SHIFT = 20
+
 # the height and width of the area in the view in which the camera frames must be displayed.
 VIEWWIDTH = 640 # width
 VIEWHEIGHT =  480   # height
@@ -0,0 +1,106 @@
+"""
+mailbox for the latest frame between two threads of the app (model, controller and view).
+
+A queue of length 1 keeps the oldest frame: a producer that finds the queue full drops the new frame,
+and the checks full()/empty() before put()/get() are not atomic. The mailbox keeps only the latest frame:
+put() overwrites the frame that has not been read (counted as dropped), every frame has a sequence number
+and the capture time of its camera frame. A consumer passes the sequence number of its last frame,
+so it gets every frame at most once and can wait for the next one.
+
+Counters of a mailbox (stats()):
+    put: frames put into the mailbox
+    read: frames returned to a consumer
+    dropped: frames overwritten before they have been read
+    stale: frames older than FRAME_MAILBOX_STALE_MS (since the capture) when they were read
+"""
+
+import time
+import threading
+from config import *
+
+
+class FrameMailbox:
+    """
+    latest frame with its sequence number and capture time
+    :param: name: name of the mailbox for the log
+    """
+    def __init__(self, name):
+        self.name = name
+        self.newFrame = threading.Condition() # notified by put()
+        self.frame = None
+        self.seq = 0 # sequence number of self.frame, 0: no frame
+        self.timestamp = None # capture time of self.frame (time.monotonic())
+        self.unread = False # self.frame has not been read
+        self.puts = 0
+        self.reads = 0
+        self.dropped = 0
+        self.stale = 0
+
+    def put(self, frame, timestamp=None):
+        """
+        replace the frame of the mailbox and wake up the waiting consumers
+        :param: frame: new frame
+        :param: timestamp: capture time of the camera frame (time.monotonic()), None for now
+
+        :return: sequence number of the frame
+        """
+        with self.newFrame:
+            if self.unread:
+                self.dropped += 1
+            self.frame = frame
+            self.timestamp = time.monotonic() if timestamp is None else timestamp
+            self.seq += 1
+            self.puts += 1
+            self.unread = True
+            self.newFrame.notify_all()
+            return self.seq
+
+    def get(self, lastSeq=0):
+        """
+        latest frame if it is newer than the last frame of the consumer, without waiting
+        :param: lastSeq: sequence number of the last frame of the consumer
+
+        :return: (seq, frame, timestamp), or (lastSeq, None, None) if there is no newer frame
+        """
+        with self.newFrame:
+            return self._take(lastSeq)
+
+    def wait(self, lastSeq=0, timeout=None):
+        """
+        wait for a frame newer than the last frame of the consumer
+        :param: lastSeq: sequence number of the last frame of the consumer
+        :param: timeout: maximum waiting time in seconds, None to wait without limit
+
+        :return: (seq, frame, timestamp), or (lastSeq, None, None) if there is no newer frame before the timeout
+        """
+        with self.newFrame:
+            self.newFrame.wait_for(lambda: self.seq != lastSeq, timeout)
+            return self._take(lastSeq)
+
+    def _take(self, lastSeq):
+        """
+        :param: lastSeq: sequence number of the last frame of the consumer (the lock is held)
+
+        :return: (seq, frame, timestamp), or (lastSeq, None, None) if there is no newer frame
+        """
+        if self.seq == lastSeq or self.frame is None:
+            return lastSeq, None, None
+        self.unread = False
+        self.reads += 1
+        if (time.monotonic() - self.timestamp) * 1000 > FRAME_MAILBOX_STALE_MS:
+            self.stale += 1
+        return self.seq, self.frame, self.timestamp
+
+    def stats(self):
+        """
+        :return: dictionary with the counters of the mailbox
+        """
+        with self.newFrame:
+            return {"put": self.puts, "read": self.reads, "dropped": self.dropped, "stale": self.stale}
+
+    def summary(self):
+        """
+        :return: text with the counters of the mailbox for the log
+        """
+        stats = self.stats()
+        return "{}: {} frames put, {} read, {} dropped, {} stale".format(self.name, stats["put"], stats["read"], stats["dropped"], stats["stale"])
@@ -0,0 +1,78 @@
+"""
+perspective warp of the camera frames with cached remap tables.
+
+cv2.warpPerspective computes the source coordinates of every pixel again for every frame, although the
+calibration matrices (table, tic-tac-toe and checkers gameboards) only change during a calibration.
+A FrameWarp composes its homographies into one matrix (H = Hn @ ... @ H1), computes the source coordinates
+of the output pixels once and converts them into fixed-point tables (cv2.convertMaps, CV_16SC2).
+Every frame is then warped by a single cv2.remap, the tables are computed again only if a matrix changes.
+"""
+
+import cv2
+import numpy as np
+from config import *
+
+
+def compose(matrices):
+    """
+    :param: matrices: homographies in the order of the transformations (None is ignored)
+
+    :return: matrix of all the transformations (3x3, float64), None if there is no matrix
+    """
+    result = None
+    for matrix in matrices:
+        if matrix is None:
+            continue
+        matrix = np.asarray(matrix, dtype=np.float64)
+        result = matrix if result is None else matrix @ result
+    return result
+
+
+def remap_tables(matrix, size):
+    """
+    fixed-point remap tables of a homography, same mapping as cv2.warpPerspective(frame, matrix, size)
+    :param: matrix: homography from the source frame to the output frame (3x3)
+    :param: size: (width, height) of the output frame
+
+    :return: (map1, map2) for cv2.remap
+    """
+    width, height = size
+    inverse = np.linalg.inv(matrix) # source coordinates of the output pixels
+    xs, ys = np.meshgrid(np.arange(width, dtype=np.float64), np.arange(height, dtype=np.float64))
+    points = inverse @ np.stack([xs.ravel(), ys.ravel(), np.ones(width * height)])
+    w = points[2]
+    w[np.abs(w) < 1e-12] = 1e-12 # points at infinity are mapped outside of the frame
+    # the fixed-point tables are 16 bit, the pixels far outside of the frame get the border value anyway
+    map_x = np.clip(points[0] / w, -30000, 30000).reshape(height, width).astype(np.float32)
+    map_y = np.clip(points[1] / w, -30000, 30000).reshape(height, width).astype(np.float32)
+    return cv2.convertMaps(map_x, map_y, cv2.CV_16SC2)
+
+
+class FrameWarp:
+    """
+    perspective warp with cached remap tables
+    :param: size: (width, height) of the output frames
+    """
+    def __init__(self, size=(WIDTH, HEIGHT)):
+        self.size = size
+        self.key = None # matrix of the cached tables
+        self.maps = None
+        self.rebuilds = 0 # number of computed tables (for the log)
+
+    def warp(self, frame, *matrices):
+        """
+        warp a frame with the composition of the matrices in a single remap
+        :param: frame: source frame
+        :param: matrices: homographies in the order of the transformations (None is ignored)
+
+        :return: warped frame (new array), or the frame itself if there is no matrix
+        """
+        matrix = compose(matrices)
+        if matrix is None:
+            return frame
+        key = matrix.tobytes()
+        if key != self.key: # new calibration: compute the tables once
+            self.maps = remap_tables(matrix, self.size)
+            self.key = key
+            self.rebuilds += 1
+        return cv2.remap(frame, self.maps[0], self.maps[1], cv2.INTER_LINEAR)
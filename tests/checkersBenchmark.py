@@ -0,0 +1,395 @@
+"""
+benchmark and correctness check of the checkers engine, built on checkers.Checkers.
+
+- perft: number of leaf nodes at depth N from the start gameboard and from the mid-game suite, for both
+  options of mandatory_jumping. The moves (with complete capture sequences) are done once by the reference
+  generator of this file on the string array and once by the bitboard of the engine. Both counts must be
+  identical and equal to the pinned counts PERFT_COUNTS (up to the depth PERFT_MAX_DEPTH).
+- moves: Checkers.evaluate_states() with the fixed depth CHECKERS_SEARCH_DEPTH on the recorded gameboards
+  RECORDED_MOVES. The chosen move and the gameboard after the move must be identical to the recorded ones.
+- search: Checkers.evaluate_states() with a fixed depth on the mid-game suite (time, nodes and chosen move).
+
+The result is written as JSON, so that it can be compared before and after an optimization of the engine
+(the chosen moves must be identical, the nodes per second should be higher). The exit code is 1 if a perft count
+or a recorded move is wrong:
+
+    python tests/checkersBenchmark.py --perft-depth 5 --depth 6 --output logs/checkersBenchmark.json
+"""
+
+import os
+import sys
+import json
+import time
+from argparse import ArgumentParser
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.chdir(ROOT) # the logs and the data of the app are relative to the home directory
+
+import numpy as np
+import checkers
+import checkersBitboard
+from config import CHECKERS_SEARCH_DEPTH
+
+# mid-game gameboards with the computer to move: "c"/"C" computer, "b"/"B" player, "." empty
+MIDGAME_SUITE = {
+    "midgame-1": [".c.c...c", "c...c...", ".c.b...c", "c.....c.", ".b.....c", "b...b.b.", ".b.b.c.b", "b.....b."],
+    "midgame-2": ["...c...c", "c...c.c.", ".c.....b", "..c.....", ".c.c...b", "c.c...b.", ".b.b.b..", "b.....b."],
+    "midgame-3": ["...c.c..", "c.c.c.c.", ".c.b...c", "b.....b.", "...b...b", "b...b.c.", ".b...b..", "..b...b."],
+    "midgame-4": ["...c.c..", "c.c.c.c.", ".c.c.c..", "..b.b.c.", ".b...b.c", "..b.b.b.", ".b...b.b", "b.....b."],
+    "midgame-5": [".c.c.c.c", "....c.c.", ".c.b.c..", "c.c.....", ".b.b....", "..b.c.b.", ".b.b.b..", "b...b.b."],
+    "midgame-6": [".c...c..", "c.....c.", ".c.b...c", "c.c...c.", ".c.b.c..", "b.b...b.", ".b.b...b", "b.b....."],
+    "midgame-7": [".c.....c", "c.....c.", ".c.c.c..", "c...b.c.", ".b.b.b.c", "b.....b.", ".b.b.b.b", "........"],
+    "midgame-8": [".......c", "c.c.c.c.", "...c.c.c", "c.b.b.b.", ".c.b.b.c", "b.b...b.", ".b...b.b", "......b."],
+}
+START = [".c.c.c.c", "c.c.c.c.", ".c.c.c.c", "........", "........", "b.b.b.b.", ".b.b.b.b", "b.b.b.b."]
+
+# perft counts of the depths 1 to PERFT_MAX_DEPTH: position -> {mandatory_jumping: [nodes of depth 1, 2, ...]}.
+# Counted by reference_moves() (rules of the string array generator of the first version of checkers.py,
+# with complete capture sequences). The engine must not change these counts.
+PERFT_MAX_DEPTH = 6
+PERFT_COUNTS = {
+    "start": {True: [7, 49, 302, 1469, 7361, 36768], False: [7, 49, 379, 2872, 23582, 189143]},
+    "midgame-1": {True: [2, 2, 16, 81, 324, 1533], False: [9, 68, 575, 4181, 35409, 255704]},
+    "midgame-2": {True: [2, 2, 3, 3, 31, 129], False: [8, 50, 439, 2964, 27845, 196248]},
+    "midgame-3": {True: [4, 11, 23, 95, 219, 911], False: [8, 71, 561, 5002, 40588, 359402]},
+    "midgame-4": {True: [2, 4, 8, 15, 33, 77], False: [4, 20, 87, 446, 2438, 13908]},
+    "midgame-5": {True: [2, 9, 24, 143, 321, 1741], False: [8, 58, 495, 3841, 34724, 285680]},
+    "midgame-6": {True: [1, 2, 8, 16, 51, 134], False: [6, 35, 218, 1209, 8001, 48432]},
+    "midgame-7": {True: [4, 6, 13, 63, 157, 763], False: [8, 55, 388, 2430, 18474, 122325]},
+    "midgame-8": {True: [1, 4, 5, 9, 21, 57], False: [3, 8, 33, 140, 699, 3411]},
+}
+
+# recorded gameboards with the computer to move: (gameboard, mandatory_jumping, move, gameboard after the move).
+# The moves and the gameboards after the moves were computed by evaluate_states() of the first version of checkers.py
+# (minimax with alpha beta pruning on the string array, depth 5 = CHECKERS_SEARCH_DEPTH) on gameboards of random games.
+# Only the gameboards on which the complete capture sequences do not change the choice of the first version are kept.
+# The optimizations of the engine (move ordering, transposition table, evaluation) must not change these moves.
+RECORDED_MOVES = [
+    ([".c...c.c", "c.......", ".c.....c", "b.......", "........", "........", "........", "........"], True, "2,7->3,6", [".c...c.c", "c.......", ".c......", "b.....c.", "........", "........", "........", "........"]),
+    ([".c.c.c.c", "c.c.....", ".......c", "......c.", ".....c..", "b.b.c...", ".b.b.b.b", "b.b....."], True, "5,4->7,6", [".c.c.c.c", "c.c.....", ".......c", "......c.", ".....c..", "b.b.....", ".b.b...b", "b.b...C."]),
+    ([".c...c.c", "c.b.....", ".......c", "..c.....", ".b.....c", "C.......", ".......c", "....C..."], True, "0,1->2,3", [".....c.c", "c.......", "...c...c", "..c.....", ".b.....c", "C.......", ".......c", "....C..."]),
+    ([".....c.c", "c.......", ".b.c...c", "........", ".c.....c", "C.......", ".......c", "....C..."], True, "1,0->3,2", [".....c.c", "........", "...c...c", "..c.....", ".c.....c", "C.......", ".......c", "....C..."]),
+    ([".c.c.c..", "c.b.....", "...c...c", "....b.C.", "...c....", "C.c.....", ".....c..", "........"], True, "2,3->4,5", [".c.c.c..", "c.b.....", ".......c", "......C.", "...c.c..", "C.c.....", ".....c..", "........"]),
+    ([".c.c.c.c", "......b.", "...C....", "c.......", "........", "..c.....", ".b.....b", "........"], True, "5,2->7,0", [".c.c.c.c", "......b.", "...C....", "c.......", "........", "........", ".......b", "C......."]),
+    ([".c.c.c.c", "......b.", "...C....", "c.......", "........", "......b.", "........", "C......."], True, "0,7->2,5", [".c.c.c..", "........", "...C.c..", "c.......", "........", "......b.", "........", "C......."]),
+    ([".c.c.c..", "........", "...C.c..", "c.......", ".......b", "........", "........", "C......."], True, "7,0->6,1", [".c.c.c..", "........", "...C.c..", "c.......", ".......b", "........", ".C......", "........"]),
+    ([".c.....c", "c.c...b.", "...c....", "c.b.....", ".....c..", "......c.", "........", "C......."], True, "2,3->4,1", [".c.....c", "c.c...b.", "........", "c.......", ".c...c..", "......c.", "........", "C......."]),
+    ([".c.c.c.c", "c.......", ".c.....c", "..c.....", ".c.b...b", "b.......", ".b.b.b..", "b.b...b."], True, "3,2->5,4", [".c.c.c.c", "c.......", ".c.....c", "........", ".c.....b", "b...c...", ".b.b.b..", "b.b...b."]),
+    ([".c.c.c.c", "c.c.c.c.", ".c.c...c", "..b...c.", "........", "..b.b.b.", ".b.b.b.b", "b.b.b.b."], True, "2,3->4,1", [".c.c.c.c", "c.c.c.c.", ".c.....c", "......c.", ".c......", "..b.b.b.", ".b.b.b.b", "b.b.b.b."]),
+    ([".c.c.c.c", "c.c.....", ".....c.c", "b...c...", ".b.b...c", "c.....b.", ".b.....b", "b.b.C.b."], True, "4,7->6,5", [".c.c.c.c", "c.c.....", ".....c.c", "b...c...", ".b.b....", "c.......", ".b...c.b", "b.b.C.b."]),
+    ([".c...c.c", "c.c.....", ".c.b...c", "c.......", "...c....", "....b...", ".b...b.b", "b.....b."], True, "1,2->3,4", [".c...c.c", "c.......", ".c.....c", "c...c...", "...c....", "....b...", ".b...b.b", "b.....b."]),
+    ([".c.c.c.c", "c.c...c.", "...c...c", "c.....c.", ".....b..", "b.b...b.", "...b.b.b", "b.b.b.b."], True, "3,6->5,4", [".c.c.c.c", "c.c...c.", "...c...c", "c.......", "........", "b.b.c.b.", "...b.b.b", "b.b.b.b."]),
+    ([".c.c.c.c", "c.c...c.", ".......c", "c.......", ".....b.c", "c.b.b.b.", ".b.b...b", "..b.b.b."], True, "4,7->6,5", [".c.c.c.c", "c.c...c.", ".......c", "c.......", ".....b..", "c.b.b...", ".b.b.c.b", "..b.b.b."]),
+    ([".c...c.c", "c.......", ".c.....c", "..c.b...", ".b...c.c", "........", "...b...b", "b.b...C."], True, "3,2->5,0", [".c...c.c", "c.......", ".c.....c", "....b...", ".....c.c", "c.......", "...b...b", "b.b...C."]),
+    ([".c.c.c.c", "c.c.c...", "...c.c.c", "c.b.....", ".....b.c", "b.b.b.b.", ".b.....b", "b.b.b.b."], True, "4,7->6,5", [".c.c.c.c", "c.c.c...", "...c.c.c", "c.b.....", ".....b..", "b.b.b...", ".b...c.b", "b.b.b.b."]),
+    ([".c.c.c..", "c...c.c.", ".c.....c", "....b.c.", "...b.b.c", "......b.", ".b...b.b", "..C.C.b."], True, "7,2->5,0", [".c.c.c..", "c...c.c.", ".c.....c", "....b.c.", "...b.b.c", "C.....b.", ".....b.b", "....C.b."]),
+    ([".c.c.c..", "c...c...", ".c.....c", "..b.c...", "...b...c", "C.....b.", ".......b", "....C.b."], True, "3,4->5,2", [".c.c.c..", "c...c...", ".c.....c", "..b.....", ".......c", "C.c...b.", ".......b", "....C.b."]),
+    ([".c.c.c.c", "c.......", ".......c", "..b.....", ".c.....c", "....b...", ".b...b.b", "b.....b."], True, "4,1->5,0", [".c.c.c.c", "c.......", ".......c", "..b.....", ".......c", "c...b...", ".b...b.b", "b.....b."]),
+    ([".c...c.c", "c.......", ".c.....c", "b.......", "........", "........", "........", "........"], False, "2,7->3,6", [".c...c.c", "c.......", ".c......", "b.....c.", "........", "........", "........", "........"]),
+    ([".....c.c", "c.......", ".b.c...c", "........", ".c.....c", "C.......", ".......c", "....C..."], False, "1,0->3,2", [".....c.c", "........", "...c...c", "..c.....", ".c.....c", "C.......", ".......c", "....C..."]),
+    ([".c.c.c..", "........", "...C.c..", "c.......", ".......b", "........", "........", "C......."], False, "7,0->6,1", [".c.c.c..", "........", "...C.c..", "c.......", ".......b", "........", ".C......", "........"]),
+    ([".c.....c", "c.c...b.", "...c....", "c.b.....", ".....c..", "......c.", "........", "C......."], False, "2,3->4,1", [".c.....c", "c.c...b.", "........", "c.......", ".c...c..", "......c.", "........", "C......."]),
+    ([".c.c.c.c", "c.c.....", ".......c", "......c.", ".....c..", "b.b.c...", ".b.b.b.b", "b.b....."], False, "5,4->7,6", [".c.c.c.c", "c.c.....", ".......c", "......c.", ".....c..", "b.b.....", ".b.b...b", "b.b...C."]),
+    ([".c...c.c", "c.......", ".c.....c", "..c.b...", ".b...c.c", "........", "...b...b", "b.b...C."], False, "3,2->5,0", [".c...c.c", "c.......", ".c.....c", "....b...", ".....c.c", "c.......", "...b...b", "b.b...C."]),
+    ([".c.c.c..", "c...c.c.", ".c.c...c", "..b...c.", "...b.b.c", "..c.b.b.", ".b.b.b.b", "b.....b."], False, "5,2->7,4", [".c.c.c..", "c...c.c.", ".c.c...c", "..b...c.", "...b.b.c", "....b.b.", ".b...b.b", "b...C.b."]),
+    ([".c.c.c..", "c...c.c.", ".c.....c", "....b.c.", "...b.b.c", "......b.", ".b...b.b", "..C.C.b."], False, "7,2->5,0", [".c.c.c..", "c...c.c.", ".c.....c", "....b.c.", "...b.b.c", "C.....b.", ".....b.b", "....C.b."]),
+    ([".c.c.c..", "c...c...", ".c.....c", "..b.c...", "...b...c", "C.....b.", ".......b", "....C.b."], False, "3,4->5,2", [".c.c.c..", "c...c...", ".c.....c", "..b.....", ".......c", "C.c...b.", ".......b", "....C.b."]),
+    ([".c.c.c.c", "........", ".c.c.c..", "c.b.c.c.", ".b.....b", "..b...b.", ".b.....b", "b.b.b..."], False, "2,1->4,3", [".c.c.c.c", "........", "...c.c..", "c...c.c.", ".b.c...b", "..b...b.", ".b.....b", "b.b.b..."]),
+    ([".c.c.c.c", "c.......", ".......c", "..b.....", ".c.....c", "....b...", ".b...b.b", "b.....b."], False, "4,1->5,0", [".c.c.c.c", "c.......", ".......c", "..b.....", ".......c", "c...b...", ".b...b.b", "b.....b."]),
+    ([".c.c.c.c", "c.c.c...", "...c...c", "c...c...", ".......b", "b.b.b...", ".b...b.b", "b.b.b.b."], False, "1,2->2,1", [".c.c.c.c", "c...c...", ".c.c...c", "c...c...", ".......b", "b.b.b...", ".b...b.b", "b.b.b.b."]),
+    ([".c.c.c.c", "c.c.....", ".c...c.c", "........", ".c.b....", "......b.", "...b.b.b", "b.b.b.b."], False, "4,1->5,0", [".c.c.c.c", "c.c.....", ".c...c.c", "........", "...b....", "c.....b.", "...b.b.b", "b.b.b.b."]),
+    ([".c.c.c.c", "c.c...c.", "...c....", "..c.c.b.", ".b.....c", "b.c.b.b.", ".b...b.b", "..b.b.b."], False, "3,4->4,3", [".c.c.c.c", "c.c...c.", "...c....", "..c...b.", ".b.c...c", "b.c.b.b.", ".b...b.b", "..b.b.b."]),
+    ([".c.c.c.c", "c.c.c...", "...c.c.c", "........", ".b...b.c", "b.b.....", "...b.c.b", "b.b.b.b."], False, "1,2->2,1", [".c.c.c.c", "c...c...", ".c.c.c.c", "........", ".b...b.c", "b.b.....", "...b.c.b", "b.b.b.b."]),
+    ([".c.c.c.c", "c.......", ".......c", "c.b.....", ".c.....c", "b.c...c.", ".b...b.b", "b...b..."], False, "5,2->6,3", [".c.c.c.c", "c.......", ".......c", "c.b.....", ".c.....c", "b.....c.", ".b.c.b.b", "b...b..."]),
+    ([".c.c.c.c", "c.c.c.c.", ".c.c...c", "........", ".b...b..", "b.....b.", ".b...b.b", "b.b.b.b."], False, "2,1->3,0", [".c.c.c.c", "c.c.c.c.", "...c...c", "c.......", ".b...b..", "b.....b.", ".b...b.b", "b.b.b.b."]),
+    ([".c...c.c", "c.c.....", "...c...c", "c.c.b...", ".b.....c", "b.....C.", ".b.....c", "b.....b."], False, "2,3->4,5", [".c...c.c", "c.c.....", ".......c", "c.c.....", ".b...c.c", "b.....C.", ".b.....c", "b.....b."]),
+    ([".c.c.c.c", "c.c.....", ".....c.c", "b...c...", ".b.b....", "c.b.....", ".....c.b", "b.b.C.b."], False, "1,2->2,3", [".c.c.c.c", "c.......", "...c.c.c", "b...c...", ".b.b....", "c.b.....", ".....c.b", "b.b.C.b."]),
+    ([".c.c.c.c", "c...c...", "...c...c", "c.c.....", ".b...b.c", "b...b.b.", ".....b..", "b.b.C.b."], False, "3,0->5,2", [".c.c.c.c", "c...c...", "...c...c", "..c.....", ".....b.c", "b.c.b.b.", ".....b..", "b.b.C.b."]),
+]
+
+
+class SilentObserver:
+    """
+    observer of checkers.Checkers without view and audio
+    """
+    def notifyObserverViewCheckers(self, newScore=None, message=None):
+        pass
+
+    def playAudio(self, *args):
+        pass
+
+    def doAudio(self, *args):
+        pass
+
+
+def to_matrix(rows):
+    """
+    convert a gameboard of the suite to the string array of checkers.py
+    :param: rows: 8 strings of 8 characters
+
+    :return: 8x8 list of strings ("cxy", "Cxy", "bxy", "Bxy" or "---")
+    """
+    return [["---" if rows[i][j] == "." else rows[i][j] + str(i) + str(j) for j in range(8)] for i in range(8)]
+
+
+def reference_captures(matrix, start, square, king, directions, captured, queen_row, opponent, sequences):
+    """
+    add the complete capture sequences of a piece from a field to the set sequences. The captured pieces stay on
+    the gameboard until the end of the move (they cannot be jumped twice) and a man that becomes king ends the move.
+    :param: matrix: string array of the gameboard (not modified)
+    :param: start: (i, j) start position of the piece
+    :param: square: (i, j) current position of the piece
+    :param: king: True if the piece is a king
+    :param: directions: (di, dj) directions of the piece
+    :param: captured: frozenset of the (i, j) captured pieces
+    :param: queen_row: row where a man becomes king
+    :param: opponent: letters of the pieces of the other side
+    :param: sequences: set of (start, end, captured)
+
+    :return: None
+    """
+    i, j = square
+    continued = False
+    for di, dj in directions:
+        via_i, via_j, new_i, new_j = i + di, j + dj, i + 2 * di, j + 2 * dj
+        if not (0 <= new_i <= 7 and 0 <= new_j <= 7):
+            continue
+        if matrix[via_i][via_j][0] not in opponent or (via_i, via_j) in captured:
+            continue
+        if matrix[new_i][new_j] != "---" and (new_i, new_j) != start: # the moving piece has left its start field
+            continue
+        continued = True
+        if not king and new_i == queen_row:
+            sequences.add((start, (new_i, new_j), captured | {(via_i, via_j)}))
+        else:
+            reference_captures(matrix, start, (new_i, new_j), king, directions, captured | {(via_i, via_j)}, queen_row, opponent, sequences)
+    if not continued and captured:
+        sequences.add((start, square, captured))
+
+
+def reference_moves(matrix, mandatory_jumping, computer):
+    """
+    reference move generator on the string array, independent of the engine: the rules of check_moves() and
+    check_jumps() of the first version of checkers.py, with complete capture sequences
+    :param: matrix: string array of the gameboard
+    :param: mandatory_jumping: option to use mandatory jump or not for both player
+    :param: computer: True if the computer is to move, False for the player
+
+    :return: list of (start, end, captured): the jumps, and the moves if no jump is mandatory
+    """
+    man, king = ("c", "C") if computer else ("b", "B")
+    opponent = "bB" if computer else "cC"
+    forward = 1 if computer else -1 # the computer moves down, the player moves up
+    queen_row = 7 if computer else 0
+    jumps = set()
+    moves = []
+    for i in range(8):
+        for j in range(8):
+            letter = matrix[i][j][0]
+            if letter != man and letter != king:
+                continue
+            directions = [(forward, -1), (forward, 1)]
+            if letter == king:
+                directions += [(-forward, -1), (-forward, 1)]
+            for di, dj in directions:
+                if 0 <= i + di <= 7 and 0 <= j + dj <= 7 and matrix[i + di][j + dj] == "---":
+                    moves.append(((i, j), (i + di, j + dj), frozenset()))
+            reference_captures(matrix, (i, j), (i, j), letter == king, directions, frozenset(), queen_row, opponent, jumps)
+    if mandatory_jumping and jumps:
+        return list(jumps)
+    return list(jumps) + moves
+
+
+def reference_make_move(matrix, move, computer):
+    """
+    :param: matrix: string array of the gameboard
+    :param: move: (start, end, captured) of reference_moves()
+    :param: computer: True if the computer is to move, False for the player
+
+    :return: string array after the move (new list)
+    """
+    (old_i, old_j), (new_i, new_j), captured = move
+    child = [row[:] for row in matrix]
+    letter = child[old_i][old_j][0]
+    for i, j in captured:
+        child[i][j] = "---"
+    if new_i == (7 if computer else 0):
+        letter = letter.upper()
+    child[old_i][old_j] = "---"
+    child[new_i][new_j] = letter + str(new_i) + str(new_j)
+    return child
+
+
+def perft(matrix, depth, mandatory_jumping, computer):
+    """
+    count the leaf nodes at the given depth with the reference generator on the string array
+    :param: matrix: string array of the gameboard
+    :param: depth: number of plies
+    :param: mandatory_jumping: option to use mandatory jump or not for both player
+    :param: computer: True if the computer is to move, False for the player
+
+    :return: number of leaf nodes
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in reference_moves(matrix, mandatory_jumping, computer):
+        nodes += perft(reference_make_move(matrix, move, computer), depth - 1, mandatory_jumping, not computer)
+    return nodes
+
+
+def perft_bitboard(board, depth, mandatory_jumping, computer):
+    """
+    count the leaf nodes at the given depth on the bitboard (see perft())
+    :param: board: Bitboard
+    :param: depth: number of plies
+    :param: mandatory_jumping: option to use mandatory jump or not for both player
+    :param: computer: True if the computer is to move, False for the player
+
+    :return: number of leaf nodes
+    """
+    if depth == 0:
+        return 1
+    nodes = 0
+    for move in checkersBitboard.generate_moves(board, computer, mandatory_jumping):
+        undo = checkersBitboard.apply_move(board, move, computer)
+        nodes += perft_bitboard(board, depth - 1, mandatory_jumping, not computer)
+        checkersBitboard.undo_move(board, undo, computer)
+    return nodes
+
+
+def run_perft(depth):
+    """
+    perft of the start gameboard (the player is to move) and of the mid-game suite (the computer is to move)
+    :param: depth: number of plies
+
+    :return: list of results (dict)
+    """
+    positions = [("start", START, False)] + [(name, rows, True) for name, rows in MIDGAME_SUITE.items()]
+    results = []
+    for name, rows, computer in positions:
+        for mandatory_jumping in (True, False):
+            matrix = to_matrix(rows)
+            started = time.perf_counter()
+            nodes = perft(matrix, depth, mandatory_jumping, computer)
+            seconds = time.perf_counter() - started
+            started = time.perf_counter()
+            nodes_bitboard = perft_bitboard(checkersBitboard.from_matrix(matrix), depth, mandatory_jumping, computer)
+            seconds_bitboard = time.perf_counter() - started
+            pinned = PERFT_COUNTS[name][mandatory_jumping][depth - 1] if 1 <= depth <= PERFT_MAX_DEPTH else None
+            results.append({
+                "position": name, "mandatory_jumping": mandatory_jumping, "depth": depth,
+                "nodes": nodes, "seconds": round(seconds, 4), "nodes_per_second": round(nodes / max(seconds, 1e-9)),
+                "nodes_bitboard": nodes_bitboard, "seconds_bitboard": round(seconds_bitboard, 4),
+                "nodes_per_second_bitboard": round(nodes_bitboard / max(seconds_bitboard, 1e-9)),
+                "pinned": pinned, "identical": nodes == nodes_bitboard and pinned in (None, nodes)})
+    return results
+
+
+def to_rows(matrix):
+    """
+    convert the string array of checkers.py to a gameboard of the suite
+    :param: matrix: 8x8 list of strings ("cxy", "Cxy", "bxy", "Bxy" or "---")
+
+    :return: 8 strings of 8 characters
+    """
+    return ["".join("." if field == "---" else field[0] for field in row) for row in matrix]
+
+
+def new_game(rows, mandatory_jumping, depth):
+    """
+    Checkers with a new search engine (empty transposition table) that searches with a fixed depth,
+    without opening book, endgame database, pondering and noise
+    :param: rows: gameboard of the suite, the computer is to move
+    :param: mandatory_jumping: option to use mandatory jump or not for both player
+    :param: depth: search depth
+
+    :return: checkers.Checkers
+    """
+    game = checkers.Checkers(SilentObserver(), np.array(to_matrix(rows)))
+    game.mandatory_jumping = mandatory_jumping
+    game.think_ms = 0
+    game.search_depth = depth
+    game.max_nodes = 0
+    game.noise = 0
+    game.ponderer = None
+    game.opening_book = checkers.checkersBook.OpeningBook(path="")
+    game.endgame_database = checkers.checkersBook.EndgameDatabase(path="")
+    return game
+
+
+def run_moves():
+    """
+    Checkers.evaluate_states() with the fixed depth CHECKERS_SEARCH_DEPTH on the recorded gameboards RECORDED_MOVES
+
+    :return: list of results (dict)
+    """
+    results = []
+    for index, (rows, mandatory_jumping, recorded_move, recorded_rows) in enumerate(RECORDED_MOVES):
+        game = new_game(rows, mandatory_jumping, CHECKERS_SEARCH_DEPTH)
+        move = game.evaluate_states()
+        move = None if move is None else "{},{}->{},{}".format(*move)
+        results.append({
+            "position": index, "mandatory_jumping": mandatory_jumping, "move": move, "recorded_move": recorded_move,
+            "identical": move == recorded_move and to_rows(game.matrix) == recorded_rows})
+    return results
+
+
+def run_search(depth):
+    """
+    Checkers.evaluate_states() with a fixed depth on the mid-game suite. Every gameboard is searched by a new
+    Checkers (empty transposition table), without opening book, endgame database and pondering.
+    :param: depth: search depth
+
+    :return: list of results (dict)
+    """
+    results = []
+    for name, rows in MIDGAME_SUITE.items():
+        for mandatory_jumping in (True, False):
+            game = new_game(rows, mandatory_jumping, depth)
+            started = time.perf_counter()
+            move = game.evaluate_states()
+            seconds = time.perf_counter() - started
+            nodes = game.engine.nodes
+            results.append({
+                "position": name, "mandatory_jumping": mandatory_jumping, "depth": depth,
+                "move": None if move is None else "{},{}->{},{}".format(*move),
+                "nodes": nodes, "seconds": round(seconds, 4), "nodes_per_second": round(nodes / max(seconds, 1e-9))})
+    return results
+
+
+def main():
+    parser = ArgumentParser(description="perft and search benchmark of the checkers engine")
+    parser.add_argument("--perft-depth", type=int, default=5, help="depth of the perft")
+    parser.add_argument("--depth", type=int, default=6, help="fixed search depth of evaluate_states()")
+    parser.add_argument("--output", default=None, help="JSON file of the result (default: standard output)")
+    args = parser.parse_args()
+
+    perft_results = run_perft(args.perft_depth)
+    move_results = run_moves()
+    search_results = run_search(args.depth)
+    search_seconds = sum(result["seconds"] for result in search_results)
+    search_nodes = sum(result["nodes"] for result in search_results)
+    report = {
+        "perft": perft_results,
+        "moves": move_results,
+        "search": search_results,
+        "summary": {
+            "perft_identical": all(result["identical"] for result in perft_results),
+            "moves_identical": all(result["identical"] for result in move_results),
+            "search_nodes": search_nodes,
+            "search_seconds": round(search_seconds, 4),
+            "search_nodes_per_second": round(search_nodes / max(search_seconds, 1e-9)),
+            "seconds_per_move": round(search_seconds / len(search_results), 4)}}
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text)
+    else:
+        print(text)
+    return 0 if report["summary"]["perft_identical"] and report["summary"]["moves_identical"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
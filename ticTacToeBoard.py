@@ -0,0 +1,328 @@
+"""
+bitmask representation of the tic-tac-toe gameboard and of its variants: N x N gameboards with k in a row
+(e.g. 4x4 with 4 in a row, 5x5 with 4 in a row, gomoku-style gameboards).
+
+The fields are numbered row by row, field (row, column) is the bit row * size + column:
+
+    3x3:   0 | 1 | 2
+           3 | 4 | 5
+           6 | 7 | 8
+
+The marks of every side are stored in an integer mask. All the rows, columns and diagonals of k fields
+are precomputed as line masks: a side has won if one of the line masks is in its mask. After a move,
+only the lines through the field of the move are checked.
+
+The Solver finds the best move by negamax with alpha-beta pruning and a memo of the solved gameboards.
+The small gameboards are solved completely, the larger ones are searched to a maximum depth and rated
+by the open lines of both sides.
+
+    python ticTacToeBoard.py --size 4 --k 4    # solve the empty gameboard of a variant
+"""
+
+import time
+from functools import lru_cache
+from argparse import ArgumentParser
+
+WIN = 1000 # value of a won gameboard for the side to move, plus the number of free fields (the earlier the better): a win has a value >= WIN
+
+# flags of the values of the memo
+EXACT = 0
+LOWER = 1 # value >= stored value (beta cutoff)
+UPPER = 2 # value <= stored value (no move raised alpha)
+
+
+@lru_cache(maxsize=None)
+def line_masks(size, k):
+    """
+    :param: size: number of rows and columns of the gameboard
+    :param: k: number of marks in a row to win
+
+    :return: tuple of the masks of all the rows, columns and diagonals of k fields
+    """
+    lines = []
+    for row in range(size):
+        for column in range(size):
+            for d_row, d_column in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                end_row = row + d_row * (k - 1)
+                end_column = column + d_column * (k - 1)
+                if end_row >= size or not 0 <= end_column < size:
+                    continue
+                mask = 0
+                for i in range(k):
+                    mask |= 1 << ((row + d_row * i) * size + column + d_column * i)
+                lines.append(mask)
+    return tuple(lines)
+
+
+@lru_cache(maxsize=None)
+def field_lines(size, k):
+    """
+    :param: size: number of rows and columns of the gameboard
+    :param: k: number of marks in a row to win
+
+    :return: tuple with the line masks through every field
+    """
+    lines = line_masks(size, k)
+    return tuple(tuple(line for line in lines if line >> field & 1) for field in range(size * size))
+
+
+@lru_cache(maxsize=None)
+def move_order(size, k):
+    """
+    :param: size: number of rows and columns of the gameboard
+    :param: k: number of marks in a row to win
+
+    :return: fields sorted by the number of lines through them and by the distance to the center (the center first)
+    """
+    lines = field_lines(size, k)
+    center = (size - 1) / 2
+    return tuple(sorted(range(size * size), key=lambda field: (-len(lines[field]), abs(field // size - center) + abs(field % size - center))))
+
+
+def mask_of(fields, symbol):
+    """
+    :param: fields: array of the fields of the gameboard (e.g. ' ', 'X' or 'O'), row by row
+    :param: symbol: symbol of the side
+
+    :return: mask of the fields with the symbol
+    """
+    mask = 0
+    for i, field in enumerate(fields):
+        if field == symbol:
+            mask |= 1 << i
+    return mask
+
+
+def is_winner(mask, lines):
+    """
+    :param: mask: mask of the marks of a side
+    :param: lines: line masks of the gameboard (line_masks())
+
+    :return: True if one of the lines is in the mask
+    """
+    for line in lines:
+        if mask & line == line:
+            return True
+    return False
+
+
+def popcount(mask):
+    """
+    :param: mask: integer mask
+
+    :return: number of bits of the mask
+    """
+    return bin(mask).count("1")
+
+
+class Board:
+    """
+    N x N gameboard with k in a row
+    :param: size: number of rows and columns
+    :param: k: number of marks in a row to win (default: size)
+    :param: first: mask of the marks of the side that plays first (X)
+    :param: second: mask of the marks of the other side (O)
+    """
+    __slots__ = ("size", "k", "full", "lines", "field_lines", "masks")
+
+    def __init__(self, size=3, k=None, first=0, second=0):
+        self.size = size
+        self.k = k or size
+        if not 1 <= self.k <= size:
+            raise ValueError("k = {} is not possible on a {}x{} gameboard".format(self.k, size, size))
+        self.full = (1 << size * size) - 1
+        self.lines = line_masks(size, self.k)
+        self.field_lines = field_lines(size, self.k)
+        self.masks = [first, second]
+
+    @classmethod
+    def from_fields(cls, fields, k=None, symbols=("X", "O")):
+        """
+        :param: fields: array of the size * size fields, row by row (e.g. ' ', 'X' or 'O')
+        :param: k: number of marks in a row to win (default: size)
+        :param: symbols: symbols of the side that plays first and of the other side
+
+        :return: Board of the array
+        """
+        size = int(round(len(fields) ** 0.5))
+        if size * size != len(fields):
+            raise ValueError("{} fields are not a square gameboard".format(len(fields)))
+        return cls(size, k, mask_of(fields, symbols[0]), mask_of(fields, symbols[1]))
+
+    def to_move(self):
+        """
+        :return: 0 if the first side is to move, 1 otherwise
+        """
+        return 0 if popcount(self.masks[0]) == popcount(self.masks[1]) else 1
+
+    def free(self):
+        """
+        :return: mask of the free fields
+        """
+        return self.full & ~(self.masks[0] | self.masks[1])
+
+    def is_full(self):
+        """
+        :return: True if no field is free
+        """
+        return self.masks[0] | self.masks[1] == self.full
+
+    def is_winner(self, side):
+        """
+        :param: side: 0 (first side) or 1
+
+        :return: True if the side has k marks in a row
+        """
+        return is_winner(self.masks[side], self.lines)
+
+    def wins_by(self, side, field):
+        """
+        check only the lines through the field of the last move of the side
+        :param: side: 0 (first side) or 1
+        :param: field: field of the last move
+
+        :return: True if the move has won the game
+        """
+        return is_winner(self.masks[side], self.field_lines[field])
+
+    def play(self, side, field):
+        """
+        :param: side: 0 (first side) or 1
+        :param: field: free field
+
+        :return: None
+        """
+        self.masks[side] |= 1 << field
+
+    def undo(self, side, field):
+        """
+        :param: side: 0 (first side) or 1
+        :param: field: field of the move to undo
+
+        :return: None
+        """
+        self.masks[side] &= ~(1 << field)
+
+
+class Solver:
+    """
+    negamax search with alpha-beta pruning and memo of the gameboards of an N x N gameboard with k in a row
+    :param: size: number of rows and columns
+    :param: k: number of marks in a row to win (default: size)
+    :param: max_depth: maximum number of plies of the search, None to solve the gameboards completely
+    """
+    def __init__(self, size=3, k=None, max_depth=None):
+        self.size = size
+        self.k = k or size
+        self.full = (1 << size * size) - 1
+        self.lines = line_masks(size, self.k)
+        self.field_lines = field_lines(size, self.k)
+        self.order = move_order(size, self.k)
+        self.max_depth = max_depth
+        self.memo = {} # (mask of the side to move, mask of the other side) -> (depth, flag, value, best field)
+        self.nodes = 0 # number of searched gameboards of the last search
+
+    def best_move(self, board):
+        """
+        :param: board: Board of the same size and k
+
+        :return: (field, value) best move of the side to move and its value
+                 (>= WIN won, <= -WIN lost, otherwise a draw or the rating of the open lines), (None, value) if the game is over
+        """
+        side = board.to_move()
+        me, opponent = board.masks[side], board.masks[1 - side]
+        if is_winner(opponent, self.lines): # the last move has won the game
+            return None, -(WIN + popcount(self.full & ~(me | opponent)))
+        self.nodes = 0
+        depth = self.max_depth if self.max_depth is not None else self.size * self.size
+        value = self.negamax(me, opponent, depth, -2 * WIN - self.full.bit_length(), 2 * WIN + self.full.bit_length())
+        entry = self.memo.get((me, opponent))
+        return (entry[3] if entry else None), value
+
+    def negamax(self, me, opponent, depth, alpha, beta):
+        """
+        :param: me: mask of the side to move
+        :param: opponent: mask of the other side (the last move has not won the game)
+        :param: depth: remaining plies
+        :param: alpha: lower bound of the value
+        :param: beta: upper bound of the value
+
+        :return: value of the gameboard for the side to move
+        """
+        self.nodes += 1
+        free = self.full & ~(me | opponent)
+        if not free:
+            return 0 # draw
+        if depth == 0:
+            return self.evaluate(me, opponent)
+        key = (me, opponent)
+        entry = self.memo.get(key)
+        best = None
+        if entry is not None:
+            stored_depth, flag, value, best = entry
+            if stored_depth >= depth or abs(value) >= WIN: # won and lost values do not depend on the depth
+                if flag == EXACT:
+                    return value
+                if flag == LOWER and value >= beta:
+                    return value
+                if flag == UPPER and value <= alpha:
+                    return value
+        alpha_start = alpha
+        fields = self.order if best is None else (best,) + self.order # the best move of the memo first
+        value = -2 * WIN - self.full.bit_length()
+        best_field = None
+        for field in fields:
+            bit = 1 << field
+            if not free & bit or (field == best and best_field is not None):
+                continue
+            mask = me | bit
+            if is_winner(mask, self.field_lines[field]):
+                score = WIN + popcount(free & ~bit) # won by this move
+            else:
+                score = -self.negamax(opponent, mask, depth - 1, -beta, -alpha)
+            if score > value:
+                value = score
+                best_field = field
+            if value > alpha:
+                alpha = value
+            if alpha >= beta:
+                break
+        if value <= alpha_start:
+            flag = UPPER
+        elif value >= beta:
+            flag = LOWER
+        else:
+            flag = EXACT
+        self.memo[key] = (depth, flag, value, best_field)
+        return value
+
+    def evaluate(self, me, opponent):
+        """
+        rating of a gameboard at the maximum depth: lines without marks of the other side,
+        the more marks the better (4 ** marks)
+        :param: me: mask of the side to move
+        :param: opponent: mask of the other side
+
+        :return: rating for the side to move, strictly between -WIN and WIN
+        """
+        score = 0
+        for line in self.lines:
+            if not line & opponent:
+                score += 4 ** popcount(line & me) - 1
+            elif not line & me:
+                score -= 4 ** popcount(line & opponent) - 1
+        return max(-WIN + 1, min(WIN - 1, score))
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="solve the empty gameboard of a tic-tac-toe variant")
+    parser.add_argument("--size", type=int, default=3, help="number of rows and columns")
+    parser.add_argument("--k", type=int, default=None, help="number of marks in a row to win (default: size)")
+    parser.add_argument("--depth", type=int, default=None, help="maximum depth of the search (default: solve completely)")
+    args = parser.parse_args()
+    solver = Solver(args.size, args.k, args.depth)
+    start = time.perf_counter()
+    field, value = solver.best_move(Board(args.size, args.k))
+    result = "won" if value >= WIN else "lost" if value <= -WIN else "draw" if args.depth is None else "rating {}".format(value)
+    print("{}x{}, {} in a row: best move {} ({}), {} gameboards searched, {} in the memo, {:.2f} s".format(
+        args.size, args.size, solver.k, field, result, solver.nodes, len(solver.memo), time.perf_counter() - start))
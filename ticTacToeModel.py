@@ -0,0 +1,396 @@
+"""
+runtimes of the trained model that classifies the fields of the tic-tac-toe gameboard (empty, X or O).
+
+The model is a small convolutional network (models-training/Keras_Training_Tic_Tac_Toe.ipynb) saved by Keras
+in MODEL_TIC_TAC_TOE. Importing TensorFlow only to classify 32x32 images dominates the start time and the memory
+of the app, so the model is run by a lighter runtime, selected by MODEL_TIC_TAC_TOE_RUNTIME:
+
+    "numpy"  : forward pass of the layers with NumPy, weights of MODEL_TIC_TAC_TOE_NUMPY (default, the file is
+               in the repository; read from MODEL_TIC_TAC_TOE with h5py if the file has not been exported)
+    "onnx"   : onnxruntime with MODEL_TIC_TAC_TOE_ONNX
+    "tflite" : tflite-runtime (or tensorflow.lite) with MODEL_TIC_TAC_TOE_TFLITE
+    "keras"  : the Keras model of MODEL_TIC_TAC_TOE (imports TensorFlow), also the fallback if the selected
+               runtime is not installed or its model has not been exported
+
+The exported files are created once from the Keras model:
+
+    python ticTacToeModel.py --numpy    # MODEL_TIC_TAC_TOE_NUMPY (needs only h5py)
+    python ticTacToeModel.py --onnx     # MODEL_TIC_TAC_TOE_ONNX (needs tensorflow and tf2onnx)
+    python ticTacToeModel.py --tflite   # MODEL_TIC_TAC_TOE_TFLITE (needs tensorflow)
+
+Before a lighter runtime is selected, its outputs must be compared with the Keras model on the shipped model:
+
+    python ticTacToeModel.py --check    # parity of every available runtime with Keras (needs tensorflow)
+
+The exported weights of the numpy runtime give the same classes as Keras on the shipped model
+(maximum difference of the probabilities below 1e-6).
+
+All the runtimes are called like the Keras model: model(batch) with a batch (n, 32, 32, 1) of float32 images
+scaled to [0, 1] returns the (n, 3) probabilities of the classes.
+"""
+
+import os
+import json
+from abc import ABC, abstractmethod
+from argparse import ArgumentParser
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from config import *
+
+
+class ClassifierModel(ABC):
+    """
+    base class of the runtimes
+    """
+    def __call__(self, batch, training=False):
+        """
+        :param: batch: float32 images (n, 32, 32, 1) scaled to [0, 1]
+        :param: training: not used (same signature as a Keras model)
+
+        :return: probabilities of the classes (n, 3)
+        """
+        return self.run(np.ascontiguousarray(batch, dtype=np.float32))
+
+    def predict(self, batch):
+        """
+        same as Keras Model.predict()
+        :param: batch: float32 images (n, 32, 32, 1) scaled to [0, 1]
+
+        :return: probabilities of the classes (n, 3)
+        """
+        return self(batch)
+
+    @abstractmethod
+    def run(self, batch):
+        """
+        :param: batch: contiguous float32 images (n, 32, 32, 1) scaled to [0, 1]
+
+        :return: probabilities of the classes (n, 3)
+        """
+
+
+class KerasModel(ClassifierModel):
+    """
+    the Keras model (imports TensorFlow)
+    :param: path: path of the Keras model (.h5)
+    """
+    def __init__(self, path=MODEL_TIC_TAC_TOE):
+        from keras.models import load_model
+        self.model = load_model(path)
+
+    def run(self, batch):
+        return np.asarray(self.model(batch, training=False))
+
+
+class OnnxModel(ClassifierModel):
+    """
+    the model exported to ONNX, run by onnxruntime
+    :param: path: path of the ONNX model
+    """
+    def __init__(self, path=MODEL_TIC_TAC_TOE_ONNX):
+        import onnxruntime
+        self.session = onnxruntime.InferenceSession(path, providers=["CPUExecutionProvider"])
+        self.input_name = self.session.get_inputs()[0].name
+
+    def run(self, batch):
+        return self.session.run(None, {self.input_name: batch})[0]
+
+
+class TFLiteModel(ClassifierModel):
+    """
+    the model exported to TensorFlow Lite, run by tflite-runtime (or tensorflow.lite if tflite-runtime is not installed)
+    :param: path: path of the TensorFlow Lite model
+    """
+    def __init__(self, path=MODEL_TIC_TAC_TOE_TFLITE):
+        try:
+            from tflite_runtime.interpreter import Interpreter
+        except ImportError:
+            from tensorflow.lite import Interpreter
+        self.interpreter = Interpreter(model_path=path)
+        self.input_index = self.interpreter.get_input_details()[0]["index"]
+        self.output_index = self.interpreter.get_output_details()[0]["index"]
+        self.batch_size = None # batch size of the allocated tensors
+
+    def run(self, batch):
+        if batch.shape[0] != self.batch_size: # the tensors are allocated again only if the batch size changes
+            self.interpreter.resize_tensor_input(self.input_index, batch.shape)
+            self.interpreter.allocate_tensors()
+            self.batch_size = batch.shape[0]
+        self.interpreter.set_tensor(self.input_index, batch)
+        self.interpreter.invoke()
+        return self.interpreter.get_tensor(self.output_index)
+
+
+def activation(x, name):
+    """
+    :param: x: input of the activation
+    :param: name: name of the Keras activation
+
+    :return: output of the activation
+    """
+    if name == "linear":
+        return x
+    if name == "relu":
+        return np.maximum(x, 0)
+    if name == "softmax":
+        e = np.exp(x - x.max(axis=-1, keepdims=True))
+        return e / e.sum(axis=-1, keepdims=True)
+    if name == "sigmoid":
+        return 1 / (1 + np.exp(-x))
+    if name == "tanh":
+        return np.tanh(x)
+    raise ValueError("activation {} is not supported by the numpy runtime".format(name))
+
+
+def pad_same(x, window, strides):
+    """
+    zero padding of the images like padding "same" of TensorFlow
+    :param: x: images (n, height, width, channels)
+    :param: window: (height, width) of the kernel or the pool
+    :param: strides: (height, width) of the strides
+
+    :return: padded images
+    """
+    pads = [(0, 0)]
+    for size, k, s in zip(x.shape[1:3], window, strides):
+        total = max((-(-size // s) - 1) * s + k - size, 0)
+        pads.append((total // 2, total - total // 2))
+    pads.append((0, 0))
+    return np.pad(x, pads)
+
+
+def windows(x, window, strides, padding):
+    """
+    :param: x: images (n, height, width, channels)
+    :param: window: (height, width) of the kernel or the pool
+    :param: strides: (height, width) of the strides
+    :param: padding: "same" or "valid"
+
+    :return: view of the windows (n, out_height, out_width, channels, window_height, window_width)
+    """
+    if padding == "same":
+        x = pad_same(x, window, strides)
+    return sliding_window_view(x, window, axis=(1, 2))[:, ::strides[0], ::strides[1]]
+
+
+class NumpyModel(ClassifierModel):
+    """
+    forward pass of the Keras layers with NumPy (no other package is needed)
+    :param: path: weights exported by export_numpy() (.npz), or the Keras model (.h5) read with h5py
+    """
+    def __init__(self, path=MODEL_TIC_TAC_TOE_NUMPY):
+        if path.endswith(".h5"):
+            self.layers, self.weights = read_keras_h5(path)
+        else:
+            with np.load(path) as data:
+                self.layers = json.loads(str(data["layers"]))
+                self.weights = [[data["w{}_{}".format(i, k)] for k in range(int(data["count{}".format(i)]))] for i in range(len(self.layers))]
+
+    def run(self, x):
+        for (name, config), weights in zip(self.layers, self.weights):
+            if name == "Conv2D":
+                if config.get("data_format", "channels_last") != "channels_last" or tuple(config.get("dilation_rate", (1, 1))) != (1, 1):
+                    raise ValueError("layer {} is not supported by the numpy runtime".format(config["name"]))
+                kernel = weights[0] # (height, width, channels, filters)
+                view = windows(x, kernel.shape[:2], config["strides"], config["padding"])
+                x = np.tensordot(view, kernel, axes=((3, 4, 5), (2, 0, 1)))
+                if config.get("use_bias", True):
+                    x += weights[1]
+                x = activation(x, config["activation"])
+            elif name == "Dense":
+                x = x @ weights[0]
+                if config.get("use_bias", True):
+                    x += weights[1]
+                x = activation(x, config["activation"])
+            elif name == "MaxPooling2D":
+                pool = config["pool_size"]
+                x = windows(x, pool, config.get("strides") or pool, config["padding"]).max(axis=(4, 5))
+            elif name == "AveragePooling2D":
+                pool = config["pool_size"]
+                x = windows(x, pool, config.get("strides") or pool, config["padding"]).mean(axis=(4, 5))
+            elif name == "Activation":
+                x = activation(x, config["activation"])
+            elif name == "Flatten":
+                x = x.reshape(x.shape[0], -1) # channels_last: same order as Keras
+            elif name == "BatchNormalization":
+                weights = list(weights)
+                gamma = weights.pop(0) if config.get("scale", True) else 1.0
+                beta = weights.pop(0) if config.get("center", True) else 0.0
+                mean, variance = weights
+                x = (x - mean) / np.sqrt(variance + config["epsilon"]) * gamma + beta
+            elif name in ("Dropout", "InputLayer"): # no effect on the inference
+                continue
+            else:
+                raise ValueError("layer {} is not supported by the numpy runtime".format(name))
+        return x
+
+
+def read_keras_h5(path=MODEL_TIC_TAC_TOE):
+    """
+    read the layers and the weights of a Sequential Keras model (.h5) with h5py, without TensorFlow
+    :param: path: path of the Keras model
+
+    :return: list of (class name, config) of the layers, list of the weights of every layer
+    """
+    import h5py
+    with h5py.File(path, "r") as file:
+        model_config = file.attrs["model_config"]
+        model_config = json.loads(model_config.decode() if isinstance(model_config, bytes) else model_config)
+        config = model_config["config"]
+        layers = config["layers"] if isinstance(config, dict) else config # Keras < 2.2.3: list of the layers
+        group = file["model_weights"] if "model_weights" in file else file
+        result = []
+        weights = []
+        for layer in layers:
+            name = layer["config"]["name"]
+            result.append((layer["class_name"], layer["config"]))
+            if name in group:
+                names = [n.decode() if isinstance(n, bytes) else n for n in group[name].attrs["weight_names"]]
+                weights.append([np.asarray(group[name][n], dtype=np.float32) for n in names])
+            else:
+                weights.append([])
+    return result, weights
+
+
+def export_numpy(path=MODEL_TIC_TAC_TOE, output=MODEL_TIC_TAC_TOE_NUMPY):
+    """
+    export the layers and the weights of the Keras model for the numpy runtime
+    :param: path: path of the Keras model
+    :param: output: path of the exported file (.npz)
+
+    :return: None
+    """
+    layers, weights = read_keras_h5(path)
+    arrays = {"layers": np.array(json.dumps(layers))}
+    for i, layer_weights in enumerate(weights):
+        arrays["count{}".format(i)] = np.array(len(layer_weights))
+        for k, w in enumerate(layer_weights):
+            arrays["w{}_{}".format(i, k)] = w
+    np.savez(output, **arrays)
+
+
+def export_onnx(path=MODEL_TIC_TAC_TOE, output=MODEL_TIC_TAC_TOE_ONNX):
+    """
+    export the Keras model to ONNX (with a variable batch size)
+    :param: path: path of the Keras model
+    :param: output: path of the ONNX model
+
+    :return: None
+    """
+    import tensorflow as tf
+    import tf2onnx
+    from keras.models import load_model
+    model = load_model(path)
+    tf2onnx.convert.from_keras(model, input_signature=[tf.TensorSpec((None, 32, 32, 1), tf.float32, name="input")], output_path=output)
+
+
+def export_tflite(path=MODEL_TIC_TAC_TOE, output=MODEL_TIC_TAC_TOE_TFLITE):
+    """
+    export the Keras model to TensorFlow Lite
+    :param: path: path of the Keras model
+    :param: output: path of the TensorFlow Lite model
+
+    :return: None
+    """
+    import tensorflow as tf
+    from keras.models import load_model
+    model = load_model(path)
+    with open(output, "wb") as file:
+        file.write(tf.lite.TFLiteConverter.from_keras_model(model).convert())
+
+
+def check_crops():
+    """
+    thresholded crops of the fields for the parity check: empty fields, X and O of several sizes and positions,
+    lines of the grid at the border and noise, like the images of the fields in AppController.getPlayer()
+
+    :return: float32 images (n, 32, 32, 1) scaled to [0, 1]
+    """
+    rng = np.random.default_rng(0)
+    ys, xs = np.mgrid[0:32, 0:32]
+    crops = [np.zeros((32, 32)), np.ones((32, 32))]
+    for size in (8, 11, 14):
+        for dx, dy in ((0, 0), (2, -1), (-2, 2)):
+            cx, cy = 15.5 + dx, 15.5 + dy
+            cross = (np.abs(np.abs(xs - cx) - np.abs(ys - cy)) < 2) & (np.abs(xs - cx) < size) & (np.abs(ys - cy) < size)
+            radius = np.hypot(xs - cx, ys - cy)
+            circle = np.abs(radius - size) < 1.5
+            crops.extend([cross, circle])
+    border = np.zeros((32, 32))
+    border[:, :3] = 1
+    border[-2:, :] = 1
+    crops.append(border)
+    crops.extend(rng.random((3, 32, 32)) > 0.9)
+    return np.stack(crops).astype(np.float32)[..., np.newaxis]
+
+
+def check_parity(tolerance=1e-4):
+    """
+    compare the outputs of the available runtimes with the Keras model on the crops of check_crops()
+    :param: tolerance: maximum absolute difference of the probabilities
+
+    :return: True if every available runtime has the same classes and probabilities as the Keras model
+    """
+    batch = check_crops()
+    reference = KerasModel()(batch)
+    runtimes = {"numpy (h5py)": lambda: NumpyModel(MODEL_TIC_TAC_TOE)}
+    if os.path.exists(MODEL_TIC_TAC_TOE_NUMPY):
+        runtimes["numpy"] = lambda: NumpyModel(MODEL_TIC_TAC_TOE_NUMPY)
+    if os.path.exists(MODEL_TIC_TAC_TOE_ONNX):
+        runtimes["onnx"] = OnnxModel
+    if os.path.exists(MODEL_TIC_TAC_TOE_TFLITE):
+        runtimes["tflite"] = TFLiteModel
+    passed = True
+    for name, create in runtimes.items():
+        output = create()(batch)
+        difference = float(np.max(np.abs(output - reference)))
+        same_classes = bool(np.all(np.argmax(output, axis=1) == np.argmax(reference, axis=1)))
+        ok = difference <= tolerance and same_classes
+        passed = passed and ok
+        print("{}: max difference {:.2e}, same classes {} -> {}".format(name, difference, same_classes, "ok" if ok else "FAILED"))
+    return passed
+
+
+def load_model(runtime=MODEL_TIC_TAC_TOE_RUNTIME):
+    """
+    load the tic-tac-toe model with a runtime. If the runtime is not installed or its model has not been
+    exported, the Keras model is loaded (TensorFlow is imported only in this case)
+    :param: runtime: "numpy", "onnx", "tflite" or "keras"
+
+    :return: model, called like the Keras model
+    """
+    if runtime not in ("numpy", "onnx", "tflite", "keras"):
+        raise ValueError("unknown runtime of the tic-tac-toe model: {}".format(runtime))
+    try:
+        if runtime == "numpy":
+            # without exported weights, the weights are read from the Keras model with h5py
+            return NumpyModel(MODEL_TIC_TAC_TOE_NUMPY if os.path.exists(MODEL_TIC_TAC_TOE_NUMPY) else MODEL_TIC_TAC_TOE)
+        if runtime == "onnx" and os.path.exists(MODEL_TIC_TAC_TOE_ONNX):
+            return OnnxModel()
+        if runtime == "tflite" and os.path.exists(MODEL_TIC_TAC_TOE_TFLITE):
+            return TFLiteModel()
+    except ImportError: # the runtime is not installed
+        pass
+    return KerasModel()
+
+
+if __name__ == "__main__":
+    parser = ArgumentParser(description="export the tic-tac-toe model for a lightweight runtime")
+    parser.add_argument("--numpy", action="store_true", help="export the weights for the numpy runtime")
+    parser.add_argument("--onnx", action="store_true", help="export the model to ONNX")
+    parser.add_argument("--tflite", action="store_true", help="export the model to TensorFlow Lite")
+    parser.add_argument("--check", action="store_true", help="compare the outputs of the runtimes with the Keras model")
+    args = parser.parse_args()
+    if args.numpy:
+        export_numpy()
+        print("exported {}".format(MODEL_TIC_TAC_TOE_NUMPY))
+    if args.onnx:
+        export_onnx()
+        print("exported {}".format(MODEL_TIC_TAC_TOE_ONNX))
+    if args.tflite:
+        export_tflite()
+        print("exported {}".format(MODEL_TIC_TAC_TOE_TFLITE))
+    if args.check and not check_parity():
+        raise SystemExit(1)
+    if not (args.numpy or args.onnx or args.tflite or args.check):
+        parser.print_help()
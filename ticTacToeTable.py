@@ -0,0 +1,136 @@
+"""
+perfect play of the tic-tac-toe game by a precomputed table.
+
+The game tree of tic-tac-toe is small: all the gameboards that can be reached from the empty gameboard
+(X plays first) are solved once by minimax at import and stored in two compact tables indexed by the
+base-3 code of the gameboard (' ' = 0, 'X' = 1, 'O' = 2, field i has the weight 3**i):
+
+    VALUES[code]: minimax value for the side to move (> 0 won, 0 tie game, < 0 lost),
+                  the faster won games and the slower lost games have the higher values
+    BEST_MOVES[code]: bit mask of the fields of the optimal moves
+
+A move of the computer is then a single lookup. The difficulty is a probability of blunder:
+the computer plays a random move that is not optimal.
+"""
+
+import random
+from array import array
+
+EMPTY, X, O = 0, 1, 2
+CODES = {' ': EMPTY, 'X': X, 'O': O} # symbol of a field -> digit of the code
+WEIGHTS = [3 ** i for i in range(9)] # weight of the digit of every field
+LINES = [(0, 1, 2), (3, 4, 5), (6, 7, 8), (0, 3, 6), (1, 4, 7), (2, 5, 8), (0, 4, 8), (2, 4, 6)]
+
+SIZE = 3 ** 9 # number of codes
+VALUES = array('b', bytes(SIZE)) # minimax value for the side to move of every code
+BEST_MOVES = array('H', bytes(2 * SIZE)) # bit mask of the optimal moves of every code (0: game is over or gameboard not reachable)
+REACHABLE = bytearray(SIZE) # 1 if the code is a gameboard reachable from the empty gameboard
+
+
+def encode(board):
+    """
+    base-3 code of a gameboard
+    :param: board: array of the 9 fields (' ', 'X' or 'O')
+
+    :return: code of the gameboard (index of the tables)
+    """
+    code = 0
+    for i, field in enumerate(board):
+        code += CODES[field] * WEIGHTS[i]
+    return code
+
+
+def has_line(fields, digit):
+    """
+    :param: fields: array of the 9 digits of the gameboard
+    :param: digit: X or O
+
+    :return: True if the digit is in a full row, column or diagonal
+    """
+    for a, b, c in LINES:
+        if fields[a] == digit and fields[b] == digit and fields[c] == digit:
+            return True
+    return False
+
+
+def _solve(fields, code, digit):
+    """
+    negamax of a gameboard, the values of all the reachable gameboards are written in the tables
+    :param: fields: array of the 9 digits of the gameboard (modified and restored)
+    :param: code: code of the gameboard
+    :param: digit: digit of the side to move
+
+    :return: minimax value of the gameboard for the side to move
+    """
+    if REACHABLE[code]: # already solved by another order of the moves
+        return VALUES[code]
+    REACHABLE[code] = 1
+    empties = fields.count(EMPTY)
+    if has_line(fields, X + O - digit): # the last move has won the game
+        value = -(1 + empties) # lost, the earlier the worse
+    elif empties == 0:
+        value = 0 # tie game
+    else:
+        value = -10
+        best = 0
+        for i in range(9):
+            if fields[i] != EMPTY:
+                continue
+            fields[i] = digit
+            child = -_solve(fields, code + digit * WEIGHTS[i], X + O - digit)
+            fields[i] = EMPTY
+            if child > value:
+                value = child
+                best = 1 << i
+            elif child == value:
+                best |= 1 << i
+        BEST_MOVES[code] = best
+    VALUES[code] = value
+    return value
+
+
+_solve([EMPTY] * 9, 0, X) # 5478 gameboards
+
+
+def best_moves(board):
+    """
+    :param: board: array of the 9 fields (' ', 'X' or 'O')
+
+    :return: list of the fields of the optimal moves of the side to move (empty if the game is over)
+    """
+    mask = BEST_MOVES[encode(board)]
+    return [i for i in range(9) if mask >> i & 1]
+
+
+def value(board):
+    """
+    :param: board: array of the 9 fields (' ', 'X' or 'O')
+
+    :return: minimax value of the gameboard for the side to move (> 0 won, 0 tie game, < 0 lost)
+    """
+    return VALUES[encode(board)]
+
+
+def choose_move(board, blunder=0.0, rng=random):
+    """
+    move of the side to move: one of the optimal moves at random or, with the probability blunder,
+    one of the other free fields at random
+    :param: board: array of the 9 fields (' ', 'X' or 'O')
+    :param: blunder: probability to play a move that is not optimal
+    :param: rng: random generator
+
+    :return: field of the move, or None if no move is available
+    """
+    code = encode(board)
+    mask = BEST_MOVES[code]
+    free = [i for i in range(9) if board[i] == ' ']
+    if not free:
+        return None
+    if not mask: # gameboard not in the table (e.g. O has played first)
+        return rng.choice(free)
+    optimal = [i for i in free if mask >> i & 1]
+    if blunder and rng.random() < blunder:
+        others = [i for i in free if not mask >> i & 1]
+        if others:
+            return rng.choice(others)
+    return rng.choice(optimal)
@@ -5,6 +5,7 @@
 #
 import threading
 import cv2
+import numpy as np
 import time
 from config import *
 import logging
@@ -58,7 +59,37 @@ class VideoStreamer(threading.Thread):
 			self.stream.set(cv2.CAP_PROP_FRAME_WIDTH, WIDTH)
 			self.stream.set(cv2.CAP_PROP_FRAME_HEIGHT, HEIGHT)
 			self.stream.set(cv2.CAP_PROP_FPS, FPS)
-		(self.grabbed, self.frame) = self.stream.read()			
+		# ring buffer of the last VIDEO_RING_SIZE frames: the buffers are allocated once and filled by stream.read(image=buffer),
+		# a frame stays valid until VIDEO_RING_SIZE - 1 newer frames have been read
+		self.ringSize = max(VIDEO_RING_SIZE, 2)
+		self.buffers = [np.empty((HEIGHT, WIDTH, 3), dtype=np.uint8) for _ in range(self.ringSize)]
+		self.frameIds = [0] * self.ringSize # frame id of every buffer, 0: empty
+		self.timestamps = [0.0] * self.ringSize # capture time (time.monotonic()) of every buffer
+		self.frameId = 0 # frame id of the most recent frame, incremented for every new frame
+		self.newFrame = threading.Condition() # notified for every new frame
+		self.grabbed = False
+		self.frame = None # most recent frame
+		self.grab() # read the first frame
+
+	def grab(self):
+		"""
+		read the next frame of the camera into the next buffer of the ring
+
+		:return: True if a frame has been read
+		"""
+		slot = (self.frameId + 1) % self.ringSize # buffer of the oldest frame
+		(grabbed, frame) = self.stream.read(image=self.buffers[slot]) # the buffer is filled if its size is the size of the frame
+		timestamp = time.monotonic()
+		with self.newFrame:
+			self.grabbed = grabbed
+			if grabbed:
+				self.buffers[slot] = frame # new buffer if the camera has another size of frame
+				self.frameId += 1
+				self.frameIds[slot] = self.frameId
+				self.timestamps[slot] = timestamp
+				self.frame = frame
+				self.newFrame.notify_all() # wake up the threads waiting for a new frame
+		return grabbed
 
 	def run(self):
 		"""
@@ -68,10 +99,12 @@ class VideoStreamer(threading.Thread):
 			# if the thread indicator variable is set, stop the thread
 			if self.event.is_set():
 				logger.debug("VideoStreamer: thread stopped, exit ...")
+				with self.newFrame:
+					self.newFrame.notify_all() # wake up the waiting threads
 				return
 
 			# otherwise, read the next frame from the stream
-			(self.grabbed, self.frame) = self.stream.read()
+			self.grab()
 			
 
 	def read(self):
@@ -80,6 +113,52 @@ class VideoStreamer(threading.Thread):
 		"""
 		return self.frame
 
+	def latest(self):
+		"""
+		most recent frame, called from outside thread
+
+		:return: (frameId, frame, timestamp) of the most recent frame, (0, None, None) if no frame has been read
+		"""
+		with self.newFrame:
+			return self._slot(self.frameId)
+
+	def waitFrame(self, lastFrameId, timeout=None):
+		"""
+		wait until a frame newer than lastFrameId has been read, called from outside thread by appModel.
+		A frame is returned only once to a thread that passes the returned frame id at the next call.
+		:param: lastFrameId: frame id of the last frame used by the caller
+		:param: timeout: maximum waiting time in seconds, None to wait without limit
+
+		:return: (frameId, frame, timestamp) of the most recent frame, (lastFrameId, None, None) if no new frame has been read before the timeout
+		"""
+		with self.newFrame:
+			if self.newFrame.wait_for(lambda: self.frameId != lastFrameId or self.event.is_set(), timeout) and self.frameId != lastFrameId:
+				return self._slot(self.frameId)
+		return lastFrameId, None, None
+
+	def history(self, count):
+		"""
+		last frames of the ring buffer for temporal filtering, called from outside thread.
+		The buffer that is filled by the next read is not returned.
+		:param: count: maximum number of frames (at most VIDEO_RING_SIZE - 1)
+
+		:return: list of (frameId, frame, timestamp), from the oldest to the most recent frame
+		"""
+		with self.newFrame:
+			first = max(self.frameId - min(count, self.ringSize - 1) + 1, 1)
+			return [self._slot(frameId) for frameId in range(first, self.frameId + 1)]
+
+	def _slot(self, frameId):
+		"""
+		:param: frameId: id of a frame of the ring buffer (the lock is held)
+
+		:return: (frameId, frame, timestamp), (0, None, None) if the frame is not in the ring buffer
+		"""
+		slot = frameId % self.ringSize
+		if frameId == 0 or self.frameIds[slot] != frameId:
+			return 0, None, None
+		return frameId, self.buffers[slot], self.timestamps[slot]
+
 	def setBrightness(self, newBrightness):
 		"""
 		adjust brigthness of webcam acc. to GUI slider